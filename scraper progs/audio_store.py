@@ -0,0 +1,85 @@
+import os
+import time
+import shutil
+import sqlite3
+
+# --- CONFIGURATION ---
+STORE_DIR = 'downloads/audio_store'   # Shared by every decade, so re-releases dedupe across them
+
+class AudioStore:
+    """
+    Content-addressed mp3 store: one file per YouTube video ID at
+    STORE_DIR/<id[:2]>/<id>.mp3, transcoded once. Per-song
+    [uuid]_[title].mp3 files are hardlinks to it (symlink, then copy, as
+    fallbacks). A small SQLite index remembers each video's size and how
+    long its transcode took, so savings can be reported for later runs too.
+    """
+
+    def __init__(self, store_dir=STORE_DIR):
+        self.store_dir = store_dir
+        os.makedirs(store_dir, exist_ok=True)
+        self.conn = sqlite3.connect(os.path.join(store_dir, "index.sqlite"), timeout=60)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS videos (
+                video_id TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                transcode_s REAL NOT NULL,
+                created_at REAL NOT NULL
+            );
+        """)
+        self.conn.commit()
+        self.links = {"hardlink": 0, "symlink": 0, "copy": 0}
+        self.bytes_saved = 0
+        self.seconds_saved = 0.0
+
+    def path(self, video_id):
+        return os.path.join(self.store_dir, video_id[:2], f"{video_id}.mp3")
+
+    def has(self, video_id):
+        return os.path.exists(self.path(video_id))
+
+    def add(self, video_id, transcode_s):
+        """Registers a freshly transcoded file (already written at path(video_id))."""
+        self.conn.execute(
+            "INSERT OR REPLACE INTO videos VALUES (?, ?, ?, ?)",
+            (video_id, os.path.getsize(self.path(video_id)), transcode_s, time.time()))
+        self.conn.commit()
+
+    def link(self, video_id, dest, saved=True):
+        """
+        Makes dest point at the stored file. saved=False for the one song that
+        actually paid for the download/transcode; every other link counts as
+        bytes and transcode time saved by deduplication.
+        """
+        src = self.path(video_id)
+        if not os.path.exists(dest):
+            try:
+                os.link(src, dest)
+                self.links["hardlink"] += 1
+            except OSError:
+                try:
+                    os.symlink(os.path.abspath(src), dest)
+                    self.links["symlink"] += 1
+                except OSError:
+                    shutil.copyfile(src, dest)
+                    self.links["copy"] += 1
+        if saved:
+            row = self.conn.execute(
+                "SELECT size, transcode_s FROM videos WHERE video_id = ?", (video_id,)).fetchone()
+            size, seconds = row if row else (os.path.getsize(src), 0.0)
+            self.bytes_saved += size
+            self.seconds_saved += seconds
+
+    def stats(self):
+        videos, size = self.conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM videos").fetchone()
+        return {
+            "videos": videos,
+            "mb_stored": round(size / (1024 * 1024), 1),
+            "mb_saved": round(self.bytes_saved / (1024 * 1024), 1),
+            "transcode_s_saved": round(self.seconds_saved, 1),
+            **self.links,
+        }
+
+    def close(self):
+        self.conn.close()
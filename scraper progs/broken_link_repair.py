@@ -1,10 +1,25 @@
+import os
+import re
+import sys
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 import pandas as pd
 import yt_dlp
-import time
-import sys
+
+from rate_limiter import get_limiter
 
 # --- CONFIGURATION ---
-API_DELAY_SECONDS = 2  # Matches your Node.js delay
+INPUT_CSV = 'myswar_songs_1945_1954.csv'
+OUTPUT_CSV = 'songs_updated_fast.csv'
+PROGRESS_FILE = OUTPUT_CSV + '.progress'  # rows consumed / output size after the last saved chunk
+WORKERS = 4           # Concurrent searches (each worker keeps its own extractor)
+CHUNK_SIZE = 50       # Rows searched together, then appended to OUTPUT_CSV
+
+# Search pacing comes from the shared adaptive limiter (rate_limiter.py)
+# instead of a fixed 2s delay: it speeds up until YouTube pushes back.
+limiter = get_limiter("youtube.com")
 
 # --- COLORS ---
 class Colors:
@@ -17,7 +32,7 @@ class Colors:
     BOLD = '\033[1m'
 
 # --- INITIALIZE TOOLS ---
-# We use 'extract_flat': True. This is the secret sauce. 
+# We use 'extract_flat': True. This is the secret sauce.
 # It tells yt-dlp: "Just read the search page. DO NOT check the video stream."
 ydl_opts = {
     'quiet': True,
@@ -27,88 +42,181 @@ ydl_opts = {
     'default_search': 'ytsearch1', # Only ask for 1 result
 }
 
+# Every YouTube link shape we've seen in the CSVs: watch?v=, youtu.be/,
+# shorts/, embed/, v/, live/ on www., m., music. and youtube-nocookie.com
+YOUTUBE_URL_RE = re.compile(
+    r"(?:https?://)?(?:[\w-]+\.)?(?:youtube\.com|youtube-nocookie\.com|youtu\.be)/"
+    r"(?:watch\?(?:.*&)?v=|shorts/|embed/|v/|live/)?([0-9A-Za-z_-]{11})(?![0-9A-Za-z_-])")
+
 # --- HELPER FUNCTIONS ---
 
+def youtube_video_id(url):
+    """The video ID of any YouTube URL form, or None if it isn't one."""
+    if pd.isna(url): return None
+    match = YOUTUBE_URL_RE.search(str(url).strip())
+    return match.group(1) if match else None
+
+# yt-dlp extractors are expensive to build and not thread-safe, so each
+# worker thread builds one on first use and keeps it for the whole run.
+_local = threading.local()
+
+def get_extractor():
+    if not hasattr(_local, "ydl"):
+        _local.ydl = yt_dlp.YoutubeDL(ydl_opts)
+    return _local.ydl
+
 def get_video_fast(query):
     """
     Searches YouTube and returns the first Video ID found.
     Does NOT check if the video is playable (for maximum speed).
     """
+    limiter.acquire()
     try:
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            # This runs instantly because it only looks at metadata
-            info = ydl.extract_info(query, download=False)
-            
-            if 'entries' in info and info['entries']:
-                # Return the URL of the first result
-                return info['entries'][0]['url']
-            
-    except Exception:
-        return None
-    return None
-
-# --- MAIN SCRIPT ---
-
-try:
-    print(f"{Colors.BOLD}Loading CSV files...{Colors.RESET}")
-    df_songs = pd.read_csv('myswar_songs_1945_1954.csv')
-except Exception as e:
-    print(f"{Colors.RED}CRITICAL ERROR: {e}{Colors.RESET}")
-    sys.exit(1)
+        # This runs instantly because it only looks at metadata
+        info = get_extractor().extract_info(query, download=False)
+        limiter.report()
 
-indices_to_drop = []
+        if 'entries' in info and info['entries']:
+            # Return the URL of the first result
+            return info['entries'][0]['url']
 
-print(f"{'='*100}")
-print(f"{Colors.BOLD}{'STATUS':<10} | {'SONG NAME':<35} | {'DETAILS'}{Colors.RESET}")
-print(f"{'='*100}")
+    except Exception as e:
+        limiter.report(e)
+        return None
+    return None
 
-for index, row in df_songs.iterrows():
+def repair_row(row):
+    """Returns (status, song_name, link_or_error) for one song row."""
+    song_name = str(row.get('song_title'))
     try:
-        song_name = str(row['song_title'])
-        display_name = (song_name[:33] + "..") if len(song_name) > 33 else song_name
         current_url = row['youtube_url']
         singer = str(row['song_singers'])
         if singer.lower() == 'nan': singer = ""
 
-        # --- STEP 1: SKIP IF WE HAVE A LINK (Basic check) ---
-        # The Node script doesn't check validity, so we just check if text exists.
-        if pd.notna(current_url) and "youtube.com" in str(current_url):
-            print(f"{Colors.GREEN}[OK]       {Colors.RESET}| {display_name:<35} | Has link")
-            continue
+        # --- STEP 1: SKIP IF WE HAVE A LINK (any YouTube URL form) ---
+        if youtube_video_id(current_url):
+            return "OK", song_name, current_url
 
         # --- STEP 2: SEARCH (The Fast Way) ---
-        print(f"{Colors.YELLOW}[SEARCH]   {Colors.RESET}| {display_name:<35} | Searching...", end="\r")
-        
         # Query: "Song Name Singer Name" (Simple & Effective)
-        query = f"{song_name} {singer}"
-        
-        new_link = get_video_fast(query)
+        new_link = get_video_fast(f"{song_name} {singer}")
+        return ("FIXED" if new_link else "DELETE"), song_name, new_link
+    except Exception as e:
+        return "ERROR", song_name, str(e)
+
+def print_result(status, song_name, link):
+    display_name = (song_name[:33] + "..") if len(song_name) > 33 else song_name
+    if status == "OK":
+        print(f"{Colors.GREEN}[OK]       {Colors.RESET}| {display_name:<35} | Has link")
+    elif status == "FIXED":
+        print(f"{Colors.CYAN}[FIXED]    {Colors.RESET}| {display_name:<35} | {Colors.CYAN}Found: {link}{Colors.RESET}")
+    elif status == "DELETE":
+        print(f"{Colors.RED}[DELETE]   {Colors.RESET}| {display_name:<35} | {Colors.RED}No results.{Colors.RESET}")
+    else:
+        print(f"{Colors.RED}[ERROR]    {Colors.RESET}| {display_name:<35} | {Colors.RED}{link}{Colors.RESET}")
+
+def load_progress():
+    """(rows_done, output_size) of the last saved chunk, or (0, None) for a fresh run."""
+    try:
+        with open(PROGRESS_FILE, encoding='utf-8') as f:
+            progress = json.load(f)
+        return progress["rows_done"], progress["output_size"]
+    except (OSError, ValueError, KeyError):
+        return 0, None
+
+def save_progress(rows_done):
+    tmp_path = PROGRESS_FILE + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({"rows_done": rows_done, "output_size": os.path.getsize(OUTPUT_CSV)}, f)
+    os.replace(tmp_path, PROGRESS_FILE)
+
+def skip_records(chunks, rows_done):
+    """
+    Drops the first rows_done records of a chunked read. They are counted
+    as parsed rows, not file lines, so quoted multi-line fields can't shift
+    the resume point.
+    """
+    for chunk in chunks:
+        if rows_done >= len(chunk):
+            rows_done -= len(chunk)
+            continue
+        yield chunk.iloc[rows_done:]
+        rows_done = 0
+
+# --- MAIN SCRIPT ---
+
+def repair_links():
+    rows_done, output_size = load_progress()
+    if output_size is not None and os.path.exists(OUTPUT_CSV):
+        # Drop anything appended after the last saved chunk (crash mid-write)
+        if os.path.getsize(OUTPUT_CSV) > output_size:
+            with open(OUTPUT_CSV, 'r+b') as f:
+                f.truncate(output_size)
+        print(f"{Colors.YELLOW}[RESUME]   Skipping {rows_done} rows already repaired.{Colors.RESET}")
+    else:
+        rows_done = 0
+
+    try:
+        print(f"{Colors.BOLD}Loading CSV files...{Colors.RESET}")
+        # youtube_url as text: a chunk with no links at all would come back as float
+        reader = pd.read_csv(INPUT_CSV, chunksize=CHUNK_SIZE, dtype={'youtube_url': str})
+        chunks = skip_records(reader, rows_done)
+    except Exception as e:
+        print(f"{Colors.RED}CRITICAL ERROR: {e}{Colors.RESET}")
+        sys.exit(1)
 
-        # Clear the "Searching..." line
-        print(f"{' '*100}", end="\r")
+    counts = {"OK": 0, "FIXED": 0, "DELETE": 0, "ERROR": 0}
 
-        # --- STEP 3: UPDATE ---
-        if new_link:
-            df_songs.at[index, 'youtube_url'] = new_link
-            print(f"{Colors.CYAN}[FIXED]    {Colors.RESET}| {display_name:<35} | {Colors.CYAN}Found: {new_link}{Colors.RESET}")
-        else:
-            # If fast search fails, mark for delete
-            indices_to_drop.append(index)
-            print(f"{Colors.RED}[DELETE]   {Colors.RESET}| {display_name:<35} | {Colors.RED}No results.{Colors.RESET}")
+    print(f"{'='*100}")
+    print(f"{Colors.BOLD}{'STATUS':<10} | {'SONG NAME':<35} | {'DETAILS'}{Colors.RESET}")
+    print(f"{'='*100}")
 
-        # The delay is critical to avoid 429 errors (Too Many Requests)
-        time.sleep(API_DELAY_SECONDS)
+    executor = ThreadPoolExecutor(max_workers=WORKERS)
+    try:
+        for chunk in chunks:
+            rows = [row for _, row in chunk.iterrows()]
+            indices_to_drop = []
+
+            # Searches run concurrently; results come back in row order
+            for (index, _), result in zip(chunk.iterrows(), executor.map(repair_row, rows)):
+                status, song_name, link = result
+                counts[status] += 1
+                print_result(status, song_name, link)
+
+                # --- STEP 3: UPDATE ---
+                if status == "FIXED":
+                    chunk.at[index, 'youtube_url'] = link
+                elif status == "DELETE":
+                    # If fast search fails, mark for delete
+                    indices_to_drop.append(index)
+
+            # --- SAVE (every chunk, so a crash or Ctrl-C keeps the work done so far) ---
+            chunk = chunk.drop(indices_to_drop)
+            write_header = rows_done == 0
+            chunk.to_csv(OUTPUT_CSV, mode='w' if write_header else 'a', header=write_header, index=False)
+            rows_done += len(rows)
+            save_progress(rows_done)
 
     except KeyboardInterrupt:
-        print(f"\n{Colors.YELLOW}[STOP]     Script stopped. Saving data...{Colors.RESET}")
-        break
+        print(f"\n{Colors.YELLOW}[STOP]     Script stopped. Rows up to {rows_done} are saved; run again to resume.{Colors.RESET}")
+        executor.shutdown(wait=False, cancel_futures=True)
+        sys.exit(130)
     except Exception as e:
         print(f"{Colors.RED}[ERROR]    {e}{Colors.RESET}")
-
-# --- SAVE ---
-if indices_to_drop:
-    df_songs.drop(indices_to_drop, inplace=True)
-    print(f"\n{Colors.RED}[INFO]     Removed {len(indices_to_drop)} songs.{Colors.RESET}")
-
-df_songs.to_csv('songs_updated_fast.csv', index=False)
-print(f"{Colors.GREEN}[DONE]     Saved to songs_updated_fast.csv{Colors.RESET}")
\ No newline at end of file
+        print(f"{Colors.YELLOW}[STOP]     Rows up to {rows_done} are saved; run again to resume.{Colors.RESET}")
+        executor.shutdown(wait=False, cancel_futures=True)
+        sys.exit(1)
+    executor.shutdown()
+    # Finished: the next run starts over (no file if no chunk was ever saved)
+    try: os.remove(PROGRESS_FILE)
+    except FileNotFoundError: pass
+
+    if counts["DELETE"]:
+        print(f"\n{Colors.RED}[INFO]     Removed {counts['DELETE']} songs.{Colors.RESET}")
+
+    stats = limiter.stats()
+    print(f"{Colors.CYAN}[RATE]     Settled at {stats['rate']} req/s ({stats['throttles']} throttles){Colors.RESET}")
+    print(f"{Colors.GREEN}[DONE]     {counts['OK']} ok, {counts['FIXED']} fixed. Saved to {OUTPUT_CSV}{Colors.RESET}")
+
+if __name__ == "__main__":
+    repair_links()
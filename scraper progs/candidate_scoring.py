@@ -0,0 +1,113 @@
+import re
+
+import numpy as np
+from rapidfuzz import fuzz
+from rapidfuzz.process import cdist, cpdist
+from thefuzz import utils
+
+# --- CONFIGURATION ---
+# Same rules search_and_verify always used, now applied as array masks.
+SONG_BONUS = 5             # 'song' results beat 'video' uploads of the same title
+KEYWORD_PENALTY = 15       # Title contains one of the bad keywords (cover, remix, ...)
+FIRST_RESULT_SCORE = 45    # The top search result gets a lower bar...
+OTHER_RESULT_SCORE = 60    # ...than the ones below it
+SCORED_TYPES = ('song', 'video')
+
+def _process_all(texts):
+    """
+    thefuzz.fuzz.token_set_ratio preprocessing (full_process, force_ascii),
+    so scores below match it 1:1. Each distinct string is processed once and
+    the Latin-1 strip is skipped for plain ASCII, which is most titles.
+    """
+    seen = {}
+    out = []
+    for text in texts:
+        processed = seen.get(text)
+        if processed is None:
+            processed = utils.full_process(text if text.isascii() else utils.ascii_only(text))
+            seen[text] = processed
+        out.append(processed)
+    return out
+
+_patterns = {}
+
+def keyword_pattern(keywords):
+    """One compiled alternation per keyword list (substring semantics, like `kw in title`)."""
+    key = tuple(keywords)
+    if key not in _patterns:
+        _patterns[key] = re.compile("|".join(re.escape(kw) for kw in key)) if key else None
+    return _patterns[key]
+
+def score_matrix(titles, candidate_titles, scorer=fuzz.token_set_ratio):
+    """
+    thefuzz token_set_ratio (or `scorer`) of every title against every
+    candidate title, as an int matrix of shape (len(titles), len(candidate_titles)).
+    """
+    if not len(titles) or not len(candidate_titles):
+        return np.zeros((len(titles), len(candidate_titles)), dtype=np.int64)
+    scores = cdist(_process_all(titles), _process_all(candidate_titles),
+                   scorer=scorer, dtype=np.float64, workers=-1)
+    # thefuzz rounds with round() (half to even); np.rint does the same
+    return np.rint(scores).astype(np.int64)
+
+def accept_batch(titles, candidate_lists, keywords=()):
+    """
+    Accept/reject decision for every candidate of every song in one pass.
+    candidate_lists[i] are the search results (dicts with resultType / title)
+    for titles[i]. Returns one bool list per song, aligned with its candidates.
+    """
+    lengths = [len(candidates) for candidates in candidate_lists]
+    if not sum(lengths): return [[] for _ in lengths]
+
+    flat = [item for candidates in candidate_lists for item in candidates]
+    video_titles = [item.get('title') or '' for item in flat]
+    song_titles = [title for title, n in zip(_process_all(titles), lengths) for _ in range(n)]
+
+    # Paired scores: each candidate only against its own song
+    scores = np.rint(cpdist(song_titles, _process_all(video_titles),
+                            scorer=fuzz.token_set_ratio, dtype=np.float64, workers=-1)).astype(np.int64)
+
+    res_types = [item.get('resultType') for item in flat]
+    scored = np.fromiter((t in SCORED_TYPES for t in res_types), bool, len(flat))
+    scores += SONG_BONUS * np.fromiter((t == 'song' for t in res_types), bool, len(flat))
+
+    pattern = keyword_pattern(keywords)
+    if pattern:
+        # One regex scan per distinct title, over the whole batch at once
+        bad_titles = {t for t in set(video_titles) if pattern.search(t.lower())}
+        scores -= KEYWORD_PENALTY * np.fromiter((t in bad_titles for t in video_titles), bool, len(flat))
+
+    # Index of each candidate inside its own result list
+    positions = np.arange(len(flat)) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    required = np.where(positions == 0, FIRST_RESULT_SCORE, OTHER_RESULT_SCORE)
+    accepted = scored & (scores >= required)
+
+    out, start = [], 0
+    for n in lengths:
+        out.append(accepted[start:start + n].tolist())
+        start += n
+    return out
+
+def accept_candidates(title, candidates, keywords=()):
+    """Single-song version of accept_batch."""
+    return accept_batch([title], [candidates], keywords)[0]
+
+def reference_accept(title, candidates, keywords=()):
+    """The original one-by-one loop, kept to check the batch engine against."""
+    from thefuzz import fuzz as thefuzz_fuzz
+    decisions = []
+    for index, item in enumerate(candidates):
+        if item.get('resultType') not in SCORED_TYPES:
+            decisions.append(False)
+            continue
+        video_title = item.get('title') or ''
+        score = thefuzz_fuzz.token_set_ratio(title, video_title)
+        if item.get('resultType') == 'song': score += SONG_BONUS
+        lower_title = video_title.lower()
+        for kw in keywords:
+            if kw in lower_title:
+                score -= KEYWORD_PENALTY
+                break
+        required_score = FIRST_RESULT_SCORE if index == 0 else OTHER_RESULT_SCORE
+        decisions.append(score >= required_score)
+    return decisions
@@ -0,0 +1,393 @@
+import os
+import csv
+import sys
+import glob
+import time
+import uuid
+import tracemalloc
+from array import array
+from itertools import accumulate
+
+import numpy as np
+
+# --- CONFIGURATION ---
+RAW_ROOT = '../data/raw'
+ALBUMS_GLOB = os.path.join(RAW_ROOT, 'albums data', '*.csv')
+SONGS_GLOB = os.path.join(RAW_ROOT, 'songs data', '*.csv')
+
+RATING_SCALE = 100        # Ratings have at most 2 decimals: stored exactly as uint16 hundredths
+MISSING_INT = -1          # track_number / album_year not given
+MISSING_RATING = 0xFFFF
+
+ALBUM_COLUMNS = ['album_uuid', 'album_title', 'album_year', 'album_category', 'album_music_director',
+                 'album_lyricist', 'album_label', 'album_rating']
+SONG_COLUMNS = ['song_uuid', 'album_uuid', 'track_number', 'song_title', 'song_singers', 'song_rating',
+                'youtube_url', 'music_yt_url_1', 'music_yt_url_2', 'music_yt_url_3']
+
+# --- COLUMNS ---
+def uuid_bytes(text):
+    """Canonical UUID string -> its 16 bytes (what uuid.UUID(text).bytes gives, faster)."""
+    raw = bytes.fromhex(text.replace('-', ''))
+    if len(raw) != 16: raise ValueError(f"not a UUID: {text!r}")
+    return raw
+
+class UUIDColumn:
+    """
+    UUIDs as 16 raw bytes each in one contiguous buffer (no str per row).
+    find() binary-searches the sorted high halves (built on first use, 12
+    bytes/row with the row order) and checks the low half in place.
+    """
+    __slots__ = ('data', '_order', '_his')
+
+    def __init__(self, data):
+        self.data = bytes(data)
+        self._order = self._his = None
+
+    def __len__(self):
+        return len(self.data) // 16
+
+    def raw(self, row):
+        return self.data[16 * row:16 * row + 16]
+
+    def __getitem__(self, row):
+        return str(uuid.UUID(bytes=self.raw(row)))
+
+    def keys(self):
+        """(n, 2) uint64 array of big-endian halves: sorts like the raw bytes."""
+        return np.frombuffer(self.data, dtype='>u8').reshape(-1, 2).astype(np.uint64)
+
+    def _sort(self):
+        if self._his is None:
+            keys = self.keys()
+            order = np.lexsort((keys[:, 1], keys[:, 0]))  # Stable: duplicates keep file order
+            self._order = order.astype(np.int32)
+            self._his = keys[order, 0]
+
+    def find(self, text):
+        """Row of the first occurrence of a UUID string, or -1."""
+        self._sort()
+        try:
+            target = uuid_bytes(text)
+        except (ValueError, TypeError, AttributeError):
+            return -1
+        hi = int.from_bytes(target[:8], 'big')
+        i = int(np.searchsorted(self._his, hi))
+        while i < len(self._his) and int(self._his[i]) == hi:
+            row = int(self._order[i])
+            if self.raw(row) == target:
+                return row
+            i += 1
+        return -1
+
+    def rows_of(self, other):
+        """Vectorized find() for every UUID in another column: int32 rows, -1 if absent."""
+        self._sort()
+        keys = other.keys()
+        if not len(self._his):
+            return np.full(len(keys), -1, dtype=np.int32)
+        # Lands on the first equal high half; equal highs with different lows never happen for UUIDv5
+        pos = np.minimum(np.searchsorted(self._his, keys[:, 0]), len(self._his) - 1)
+        rows = self._order[pos]
+        hit = (self._his[pos] == keys[:, 0]) & (self.keys()[rows, 1] == keys[:, 1])
+        return np.where(hit, rows, -1).astype(np.int32)
+
+    def nbytes(self):
+        extra = self._his.nbytes + self._order.nbytes if self._his is not None else 0
+        return len(self.data) + extra
+
+class TextColumn:
+    """Mostly-unique text (titles, URLs): one UTF-8 blob + uint32 offsets."""
+    __slots__ = ('blob', 'offsets')
+
+    def __init__(self, blob, offsets):
+        self.blob = bytes(blob)
+        self.offsets = offsets
+
+    def __getitem__(self, row):
+        value = self.blob[self.offsets[row]:self.offsets[row + 1]]
+        return value.decode('utf-8') if value else None
+
+    def nbytes(self):
+        return len(self.blob) + self.offsets.itemsize * len(self.offsets)
+
+class StringTable:
+    """
+    Interned repeated strings (singers, directors, labels, ...): each distinct
+    value is stored once and rows hold an int32 code into it. Code 0 is None.
+    """
+    __slots__ = ('values', 'codes')
+
+    def __init__(self, texts):
+        index = {'': 0}
+        # setdefault hands out the next code to each value seen for the first time
+        self.codes = array('i', [index.setdefault(text, len(index)) for text in texts])
+        self.values = [None] + [sys.intern(text) for text in list(index)[1:]]
+
+    def __getitem__(self, row):
+        return self.values[self.codes[row]]
+
+    def code_of(self, text):
+        """Code of a value (for scanning .codes without decoding), or -1."""
+        try:
+            return self.values.index(text, 1)
+        except ValueError:
+            return -1
+
+    def nbytes(self):
+        return (sys.getsizeof(self.values) + sum(sys.getsizeof(v) for v in self.values[1:])
+                + self.codes.itemsize * len(self.codes))
+
+class URLColumn:
+    """
+    URLs split at the last '=' or '/': the few distinct prefixes
+    ('https://www.youtube.com/watch?v=', 'https://youtu.be/', ...) are interned,
+    only the video ID part goes into the text blob.
+    """
+    __slots__ = ('prefixes', 'tails')
+
+    def __init__(self, prefixes, tails):
+        self.prefixes = prefixes
+        self.tails = tails
+
+    def __getitem__(self, row):
+        prefix, tail = self.prefixes[row], self.tails[row]
+        if prefix is None and tail is None: return None
+        return (prefix or '') + (tail or '')
+
+    def nbytes(self):
+        return self.prefixes.nbytes() + self.tails.nbytes()
+
+def text_column(texts):
+    parts = [text.encode('utf-8') for text in texts]
+    return TextColumn(b''.join(parts), array('I', accumulate(map(len, parts), initial=0)))
+
+def url_column(urls):
+    cuts = [max(url.rfind('='), url.rfind('/')) + 1 for url in urls]
+    return URLColumn(StringTable(url[:cut] for url, cut in zip(urls, cuts)),
+                     text_column(url[cut:] for url, cut in zip(urls, cuts)))
+
+def uuid_column(texts):
+    return UUIDColumn(b''.join(map(uuid_bytes, texts)))
+
+def parse_int(text):
+    try:
+        return int(float(text))
+    except ValueError:
+        return MISSING_INT
+
+def parse_rating(text):
+    try:
+        return round(float(text) * RATING_SCALE)
+    except ValueError:
+        return MISSING_RATING
+
+def int_value(column, row):
+    value = column[row]
+    return None if value == MISSING_INT else value
+
+def rating_value(column, row):
+    value = column[row]
+    return None if value == MISSING_RATING else value / RATING_SCALE
+
+# --- ROW VIEWS ---
+class AlbumView:
+    """One album row, decoded field by field on access."""
+    __slots__ = ('_catalog', '_row')
+
+    def __init__(self, catalog, row):
+        self._catalog = catalog
+        self._row = row
+
+    album_uuid = property(lambda self: self._catalog.album_uuid[self._row])
+    album_title = property(lambda self: self._catalog.album_title[self._row])
+    album_year = property(lambda self: int_value(self._catalog.album_year, self._row))
+    album_category = property(lambda self: self._catalog.album_category[self._row])
+    album_music_director = property(lambda self: self._catalog.album_music_director[self._row])
+    album_lyricist = property(lambda self: self._catalog.album_lyricist[self._row])
+    album_label = property(lambda self: self._catalog.album_label[self._row])
+    album_rating = property(lambda self: rating_value(self._catalog.album_rating, self._row))
+
+    def songs(self):
+        rows = np.flatnonzero(self._catalog.song_album_row == self._row)
+        return [SongView(self._catalog, int(row)) for row in rows]
+
+    def __repr__(self):
+        return f"<Album {self.album_title!r} ({self.album_year})>"
+
+class SongView:
+    """One song row, decoded field by field on access."""
+    __slots__ = ('_catalog', '_row')
+
+    def __init__(self, catalog, row):
+        self._catalog = catalog
+        self._row = row
+
+    song_uuid = property(lambda self: self._catalog.song_uuid[self._row])
+    album_uuid = property(lambda self: self._catalog.song_album_uuid[self._row])
+    track_number = property(lambda self: int_value(self._catalog.track_number, self._row))
+    song_title = property(lambda self: self._catalog.song_title[self._row])
+    song_singers = property(lambda self: self._catalog.song_singers[self._row])
+    song_rating = property(lambda self: rating_value(self._catalog.song_rating, self._row))
+    youtube_url = property(lambda self: self._catalog.youtube_url[self._row])
+    music_yt_url_1 = property(lambda self: self._catalog.music_yt_urls[0][self._row])
+    music_yt_url_2 = property(lambda self: self._catalog.music_yt_urls[1][self._row])
+    music_yt_url_3 = property(lambda self: self._catalog.music_yt_urls[2][self._row])
+
+    @property
+    def album(self):
+        row = int(self._catalog.song_album_row[self._row])
+        return AlbumView(self._catalog, row) if row >= 0 else None
+
+    def __repr__(self):
+        return f"<Song {self.song_title!r} [{self.song_rating}]>"
+
+# --- CATALOG ---
+def read_columns(pattern, columns):
+    """
+    Every matching CSV read into one list per column, in `columns` order
+    ('' where a file lacks the column, e.g. music_yt_url_* in older decades).
+    """
+    out = [[] for _ in columns]
+    for path in sorted(glob.glob(pattern)):
+        with open(path, newline='', encoding='utf-8') as f:
+            reader = csv.reader(f)
+            header = next(reader, [])
+            rows = list(reader)
+        by_name = dict(zip(header, zip(*rows))) if rows else {}
+        for values, name in zip(out, columns):
+            values.extend(by_name.get(name) or [''] * len(rows))
+    return out
+
+class Catalog:
+    """
+    All albums and songs in column form: UUIDs as 16-byte binaries,
+    numbers in typed arrays, repeated names interned, titles/URLs in blobs.
+    Rows come back as AlbumView / SongView objects.
+    """
+
+    def __init__(self, albums_glob=ALBUMS_GLOB, songs_glob=SONGS_GLOB):
+        # --- albums ---
+        (album_uuid, album_title, album_year, album_category, album_music_director,
+         album_lyricist, album_label, album_rating) = read_columns(albums_glob, ALBUM_COLUMNS)
+        self.album_uuid = uuid_column(album_uuid)
+        self.album_title = text_column(album_title)
+        self.album_year = array('h', map(parse_int, album_year))
+        self.album_category = StringTable(album_category)
+        self.album_music_director = StringTable(album_music_director)
+        self.album_lyricist = StringTable(album_lyricist)
+        self.album_label = StringTable(album_label)
+        self.album_rating = array('H', map(parse_rating, album_rating))
+
+        # --- songs ---
+        (song_uuid, album_uuid, track_number, song_title, song_singers, song_rating,
+         youtube_url, *music_yt_urls) = read_columns(songs_glob, SONG_COLUMNS)
+        self.song_uuid = uuid_column(song_uuid)
+        self.song_album_uuid = uuid_column(album_uuid)
+        self.track_number = array('h', map(parse_int, track_number))
+        self.song_title = text_column(song_title)
+        self.song_singers = StringTable(song_singers)
+        self.song_rating = array('H', map(parse_rating, song_rating))
+        self.youtube_url = url_column(youtube_url)
+        self.music_yt_urls = [url_column(urls) for urls in music_yt_urls]
+
+        # Foreign key resolved once: song row -> album row (-1 if unknown)
+        self.song_album_row = self.album_uuid.rows_of(self.song_album_uuid)
+
+    def string_tables(self):
+        return [self.album_category, self.album_music_director, self.album_lyricist,
+                self.album_label, self.song_singers]
+
+    def album_count(self):
+        return len(self.album_uuid)
+
+    def song_count(self):
+        return len(self.song_uuid)
+
+    def albums(self):
+        return (AlbumView(self, row) for row in range(self.album_count()))
+
+    def songs(self):
+        return (SongView(self, row) for row in range(self.song_count()))
+
+    def album(self, album_uuid):
+        row = self.album_uuid.find(album_uuid)
+        return AlbumView(self, row) if row >= 0 else None
+
+    def song(self, song_uuid):
+        row = self.song_uuid.find(song_uuid)
+        return SongView(self, row) if row >= 0 else None
+
+    def nbytes(self):
+        """(album bytes, song bytes) held by the columns."""
+        def array_bytes(a): return a.itemsize * len(a)
+        albums = (self.album_uuid.nbytes() + self.album_title.nbytes() + array_bytes(self.album_year)
+                  + array_bytes(self.album_rating)
+                  + sum(t.nbytes() for t in self.string_tables() if t is not self.song_singers))
+        songs = (self.song_uuid.nbytes() + self.song_album_uuid.nbytes() + self.song_title.nbytes()
+                 + self.youtube_url.nbytes() + sum(c.nbytes() for c in self.music_yt_urls)
+                 + array_bytes(self.track_number) + array_bytes(self.song_rating)
+                 + self.song_album_row.nbytes + self.song_singers.nbytes())
+        return albums, songs
+
+# --- REPORT ---
+def load_dataframes(python_strings=True):
+    """
+    The DataFrame load the services do. python_strings=True keeps one str
+    object per cell (pandas < 3 behaviour); False uses the installed
+    pandas' default string dtype.
+    """
+    import pandas as pd
+    frames = []
+    for pattern in (ALBUMS_GLOB, SONGS_GLOB):
+        df = pd.concat([pd.read_csv(p) for p in sorted(glob.glob(pattern))], ignore_index=True)
+        if python_strings:
+            for name in df.columns:
+                if df[name].dtype != object and pd.api.types.is_string_dtype(df[name]):
+                    df[name] = df[name].astype(object)
+        frames.append(df)
+    return frames
+
+def timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - started
+
+def retained_bytes(fn):
+    """Python heap still held by fn()'s result (tracemalloc)."""
+    tracemalloc.start()
+    result = fn()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current
+
+def report():
+    import pandas as pd
+    catalog, catalog_seconds = timed(Catalog)
+    catalog.album_uuid.find(catalog.album_uuid[0])  # Build the lookup keys so they're counted
+    catalog.song_uuid.find(catalog.song_uuid[0])
+    n_albums, n_songs = catalog.album_count(), catalog.song_count()
+    print(f"{n_albums} albums, {n_songs} songs")
+    print(f"{'':<26}{'load s':>8}{'album B/row':>13}{'song B/row':>12}{'total MB':>10}")
+
+    def row(label, seconds, album_bytes, song_bytes):
+        print(f"{label:<26}{seconds:>8.2f}{album_bytes / n_albums:>13.0f}{song_bytes / n_songs:>12.0f}"
+              f"{(album_bytes + song_bytes) / 1e6:>10.1f}")
+
+    for python_strings, label in ((True, "DataFrame (str objects)"), (False, f"DataFrame (pandas {pd.__version__})")):
+        (albums_df, songs_df), seconds = timed(lambda: load_dataframes(python_strings))
+        row(label, seconds, albums_df.memory_usage(deep=True).sum(), songs_df.memory_usage(deep=True).sum())
+        del albums_df, songs_df
+    row("Catalog", catalog_seconds, *catalog.nbytes())
+
+    # Cross-check with what the allocator actually kept
+    df_heap = retained_bytes(load_dataframes)
+    catalog_heap = retained_bytes(Catalog)
+    print(f"tracemalloc retained: DataFrame {df_heap / 1e6:.1f} MB, Catalog {catalog_heap / 1e6:.1f} MB "
+          f"({df_heap / max(catalog_heap, 1):.1f}x smaller)")
+
+    song = next(catalog.songs())
+    print(f"e.g. {song!r} from {song.album!r}, rated {song.song_rating}, {song.youtube_url}")
+
+if __name__ == "__main__":
+    report()
@@ -1,43 +1,267 @@
-import pandas as pd
 import os
+import re
+import sys
+import csv
+import glob
+import time
+import itertools
+
+import numpy as np
+
+import parquet_dataset
 
 # --- CONFIGURATION ---
 # Match these filenames to the ones you just created
 ALBUMS_FILE = "myswar_albums_2005_2014.csv"
 SONGS_FILE = "myswar_songs_2005_2014.csv"
 
+# Streaming cross-file dedupe: every file of a set is checked against all
+# rows seen before it (files in name order, i.e. oldest decade first), and
+# the first occurrence wins.
+DEDUPE_SETS = {
+    # name -> (input glob, unique column)
+    'albums': ('../data/raw/albums data/*.csv', 'album_uuid'),
+    'songs': ('../data/raw/songs data/*.csv', 'song_uuid'),
+}
+OUTPUT_ROOT = '../data/deduped'  # <OUTPUT_ROOT>/<set>/<same filename>
+CHUNK_ROWS = 20000               # Rows held in memory at a time
+# With no arguments, dedupe the Parquet dataset (parquet_dataset.py) in place
+# when it is built; --csv forces the DEDUPE_SETS above instead.
+USE_PARQUET = True
+
+HEX_UUID = re.compile(r"[0-9a-fA-F]{32}")
+
+# --- UUID SET ---
+class UUIDSet:
+    """
+    Open-addressing hash set of 128-bit UUIDs held as two uint64 arrays
+    (~35 bytes per UUID at the max load factor, vs ~100 for a Python set of
+    strings). Also remembers which file each UUID was first seen in.
+    Inserts are vectorized per chunk.
+    """
+    MAX_LOAD = 0.5
+
+    def __init__(self, capacity=1 << 16):
+        self.count = 0
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        self.hi = np.zeros(capacity, dtype=np.uint64)
+        self.lo = np.zeros(capacity, dtype=np.uint64)
+        self.owner = np.full(capacity, -1, dtype=np.int32)  # -1 = empty slot
+        self.mask = np.uint64(capacity - 1)
+
+    def _slots(self, hi, lo):
+        # Fibonacci hashing; uuid5 bits are already well mixed
+        mixed = (hi ^ (lo * np.uint64(0x9E3779B97F4A7C15))) * np.uint64(0xBF58476D1CE4E5B9)
+        return ((mixed >> np.uint64(32)) & self.mask).astype(np.int64)
+
+    def _grow(self):
+        used = self.owner >= 0
+        hi, lo, owner = self.hi[used], self.lo[used], self.owner[used]
+        self._allocate(len(self.hi) * 2)
+        self.count = 0
+        self._insert(hi, lo, owner)
+
+    def _insert(self, hi, lo, owner):
+        """Keys must be unique among themselves. Returns each key's existing owner (-1 if it was new)."""
+        found = np.full(len(hi), -1, dtype=np.int32)
+        pos = self._slots(hi, lo)
+        pending = np.arange(len(hi))
+        while len(pending):
+            p = pos[pending]
+            slot_owner = self.owner[p]
+            empty = slot_owner < 0
+            match = ~empty & (self.hi[p] == hi[pending]) & (self.lo[p] == lo[pending])
+            found[pending[match]] = slot_owner[match]
+            # Several keys may hash to the same empty slot: the first takes it,
+            # the others see it taken on the next round and move on
+            _, first = np.unique(p[empty], return_index=True)
+            claim = pending[empty][first]
+            self.hi[pos[claim]], self.lo[pos[claim]], self.owner[pos[claim]] = hi[claim], lo[claim], owner[claim]
+            self.count += len(claim)
+            claimed = np.zeros(len(pending), dtype=bool)
+            claimed[np.flatnonzero(empty)[first]] = True
+            moving = ~empty & ~match
+            pos[pending[moving]] = (pos[pending[moving]] + 1) & int(self.mask)
+            pending = pending[moving | (empty & ~claimed)]
+        return found
+
+    def add_many(self, keys, owner):
+        """
+        keys: (n, 2) uint64 UUIDs in row order. Adds them for file `owner`
+        and returns, per row, the file it was first seen in (-1 = first
+        occurrence, keep it).
+        """
+        while (self.count + len(keys)) > self.MAX_LOAD * len(self.hi):
+            self._grow()
+        if not len(keys): return np.empty(0, dtype=np.int32)
+        _, first, inverse = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+        found = self._insert(keys[first, 0], keys[first, 1], np.full(len(first), owner, dtype=np.int32))
+        # Repeats point at where the key was first seen: an earlier file or this one
+        seen = np.where(found >= 0, found, owner)[inverse.ravel()]
+        seen[first] = found
+        return seen
+
+    def nbytes(self):
+        return self.hi.nbytes + self.lo.nbytes + self.owner.nbytes
+
+def uuid_keys(values):
+    """UUID strings -> ((n, 2) big-endian uint64, valid). Blank/malformed ones are invalid."""
+    digits = [v.replace('-', '') for v in values]
+    valid = None
+    # Joined fast path only when every value is 32 digits; otherwise a short
+    # and a long value would still add up and shift the keys after them.
+    if all(len(d) == 32 for d in digits):
+        try:
+            raw = bytes.fromhex(''.join(digits))
+            valid = np.ones(len(digits), dtype=bool)
+        except ValueError:
+            pass
+    if valid is None:
+        valid = np.fromiter((HEX_UUID.fullmatch(d) is not None for d in digits), bool, len(digits))
+        raw = bytes.fromhex(''.join(itertools.compress(digits, valid)))
+    keys = np.zeros((len(digits), 2), dtype=np.uint64)
+    keys[valid] = np.frombuffer(raw, dtype='>u8').reshape(-1, 2)
+    return keys, valid
+
+# --- STREAMING DEDUPE ---
+def stream_output_path(path, name):
+    return os.path.join(OUTPUT_ROOT, name, os.path.basename(path))
+
+def clean_stream(paths, unique_col, output_path, chunk_rows=CHUNK_ROWS):
+    """
+    One pass over all `paths`: rows are read and written CHUNK_ROWS at a time
+    and only the UUIDs seen so far stay in memory. A row is dropped if its
+    UUID was already seen in the same file or in an earlier one. Rows with a
+    blank or malformed UUID are kept (and counted). Returns per-file stats.
+    """
+    seen = UUIDSet()
+    stats = []
+    started = time.time()
+    for file_index, path in enumerate(paths):
+        name = os.path.basename(path)
+        counts = {"rows": 0, "kept": 0, "in_file": 0, "cross_file": 0, "no_uuid": 0, "from": {}}
+        out_path = output_path(path)
+        os.makedirs(os.path.dirname(out_path) or '.', exist_ok=True)
+        tmp_path = out_path + '.tmp'
+        with open(path, newline='', encoding='utf-8') as src, open(tmp_path, 'w', newline='', encoding='utf-8') as dst:
+            reader, writer = csv.reader(src), csv.writer(dst)
+            header = next(reader, None)
+            if header is None or unique_col not in header:
+                print(f"❌ {name}: no '{unique_col}' column, skipped")
+                dst.close()
+                os.remove(tmp_path)
+                continue
+            writer.writerow(header)
+            key_at = header.index(unique_col)
+            while True:
+                rows = list(itertools.islice(reader, chunk_rows))
+                if not rows: break
+                keys, valid = uuid_keys([row[key_at] if len(row) > key_at else '' for row in rows])
+                first_seen = np.full(len(rows), -1, dtype=np.int32)
+                first_seen[valid] = seen.add_many(keys[valid], file_index)
+                keep = first_seen < 0
+                writer.writerows(itertools.compress(rows, keep))
+
+                counts["rows"] += len(rows)
+                counts["kept"] += int(keep.sum())
+                counts["no_uuid"] += int((~valid).sum())
+                counts["in_file"] += int((first_seen == file_index).sum())
+                for earlier, n in zip(*np.unique(first_seen[(first_seen >= 0) & (first_seen != file_index)], return_counts=True)):
+                    earlier_name = os.path.basename(paths[earlier])
+                    counts["from"][earlier_name] = counts["from"].get(earlier_name, 0) + int(n)
+        counts["cross_file"] = sum(counts["from"].values())
+        os.replace(tmp_path, out_path)
+        stats.append((name, counts))
+
+        note = f" (of {', '.join(f'{f}: {n}' for f, n in counts['from'].items())})" if counts["from"] else ""
+        blank = f", {counts['no_uuid']} without a UUID kept" if counts["no_uuid"] else ""
+        print(f"   {name}: {counts['rows']} rows -> {counts['kept']} | duplicates: "
+              f"{counts['in_file']} in file, {counts['cross_file']} cross-file{note}{blank}")
+
+    total = {k: sum(c[k] for _, c in stats) for k in ("rows", "kept", "in_file", "cross_file")}
+    print(f"   Original Rows: {total['rows']}")
+    print(f"   Duplicate Rows Removed: {total['in_file'] + total['cross_file']} "
+          f"({total['in_file']} within a file, {total['cross_file']} across files)")
+    print(f"   Final Unique Rows: {total['kept']}")
+    print(f"   {seen.count} UUIDs in a {seen.nbytes() / 1024:.0f} KB set, {time.time() - started:.1f}s\n")
+    return stats
+
 def clean_csv(filename, unique_col):
+    """Single file -> <name>_CLEANED.csv next to it."""
     if not os.path.exists(filename):
         print(f"❌ File not found: {filename}")
         return
 
     print(f"--- Cleaning {filename} ---")
-    
-    # 1. Load Data
-    df = pd.read_csv(filename)
-    original_count = len(df)
-    
-    # 2. Drop Duplicates
-    # We keep the 'first' occurrence and drop the rest
-    df_cleaned = df.drop_duplicates(subset=[unique_col], keep='first')
-    
-    final_count = len(df_cleaned)
-    removed_count = original_count - final_count
-    
-    # 3. Save Back
-    # We save to a new file just to be safe
-    clean_filename = filename.replace(".csv", "_CLEANED.csv")
-    df_cleaned.to_csv(clean_filename, index=False)
-    
-    print(f"   Original Rows: {original_count}")
+    clean_stream([filename], unique_col, lambda path: path.replace(".csv", "_CLEANED.csv"))
+    print(f"✅ Saved clean version to: {filename.replace('.csv', '_CLEANED.csv')}\n")
+
+def clean_sets(sets=DEDUPE_SETS):
+    for name, (pattern, unique_col) in sets.items():
+        paths = sorted(glob.glob(pattern))
+        if not paths:
+            print(f"❌ No files match {pattern}")
+            continue
+        print(f"--- Cleaning {name}: {len(paths)} files, unique by '{unique_col}' ---")
+        clean_stream(paths, unique_col, lambda path: stream_output_path(path, name))
+        print(f"✅ Saved clean versions to: {os.path.join(OUTPUT_ROOT, name)}\n")
+
+def clean_files(paths):
+    """Any album/song CSVs given on the command line, as one set (key taken from the first header)."""
+    with open(paths[0], newline='', encoding='utf-8') as f:
+        header = next(csv.reader(f), [])
+    unique_col = 'song_uuid' if 'song_uuid' in header else 'album_uuid'
+    print(f"--- Cleaning {len(paths)} files, unique by '{unique_col}' ---")
+    clean_stream(paths, unique_col, lambda path: stream_output_path(path, 'files'))
+    print(f"✅ Saved clean versions to: {os.path.join(OUTPUT_ROOT, 'files')}\n")
+
+def clean_dataset(table, unique_col):
+    """
+    Same first-occurrence rule over the whole Parquet dataset (parquet_dataset.py),
+    so duplicates across decades are caught too. Only the key column is read
+    to find them; a decade partition is rewritten only if it has any.
+    """
+    decades = parquet_dataset.decades(table)
+    if not decades:
+        print(f"❌ No Parquet dataset for '{table}' (run parquet_dataset.py first)")
+        return
+
+    print(f"--- Cleaning {table} ({len(decades)} decades) ---")
+    keys = parquet_dataset.read_table(table, columns=[unique_col, 'decade']).to_pandas()
+    duplicated = keys.duplicated(subset=[unique_col], keep='first')
+
+    removed_count = 0
+    for decade in decades:
+        mask = duplicated[keys['decade'] == decade].to_numpy()
+        if not mask.any(): continue
+        partition = parquet_dataset.read_partition(table, decade)
+        parquet_dataset.write_partition(table, decade, partition.filter(~mask))
+        removed_count += int(mask.sum())
+        print(f"   {decade}: removed {int(mask.sum())} of {len(mask)}")
+
+    print(f"   Original Rows: {len(keys)}")
     print(f"   Duplicate Rows Removed: {removed_count}")
-    print(f"   Final Unique Rows: {final_count}")
-    print(f"✅ Saved clean version to: {clean_filename}\n")
+    print(f"   Final Unique Rows: {len(keys) - removed_count}")
+    print(f"✅ Dataset clean: {parquet_dataset.PARQUET_ROOT}/{table}\n")
 
 # Run the cleaning
 if __name__ == "__main__":
-    # Clean Albums (Unique by 'album_uuid')
-    clean_csv(ALBUMS_FILE, "album_uuid")
-    
-    # Clean Songs (Unique by 'song_uuid')
-    clean_csv(SONGS_FILE, "song_uuid")
\ No newline at end of file
+    files = [a for a in sys.argv[1:] if a.endswith('.csv')]
+    dataset_built = USE_PARQUET and all(parquet_dataset.decades(t) for t in DEDUPE_SETS)
+    if "--parquet" in sys.argv or (dataset_built and not files and not {"--csv", "--single"} & set(sys.argv)):
+        clean_dataset("albums", "album_uuid")
+        clean_dataset("songs", "song_uuid")
+        sys.exit(0)
+
+    if files:
+        clean_files(files)
+    elif "--single" in sys.argv:
+        # Clean Albums (Unique by 'album_uuid')
+        clean_csv(ALBUMS_FILE, "album_uuid")
+
+        # Clean Songs (Unique by 'song_uuid')
+        clean_csv(SONGS_FILE, "song_uuid")
+    else:
+        clean_sets()
\ No newline at end of file
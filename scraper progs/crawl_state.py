@@ -0,0 +1,131 @@
+import csv
+import json
+import os
+import sqlite3
+import time
+
+class CrawlState:
+    """
+    Durable crawl checkpoint kept next to the output CSVs.
+    - units:  every finished (year, page) listing page and how it ended
+    - albums: every album_uuid already written to the albums CSV
+    - pages:  content hash / ETag / Last-Modified and parsed payload of
+              every listing and album page (incremental re-crawls)
+    - album_rows: hash of the rows last emitted for each album_uuid
+    Every write is committed immediately, so a crash loses at most the
+    album that was in flight.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS units (
+                year INTEGER NOT NULL,
+                page INTEGER NOT NULL,
+                status TEXT NOT NULL,
+                first_album TEXT,
+                album_count INTEGER NOT NULL DEFAULT 0,
+                finished_at REAL NOT NULL,
+                PRIMARY KEY (year, page)
+            );
+            CREATE TABLE IF NOT EXISTS albums (
+                album_uuid TEXT PRIMARY KEY
+            );
+            CREATE TABLE IF NOT EXISTS pages (
+                url TEXT PRIMARY KEY,
+                content_hash TEXT,
+                etag TEXT,
+                last_modified TEXT,
+                payload TEXT,
+                checked_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS album_rows (
+                album_uuid TEXT PRIMARY KEY,
+                row_hash TEXT NOT NULL
+            );
+        """)
+        self.conn.commit()
+
+    # --- units ---
+    def mark_unit(self, year, page, status, first_album, album_count=0):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO units VALUES (?, ?, ?, ?, ?, ?)",
+            (year, page, status, first_album, album_count, time.time()))
+        self.conn.commit()
+
+    def resume_point(self, year, more_status, start_page=1):
+        """
+        Walks the finished pages of a year from start_page.
+        Returns (next_page, last_page_first_album), or None if the year is done.
+        """
+        done = {
+            page: (status, first_album)
+            for page, status, first_album in self.conn.execute(
+                "SELECT page, status, first_album FROM units WHERE year = ?", (year,))
+        }
+        page, last_first_album = start_page, ""
+        while page in done:
+            status, first_album = done[page]
+            if status != more_status: return None
+            last_first_album = first_album or ""
+            page += 1
+        return page, last_first_album
+
+    # --- albums ---
+    def has_album(self, album_uuid):
+        return self.conn.execute(
+            "SELECT 1 FROM albums WHERE album_uuid = ?", (album_uuid,)).fetchone() is not None
+
+    def add_album(self, album_uuid):
+        self.conn.execute("INSERT OR IGNORE INTO albums VALUES (?)", (album_uuid,))
+        self.conn.commit()
+
+    def album_count(self):
+        return self.conn.execute("SELECT COUNT(*) FROM albums").fetchone()[0]
+
+    def seed_albums_from_csv(self, albums_csv):
+        """Imports album_uuids from a CSV written before the checkpoint existed."""
+        if self.album_count() or not os.path.exists(albums_csv): return 0
+        with open(albums_csv, newline="", encoding="utf-8") as f:
+            uuids = [(row["album_uuid"],) for row in csv.DictReader(f) if row.get("album_uuid")]
+        self.conn.executemany("INSERT OR IGNORE INTO albums VALUES (?)", uuids)
+        self.conn.commit()
+        return len(uuids)
+
+    # --- pages (incremental) ---
+    def get_page(self, url):
+        row = self.conn.execute(
+            "SELECT content_hash, etag, last_modified, payload FROM pages WHERE url = ?", (url,)).fetchone()
+        if row is None: return None
+        content_hash, etag, last_modified, payload = row
+        return {
+            "content_hash": content_hash,
+            "etag": etag,
+            "last_modified": last_modified,
+            "payload": json.loads(payload) if payload else None,
+        }
+
+    def set_page(self, url, content_hash, etag, last_modified, payload):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?)",
+            (url, content_hash, etag, last_modified, json.dumps(payload), time.time()))
+        self.conn.commit()
+
+    def touch_page(self, url):
+        self.conn.execute("UPDATE pages SET checked_at = ? WHERE url = ?", (time.time(), url))
+        self.conn.commit()
+
+    # --- album rows (incremental) ---
+    def album_row_hash(self, album_uuid):
+        row = self.conn.execute(
+            "SELECT row_hash FROM album_rows WHERE album_uuid = ?", (album_uuid,)).fetchone()
+        return row[0] if row else None
+
+    def set_album_row_hash(self, album_uuid, row_hash):
+        self.conn.execute("INSERT OR REPLACE INTO album_rows VALUES (?, ?)", (album_uuid, row_hash))
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
@@ -1,56 +1,79 @@
 import os
 import pandas as pd
+import pyarrow.compute as pc
+
+import parquet_dataset
 
 # --- CONFIGURATION ---
 INPUT_FOLDER = 'filtered_data'                  # Folder containing your original CSVs
 OUTPUT_FOLDER = 'filtered_data/best_rated_csvs' # Folder where the new CSVs will appear
+# Read the decade partitions built by parquet_dataset.py when present: the
+# rating filter runs inside the Parquet scan, so only kept rows (and only the
+# columns the decade's CSV had) are loaded. Falls back to INPUT_FOLDER.
+USE_PARQUET = True
 
 # FILTERS
-RATING_COL = 'song_rating'       
+RATING_COL = 'song_rating'
 RATING_THRESHOLD = 4.3
 
 # Create the output folder if it doesn't exist
 os.makedirs(OUTPUT_FOLDER, exist_ok=True)
 
+# --- SOURCES ---
+def csv_source(input_path):
+    """(df, total rows) of one CSV, filtered here."""
+    df = pd.read_csv(input_path)
+    if RATING_COL not in df.columns:
+        return None, len(df)
+    # Ensure numeric
+    df[RATING_COL] = pd.to_numeric(df[RATING_COL], errors='coerce')
+    return df[df[RATING_COL] >= RATING_THRESHOLD], len(df)
+
+def parquet_source(decade):
+    """(df, total rows) of one decade partition, filtered inside the scan."""
+    columns = parquet_dataset.source_columns('songs', decade)
+    df = parquet_dataset.read_frame('songs', columns=columns,
+                                    filter=pc.field(RATING_COL) >= RATING_THRESHOLD, decades=[decade])
+    return df, parquet_dataset.row_count('songs', decade)
+
+def list_sources():
+    """[(output filename, loader)] from the Parquet dataset, else INPUT_FOLDER."""
+    decades = parquet_dataset.decades('songs') if USE_PARQUET else []
+    if decades:
+        print(f"Reading Parquet dataset: {parquet_dataset.PARQUET_ROOT}/songs...\n")
+        return [(f"songs_{d}.csv", lambda d=d: parquet_source(d)) for d in decades]
+    print(f"Scanning folder: {INPUT_FOLDER}...\n")
+    # We use the EXACT same filename for the destination
+    return [(f, lambda f=f: csv_source(os.path.join(INPUT_FOLDER, f)))
+            for f in os.listdir(INPUT_FOLDER) if f.endswith('.csv')]
+
 # --- PROCESSING LOOP ---
 def run_csv_filtering():
-    print(f"Scanning folder: {INPUT_FOLDER}...\n")
-    
-    # Get list of all CSV files in the folder
-    files = [f for f in os.listdir(INPUT_FOLDER) if f.endswith('.csv')]
-    
-    if not files:
+    sources = list_sources()
+
+    if not sources:
         print("No CSV files found.")
         return
 
     processed_count = 0
 
-    for filename in files:
-        input_path = os.path.join(INPUT_FOLDER, filename)
-        
-        # We use the EXACT same filename for the destination
-        output_path = os.path.join(OUTPUT_FOLDER, filename) 
+    for filename, load in sources:
+        output_path = os.path.join(OUTPUT_FOLDER, filename)
 
         try:
-            # 1. Read the CSV
-            df = pd.read_csv(input_path)
-            
+            # 1. Read + Filter (Rating >= 4.3)
+            filtered_df, total = load()
+
             # Check if rating column exists
-            if RATING_COL not in df.columns:
+            if filtered_df is None:
                 print(f"[SKIP] '{filename}' - Column '{RATING_COL}' missing.")
                 continue
 
-            # Ensure numeric
-            df[RATING_COL] = pd.to_numeric(df[RATING_COL], errors='coerce')
-
-            # 2. Filter (Rating >= 4.3)
-            filtered_df = df[df[RATING_COL] >= RATING_THRESHOLD]
-
-            # 3. Save as a separate file
+            # 2. Save as a separate file
             if not filtered_df.empty:
                 filtered_df.to_csv(output_path, index=False)
                 print(f"[CREATED] {filename}")
-                print(f"    - Kept {len(filtered_df)} of {len(df)} songs")
+                print(f"    - Kept {len(filtered_df)} of {total} songs")
                 processed_count += 1
             else:
                 print(f"[INFO] {filename} - No songs rated >= {RATING_THRESHOLD}")
@@ -62,4 +85,4 @@ def run_csv_filtering():
     print(f"Done. {processed_count} filtered CSVs created in '{OUTPUT_FOLDER}'.")
 
 if __name__ == "__main__":
-    run_csv_filtering()
\ No newline at end of file
+    run_csv_filtering()
@@ -0,0 +1,84 @@
+import os
+import time
+import sqlite3
+
+import pandas as pd
+
+STATUS_COLUMNS = ['download_status', 'yt_video_id']
+
+class DownloadJournal:
+    """
+    Per-song download status keyed by song_uuid (downloaded, no_url,
+    failed_dead_link, failed_network, failed_transcode) plus the video ID
+    used. Every status is committed as soon as it is known, so a crash loses
+    nothing, and resume is a primary-key lookup instead of re-reading a CSV.
+    The status_*.csv is only written when asked for (export_csv).
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS downloads (
+                song_uuid TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                yt_video_id TEXT,
+                updated_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS downloads_status ON downloads (status);
+        """)
+        self.conn.commit()
+
+    def set_status(self, song_uuid, status, yt_video_id=None):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO downloads VALUES (?, ?, ?, ?)",
+            (song_uuid, status, yt_video_id, time.time()))
+        self.conn.commit()
+
+    def mark_downloaded(self, song_uuids):
+        """Bulk-marks songs as downloaded, keeping a video ID already recorded."""
+        now = time.time()
+        self.conn.executemany("""
+            INSERT INTO downloads VALUES (?, 'downloaded', NULL, ?)
+            ON CONFLICT(song_uuid) DO UPDATE SET status = 'downloaded', updated_at = excluded.updated_at
+        """, [(uuid, now) for uuid in song_uuids])
+        self.conn.commit()
+
+    def uuids_with_status(self, status):
+        return {uuid for (uuid,) in self.conn.execute(
+            "SELECT song_uuid FROM downloads WHERE status = ?", (status,))}
+
+    def counts(self):
+        return dict(self.conn.execute("SELECT status, COUNT(*) FROM downloads GROUP BY status"))
+
+    def count(self):
+        return self.conn.execute("SELECT COUNT(*) FROM downloads").fetchone()[0]
+
+    def import_status_csv(self, status_csv):
+        """Seeds the journal from a status CSV written before the journal existed."""
+        if self.count() or not os.path.exists(status_csv): return 0
+        df = pd.read_csv(status_csv, usecols=['song_uuid'] + STATUS_COLUMNS, dtype=str)
+        df = df.dropna(subset=['song_uuid', 'download_status'])
+        df = df[df['download_status'] != 'pending']
+        now = time.time()
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO downloads VALUES (?, ?, ?, ?)",
+            [(u, s, v if isinstance(v, str) else None, now)
+             for u, s, v in zip(df['song_uuid'], df['download_status'], df['yt_video_id'])])
+        self.conn.commit()
+        return len(df)
+
+    def export_csv(self, input_csv, output_csv):
+        """Materializes the classic status CSV: input rows + download_status / yt_video_id."""
+        df = pd.read_csv(input_csv)
+        status = pd.read_sql_query("SELECT song_uuid, status AS download_status, yt_video_id FROM downloads", self.conn)
+        df = df.drop(columns=[c for c in STATUS_COLUMNS if c in df.columns])
+        df = df.merge(status, on='song_uuid', how='left')
+        df['download_status'] = df['download_status'].fillna('pending')
+        df['yt_video_id'] = df['yt_video_id'].fillna('')
+        df.to_csv(output_csv, index=False)
+        return len(df)
+
+    def close(self):
+        self.conn.close()
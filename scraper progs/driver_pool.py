@@ -0,0 +1,131 @@
+import time
+import queue
+import threading
+
+import psutil
+
+# --- CONFIGURATION ---
+MAX_BROWSER_RSS_MB = 1500   # Recycle once browser + driver processes exceed this
+MAX_OPEN_HANDLES = 4        # Leaked tabs are a sign the browser is wedged
+CHECK_EVERY = 3             # Measure every N albums (measuring is cheap, not free)
+LEGACY_RESTART_EVERY = 15   # What the old fixed-counter rule did, for the report
+LEGACY_RESTART_PAUSE = 3.0  # Average of the old random.uniform(2.0, 4.0) sleep
+
+def browser_rss_mb(driver):
+    """Resident memory of the driver process and every browser process under it."""
+    try:
+        root = psutil.Process(driver.service.process.pid)
+        procs = [root] + root.children(recursive=True)
+    except (AttributeError, psutil.Error):
+        return 0.0
+
+    total = 0
+    for proc in procs:
+        try: total += proc.memory_info().rss
+        except psutil.Error: pass
+    return total / (1024 * 1024)
+
+class DriverPool:
+    """
+    Keeps `spares` browsers started in the background so a recycle is just a
+    hand-over. Drivers are recycled when they measure too big, not on a counter.
+    """
+
+    def __init__(self, factory, spares=1, max_rss_mb=MAX_BROWSER_RSS_MB,
+                 max_handles=MAX_OPEN_HANDLES, check_every=CHECK_EVERY):
+        self.factory = factory
+        self.spares = spares
+        self.max_rss_mb = max_rss_mb
+        self.max_handles = max_handles
+        self.check_every = check_every
+
+        self._ready = queue.Queue()
+        self._closed = False
+
+        self.albums = 0
+        self.restarts = 0
+        self.cold_start_seconds = []
+        self.handover_wait_seconds = 0.0
+
+        for _ in range(spares): self._warm_spare()
+
+    # --- internals ---
+    def _start_driver(self):
+        started = time.time()
+        driver = self.factory()
+        self.cold_start_seconds.append(time.time() - started)
+        return driver
+
+    def _warm_spare(self):
+        def worker():
+            try: driver = self._start_driver()
+            except Exception as e:
+                print(f"  [POOL] Failed to warm spare driver: {e}")
+                driver = e  # _take() must not wait forever for a spare that never comes
+            if self._closed: _quit(driver)
+            else: self._ready.put(driver)
+        threading.Thread(target=worker, daemon=True).start()
+
+    def _take(self):
+        """
+        Returns a warm driver, or cold-starts one if no spare is configured or
+        the spare failed to start (a second failure is raised to the caller).
+        """
+        if self.spares == 0: return self._start_driver()
+        waited = time.time()
+        driver = self._ready.get()
+        self.handover_wait_seconds += time.time() - waited
+        self._warm_spare()
+        if isinstance(driver, Exception):
+            print("  [POOL] No warm spare, cold-starting a driver")
+            return self._start_driver()
+        return driver
+
+    # --- public API ---
+    def acquire(self):
+        return self._take()
+
+    def should_recycle(self, driver):
+        """Call once per album; measures every `check_every` albums."""
+        self.albums += 1
+        if self.albums % self.check_every: return False
+
+        try:
+            if len(driver.window_handles) > self.max_handles: return True
+        except Exception:
+            return True
+        return browser_rss_mb(driver) > self.max_rss_mb
+
+    def recycle(self, driver):
+        """Hands over a warm driver and quits the old one in the background."""
+        print(f"  [POOL] Recycling browser ({browser_rss_mb(driver):.0f} MB) -> warm spare")
+        threading.Thread(target=_quit, args=(driver,), daemon=True).start()
+        self.restarts += 1
+        return self._take()
+
+    def report(self):
+        avg_cold = sum(self.cold_start_seconds) / len(self.cold_start_seconds) if self.cold_start_seconds else 0.0
+        legacy_cost = LEGACY_RESTART_PAUSE + avg_cold
+        legacy_restarts = self.albums // LEGACY_RESTART_EVERY
+
+        avoided = max(0, legacy_restarts - self.restarts)
+        # Every restart we did make still skipped the pause + cold start,
+        # minus whatever time we spent waiting for a spare that wasn't ready.
+        saved = avoided * legacy_cost + max(0.0, self.restarts * legacy_cost - self.handover_wait_seconds)
+        return {
+            "albums": self.albums,
+            "restarts": self.restarts,
+            "restarts_avoided": avoided,
+            "avg_cold_start_s": round(avg_cold, 2),
+            "seconds_saved": round(saved, 1),
+        }
+
+    def close(self):
+        self._closed = True
+        while True:
+            try: _quit(self._ready.get_nowait())
+            except queue.Empty: break
+
+def _quit(driver):
+    try: driver.quit()
+    except: pass
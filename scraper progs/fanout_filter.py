@@ -0,0 +1,167 @@
+import os
+import re
+import json
+import time
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+import pyarrow.compute as pc
+
+import parquet_dataset
+from video_ids import URL_COLUMNS, VIDEO_ID_PATTERN, extract_video_ids
+
+# --- CONFIGURATION ---
+# One pass per decade file produces every rating tier, plus the ID-extracted
+# copy, instead of one csv_filter_by_raing.py run per threshold followed by
+# idseparater.py over its output.
+INPUT_FOLDER = '../data/raw/songs data'
+# Read the typed decade partitions built by parquet_dataset.py when present:
+# only rows above the lowest threshold leave the Parquet scan, and only the
+# columns the decade's CSV had, so the tiers match the CSV path's.
+USE_PARQUET = True
+# The committed ../data/filtered tiers are curated (music_yt_url_* joined in
+# by the YouTube Music scraper, hand-fixed titles) and can't be rebuilt from
+# the raw CSVs, so the fan-out writes next to them and never into them.
+OUTPUT_ROOT = '../data/fanout'
+CURATED_ROOT = '../data/filtered'
+
+RATING_COL = 'song_rating'
+# threshold -> output folder (songs_<start>_<end>_final.csv)
+TIERS = {
+    4.0: 'rating_4.0_plus_songs',
+    4.3: 'rating_4.3_plus_songs',
+}
+# threshold -> output folder (tobe_songs_<start>_<end>_final.csv + ID columns)
+ID_TIERS = {
+    4.3: '4.3_plus_songs_final_with_url_id_extracted',
+}
+# url column -> id column (same names idseparater.py writes)
+ID_COLUMNS = URL_COLUMNS
+
+WORKERS = os.cpu_count() or 2
+STATE_FILE = os.path.join(OUTPUT_ROOT, '.fanout_state.json')  # input fingerprints of the last run
+
+def decade_of(filename):
+    """'songs_1955_1964_completed.csv' -> '1955_1964'."""
+    match = re.search(r"(\d{4})_(\d{4})", filename)
+    return f"{match.group(1)}_{match.group(2)}" if match else None
+
+def outputs_for(decade):
+    paths = [os.path.join(OUTPUT_ROOT, folder, f"songs_{decade}_final.csv") for folder in TIERS.values()]
+    paths += [os.path.join(OUTPUT_ROOT, folder, f"tobe_songs_{decade}_final.csv") for folder in ID_TIERS.values()]
+    return paths
+
+def config_signature():
+    config = [RATING_COL, sorted(TIERS.items()), sorted(ID_TIERS.items()), sorted(ID_COLUMNS.items()), VIDEO_ID_PATTERN]
+    return hashlib.sha256(json.dumps(config).encode('utf-8')).hexdigest()[:16]
+
+def source_path(source):
+    """A source is a raw CSV path or, in Parquet mode, a decade partition name."""
+    return source if source.endswith('.csv') else parquet_dataset.partition_path('songs', source)
+
+def source_name(source):
+    return os.path.basename(source) if source.endswith('.csv') else f"parquet:decade={source}"
+
+def fingerprint(source):
+    stat = os.stat(source_path(source))
+    return [stat.st_size, stat.st_mtime_ns, config_signature()]
+
+def load_songs(source):
+    """(decade, DataFrame) of one source, numeric ratings included."""
+    if source.endswith('.csv'):
+        df = pd.read_csv(source)
+        if RATING_COL in df.columns:
+            df[RATING_COL] = pd.to_numeric(df[RATING_COL], errors='coerce')
+        return decade_of(os.path.basename(source)), df
+    # Typed already; rows below every tier are filtered inside the scan
+    lowest = min(list(TIERS) + list(ID_TIERS))
+    columns = parquet_dataset.source_columns('songs', source)
+    df = parquet_dataset.read_frame('songs', columns=columns, filter=pc.field(RATING_COL) >= lowest, decades=[source])
+    return source, df
+
+def fan_out(source):
+    """Reads one decade once and writes every tier. Returns (name, summary)."""
+    name = source_name(source)
+    decade, df = load_songs(source)
+    if RATING_COL not in df.columns:
+        return name, f"[SKIP] column '{RATING_COL}' missing"
+
+    ratings = df[RATING_COL]
+
+    # ID columns in one pass over every row any ID tier keeps; tiers below just take row subsets
+    ids = extract_video_ids(df[ratings >= min(ID_TIERS)], ID_COLUMNS) if ID_TIERS else None
+
+    kept = []
+    for threshold, folder in TIERS.items():
+        tier = df[ratings >= threshold]
+        tier.to_csv(os.path.join(OUTPUT_ROOT, folder, f"songs_{decade}_final.csv"), index=False)
+        kept.append(f">={threshold}: {len(tier)}")
+    for threshold, folder in ID_TIERS.items():
+        rows = df[ratings >= threshold]
+        tier = pd.concat([rows, ids.loc[rows.index]], axis=1)
+        tier.to_csv(os.path.join(OUTPUT_ROOT, folder, f"tobe_songs_{decade}_final.csv"), index=False)
+
+    return name, f"{len(df)} songs read -> " + ", ".join(kept)
+
+def inside(path, root):
+    path, root = os.path.realpath(path), os.path.realpath(root)
+    return path == root or path.startswith(root + os.sep)
+
+def run_fanout():
+    if inside(OUTPUT_ROOT, CURATED_ROOT):
+        print(f"[STOP] OUTPUT_ROOT '{OUTPUT_ROOT}' is inside the curated '{CURATED_ROOT}'; "
+              f"the raw CSVs would overwrite its enriched music URLs. Pick another folder.")
+        return
+
+    sources = parquet_dataset.decades('songs') if USE_PARQUET else []
+    if sources:
+        print(f"Reading Parquet dataset: {parquet_dataset.PARQUET_ROOT}/songs...\n")
+    else:
+        print(f"Scanning folder: {INPUT_FOLDER}...\n")
+        sources = sorted(os.path.join(INPUT_FOLDER, f) for f in os.listdir(INPUT_FOLDER) if f.endswith('.csv') and decade_of(f))
+    if not sources:
+        print("No decade CSV files found.")
+        return
+
+    for folder in list(TIERS.values()) + list(ID_TIERS.values()):
+        os.makedirs(os.path.join(OUTPUT_ROOT, folder), exist_ok=True)
+
+    try:
+        with open(STATE_FILE, encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        state = {}
+
+    # Unchanged input + same config + all outputs present -> nothing to do
+    todo = []
+    for source in sources:
+        name = source_name(source)
+        if state.get(name) == fingerprint(source) and all(map(os.path.exists, outputs_for(decade_of(name)))):
+            print(f"[UNCHANGED] {name}")
+        else:
+            todo.append(source)
+
+    started = time.time()
+    processed = 0
+    with ProcessPoolExecutor(max_workers=min(WORKERS, max(len(todo), 1))) as pool:
+        futures = {pool.submit(fan_out, source): source for source in todo}
+        for future, source in futures.items():
+            name = source_name(source)
+            try:
+                _, summary = future.result()
+                print(f"[CREATED] {name}: {summary}")
+                state[name] = fingerprint(source)
+                processed += 1
+            except Exception as e:
+                print(f"[ERROR] processing {name}: {e}")
+
+    with open(STATE_FILE, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=1)
+
+    print("-" * 30)
+    print(f"Done. {processed} processed, {len(sources) - len(todo)} unchanged in {time.time() - started:.1f}s "
+          f"-> {len(TIERS)} tiers + {len(ID_TIERS)} ID tier(s) under '{OUTPUT_ROOT}'.")
+
+if __name__ == "__main__":
+    run_fanout()
@@ -1,6 +1,6 @@
 import os
-import re
 import shutil
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import pandas as pd
 
 # --- CONFIGURATION ---
@@ -14,18 +14,58 @@ DEST_DIR = f'downloads/songs/best_of_{start}_{end}'
 RATING_COL = 'song_rating'       
 RATING_THRESHOLD = 4.3
 
+# Songs are hardlinked (or reflinked) from SOURCE_DIR, so a best-of folder
+# costs no extra disk; only cross-device destinations fall back to copies.
+COPY_WORKERS = 8
+MANIFEST_CSV = os.path.join(DEST_DIR, 'manifest.csv')
+
 # Create destination folder
 os.makedirs(DEST_DIR, exist_ok=True)
 
-# --- UTILITY (Must match your downloader exactly) ---
-def sanitize_filename(name):
+# --- UTILITY ---
+def index_songs(folder):
     """
-    Exact copy of the sanitization logic from the downloader 
-    to ensure we find the correct files.
+    One scan of a downloads folder: song_uuid -> filename.
+    Files are named [uuid]_[title].mp3, so only the uuid part is used and a
+    change in title sanitisation can't break matching.
     """
-    name = re.sub(r'[\\/*?:"<>|]', "", str(name))
-    name = re.sub(r'\s+', ' ', name).strip()
-    return name[:100]
+    index = {}
+    if not os.path.isdir(folder): return index
+    with os.scandir(folder) as entries:
+        for entry in entries:
+            if entry.name.endswith('.mp3') and not entry.name.endswith('.part.mp3') and '_' in entry.name:
+                index[entry.name.split('_', 1)[0]] = entry.name
+    return index
+
+def reflink(src, dst):
+    """Copy-on-write clone (Linux btrfs/XFS FICLONE). Raises OSError where unsupported."""
+    import fcntl
+    FICLONE = 0x40049409
+    with open(src, 'rb') as f_src, open(dst, 'wb') as f_dst:
+        try:
+            fcntl.ioctl(f_dst.fileno(), FICLONE, f_src.fileno())
+        except OSError:
+            f_dst.close()
+            os.remove(dst)
+            raise
+
+def link_file(src, dst):
+    """Hardlink, else reflink; returns the method or None if both failed (caller copies)."""
+    try:
+        os.link(src, dst)
+        return "hardlink"
+    except OSError:
+        pass
+    try:
+        reflink(src, dst)
+        return "reflink"
+    except (OSError, ImportError):
+        return None
+
+def copy_file(src, dst):
+    # copy2 preserves metadata (creation time, etc.)
+    shutil.copy2(src, dst)
+    return "copy"
 
 # --- MAIN PROCESS ---
 def process_top_rated():
@@ -45,43 +85,79 @@ def process_top_rated():
     top_songs = df[
         (df[RATING_COL] >= RATING_THRESHOLD) & 
         (df['song_uuid'].notna())
-    ]
+    ].drop_duplicates('song_uuid')
     
     print(f"Found {len(top_songs)} songs with {RATING_COL} >= {RATING_THRESHOLD}")
-    
-    copied_count = 0
+
+    # 3. Diff against the source index and what's already in DEST_DIR
+    source = index_songs(SOURCE_DIR)
+    present = index_songs(DEST_DIR)  # Only what is really on disk (the manifest is output only)
+
+    wanted = {}
     missing_count = 0
-    
-    # 3. Iterate and Copy
-    for index, row in top_songs.iterrows():
-        # Reconstruct the expected filename
-        s_title = row.get('song_title', 'unknown')
-        s_uuid = row.get('song_uuid')
-        
-        clean_title = sanitize_filename(s_title)
-        
-        # Expected filename format: UUID_Title.mp3
-        filename = f"{s_uuid}_{clean_title}.mp3"
-        
-        src_path = os.path.join(SOURCE_DIR, filename)
-        dst_path = os.path.join(DEST_DIR, filename)
-        
-        if os.path.exists(src_path):
-            try:
-                # copy2 preserves metadata (creation time, etc.)
-                shutil.copy2(src_path, dst_path)
-                copied_count += 1
-            except Exception as e:
-                print(f"Error copying {filename}: {e}")
-        else:
-            missing_count += 1
+    for s_uuid in top_songs['song_uuid'].astype(str):
+        if s_uuid in source: wanted[s_uuid] = source[s_uuid]
+        else: missing_count += 1
+
+    to_remove = [u for u in present if u not in wanted]
+    to_add = [u for u in wanted if u not in present]
+
+    # 4. Remove songs that no longer qualify (e.g. threshold was raised)
+    removed_count = 0
+    for s_uuid in to_remove:
+        try:
+            os.remove(os.path.join(DEST_DIR, present[s_uuid]))
+            removed_count += 1
+        except FileNotFoundError:
+            removed_count += 1
+        except Exception as e:
+            print(f"Error removing {present[s_uuid]}: {e}")
+
+    # 5. Add the new ones: links first (no extra disk), parallel copies as fallback
+    methods = {"hardlink": 0, "reflink": 0, "copy": 0}
+    added = set()
+    to_copy = []
+    for s_uuid in to_add:
+        src_path = os.path.join(SOURCE_DIR, wanted[s_uuid])
+        dst_path = os.path.join(DEST_DIR, wanted[s_uuid])
+        method = link_file(src_path, dst_path)
+        if method:
+            methods[method] += 1
+            added.add(s_uuid)
+        else: to_copy.append((s_uuid, src_path, dst_path))
+
+    if to_copy:
+        with ThreadPoolExecutor(max_workers=COPY_WORKERS) as pool:
+            futures = {pool.submit(copy_file, src, dst): (s_uuid, dst) for s_uuid, src, dst in to_copy}
+            for future in as_completed(futures):
+                s_uuid, dst = futures[future]
+                try:
+                    methods[future.result()] += 1
+                    added.add(s_uuid)
+                except Exception as e:
+                    print(f"Error copying {os.path.basename(dst)}: {e}")
+
+    # 6. Manifest of the best-of set actually in DEST_DIR (failed copies are retried next run)
+    in_place = [u for u in wanted if u in present or u in added]
+    info = top_songs.assign(song_uuid=top_songs['song_uuid'].astype(str)).set_index('song_uuid')
+    manifest = pd.DataFrame({
+        'song_uuid': in_place,
+        'song_title': [info.at[u, 'song_title'] if 'song_title' in info else '' for u in in_place],
+        RATING_COL: [info.at[u, RATING_COL] for u in in_place],
+        'file': [wanted[u] for u in in_place],
+    })
+    manifest.to_csv(MANIFEST_CSV, index=False)
 
     print("-" * 30)
     print(f"Process Complete.")
     print(f"Total Eligible Songs: {len(top_songs)}")
-    print(f"Successfully Copied:  {copied_count}")
+    print(f"Added:                {len(added)} ({methods['hardlink']} hardlinked, {methods['reflink']} reflinked, {methods['copy']} copied)")
+    if len(added) < len(to_add):
+        print(f"Failed:               {len(to_add) - len(added)} (retried next run)")
+    print(f"Removed:              {removed_count}")
+    print(f"Unchanged:            {len(wanted) - len(to_add)}")
     print(f"Files Not Found:      {missing_count}")
-    print(f"Files located in:     {DEST_DIR}")
+    print(f"Files located in:     {DEST_DIR} (manifest: {MANIFEST_CSV})")
 
 if __name__ == "__main__":
-    process_top_rated()
\ No newline at end of file
+    process_top_rated()
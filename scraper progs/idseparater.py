@@ -1,80 +1,60 @@
 import os
-import re
 import pandas as pd
+import pyarrow.compute as pc
+
+import parquet_dataset
+from video_ids import extract_video_ids
 
 # --- CONFIGURATION ---
 # Input: The folder where you saved the >= 4.3 CSVs in the previous step
 INPUT_FOLDER = 'filtered_data_4.3'
+# Or read the decade partitions built by parquet_dataset.py when present:
+# the >= RATING_THRESHOLD filter runs inside the Parquet scan, so the
+# previous filtering step isn't needed. Falls back to INPUT_FOLDER.
+USE_PARQUET = True
+RATING_COL = 'song_rating'
+RATING_THRESHOLD = 4.3
 
 # Output: New folder for the CSVs that have the IDs added
 OUTPUT_FOLDER = 'filtered_data_4.3/final_with_ids'
 
 os.makedirs(OUTPUT_FOLDER, exist_ok=True)
 
-# --- UTILITY: ID Extractor ---
-def extract_video_id(url):
-    """
-    Extracts the 11-character YouTube Video ID from a URL.
-    Works for:
-    - https://www.youtube.com/watch?v=dQw4w9WgXcQ
-    - https://youtu.be/dQw4w9WgXcQ
-    - https://music.youtube.com/watch?v=dQw4w9WgXcQ
-    """
-    if pd.isna(url) or str(url).strip() == '':
-        return ""
-    
-    url = str(url).strip()
-    # Regex checks for 'v=' or short URL format
-    match = re.search(r"(?:v=|\/)([0-9A-Za-z_-]{11})", url)
-    if match:
-        return match.group(1)
-    return ""
+def list_sources():
+    """[(output filename, loader)] from the Parquet dataset, else INPUT_FOLDER."""
+    decades = parquet_dataset.decades('songs') if USE_PARQUET else []
+    if decades:
+        print(f"Reading Parquet dataset: {parquet_dataset.PARQUET_ROOT}/songs...\n")
+        return [(f"songs_{d}.csv", lambda d=d: parquet_dataset.read_frame(
+                    'songs', columns=parquet_dataset.source_columns('songs', d),
+                    filter=pc.field(RATING_COL) >= RATING_THRESHOLD, decades=[d]))
+                for d in decades]
+    print(f"Scanning {INPUT_FOLDER}...\n")
+    return [(f, lambda f=f: pd.read_csv(os.path.join(INPUT_FOLDER, f)))
+            for f in os.listdir(INPUT_FOLDER) if f.endswith('.csv')]
 
 # --- MAIN PROCESS ---
 def process_ids():
-    print(f"Scanning {INPUT_FOLDER}...\n")
-    
-    files = [f for f in os.listdir(INPUT_FOLDER) if f.endswith('.csv')]
-    
-    if not files:
+    sources = list_sources()
+
+    if not sources:
         print("No CSV files found to process.")
         return
 
     processed_count = 0
 
-    for filename in files:
-        input_path = os.path.join(INPUT_FOLDER, filename)
+    for filename, load in sources:
         output_path = os.path.join(OUTPUT_FOLDER, filename)
 
         try:
-            df = pd.read_csv(input_path)
-            
-            # --- CREATE NEW COLUMNS ---
-            # We use .apply() to run the extractor on every row
-            
-            # 1. youtube_url -> youtubeurlid
-            if 'youtube_url' in df.columns:
-                df['youtubeurlid'] = df['youtube_url'].apply(extract_video_id)
-            else:
-                df['youtubeurlid'] = "" # Create empty col if original missing
-
-            # 2. music_yt_url_1 -> musicurlid1
-            if 'music_yt_url_1' in df.columns:
-                df['musicurlid1'] = df['music_yt_url_1'].apply(extract_video_id)
-            else:
-                df['musicurlid1'] = ""
+            df = load()
 
-            # 3. music_yt_url_2 -> musicurlid2
-            if 'music_yt_url_2' in df.columns:
-                df['musicurlid2'] = df['music_yt_url_2'].apply(extract_video_id)
-            else:
-                df['musicurlid2'] = ""
-
-            # 4. music_yt_url_3 -> musicurlid3
-            if 'music_yt_url_3' in df.columns:
-                df['musicurlid3'] = df['music_yt_url_3'].apply(extract_video_id)
-            else:
-                df['musicurlid3'] = ""
+            # --- CREATE NEW COLUMNS ---
+            # youtube_url -> youtubeurlid, music_yt_url_1..3 -> musicurlid1..3
+            # in one vectorized pass (empty where a URL or its column is missing)
+            ids = extract_video_ids(df)
+            for column in ids.columns:
+                df[column] = ids[column]
 
             # --- SAVE ---
             df.to_csv(output_path, index=False)
@@ -89,4 +69,4 @@ def process_ids():
     print(f"New CSVs are in: {OUTPUT_FOLDER}")
 
 if __name__ == "__main__":
-    process_ids()
\ No newline at end of file
+    process_ids()
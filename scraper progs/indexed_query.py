@@ -0,0 +1,223 @@
+import os
+import json
+import math
+from array import array
+from collections import defaultdict
+
+import numpy as np
+
+from catalog import Catalog, SongView, AlbumView, StringTable, RATING_SCALE, MISSING_INT, MISSING_RATING
+
+# --- CONFIGURATION ---
+# Which indexes exist is read from the "indexes" field of each schema file.
+SCHEMAS_DIR = '../schemas'
+SCHEMA_FILES = {'albums': 'albums_schema.json', 'songs': 'songs_schema.json'}
+
+# Comma-separated credit lists: an equality lookup matches any one listed name,
+# so 'R.D. Burman' finds 'R.D. Burman, Anu Malik' too.
+MULTI_VALUE_COLUMNS = {'album_music_director', 'album_lyricist', 'song_singers'}
+MULTI_VALUE_SEPARATOR = ', '
+
+# A range predicate is checked row by row on the candidates instead of read
+# from its index when it would return this many times more rows.
+PROBE_RATIO = 8
+
+EMPTY = np.empty(0, dtype=np.int32)
+
+def load_indexes(table):
+    with open(os.path.join(SCHEMAS_DIR, SCHEMA_FILES[table]), encoding='utf-8') as f:
+        return json.load(f).get('indexes', [])
+
+# --- INDEXES ---
+class SortedIndex:
+    """Range index: row ids ordered by value, so a range is two binary searches."""
+    __slots__ = ('keys', 'values', 'rows')
+
+    def __init__(self, keys, missing):
+        self.keys = keys  # Per row, for probing
+        present = np.flatnonzero(keys != missing)
+        order = present[np.argsort(keys[present], kind='stable')]
+        self.values = keys[order]
+        self.rows = order.astype(np.int32)
+
+    def bounds(self, lo, hi):
+        start = 0 if lo is None else int(np.searchsorted(self.values, lo, 'left'))
+        end = len(self.values) if hi is None else int(np.searchsorted(self.values, hi, 'right'))
+        return start, max(start, end)
+
+    def count(self, condition):
+        start, end = self.bounds(*condition)
+        return end - start
+
+    def lookup(self, condition):
+        start, end = self.bounds(*condition)
+        return np.sort(self.rows[start:end])
+
+    def probe(self, rows, condition):
+        """The subset of rows whose value is in range, without touching the index."""
+        lo, hi = condition
+        values = self.keys[rows]
+        mask = np.ones(len(rows), dtype=bool)
+        if lo is not None: mask &= values >= lo
+        if hi is not None: mask &= values <= hi
+        return rows[mask]
+
+class HashIndex:
+    """Equality index: key -> sorted row ids."""
+    __slots__ = ('rows',)
+
+    def __init__(self, keys, split=None):
+        groups = defaultdict(list)
+        for row, key in enumerate(keys):
+            if key is None: continue
+            for part in (key.split(split) if split else (key,)):
+                groups[part].append(row)
+        self.rows = {key: np.array(rows, dtype=np.int32) for key, rows in groups.items()}
+
+    def count(self, condition):
+        return len(self.lookup(condition))
+
+    def lookup(self, key):
+        return self.rows.get(key, EMPTY)
+
+class ForeignKeyIndex:
+    """
+    Equality index on a dense integer key (song -> album row): a direct-address
+    table of offsets into the rows sorted by key, so looking up many keys at
+    once is a vectorized gather instead of one dict hit per key.
+    """
+    __slots__ = ('keys', 'rows', 'starts')
+
+    def __init__(self, keys, key_count):
+        self.keys = keys  # Per row, for probing
+        self.rows = np.argsort(keys, kind='stable').astype(np.int32)
+        self.starts = np.searchsorted(keys[self.rows], np.arange(key_count + 1)).astype(np.int64)
+
+    def sizes(self, keys):
+        return self.starts[keys + 1] - self.starts[keys]
+
+    def count(self, key):
+        return int(self.starts[key + 1] - self.starts[key]) if key >= 0 else 0
+
+    def lookup(self, key):
+        return self.rows[self.starts[key]:self.starts[key + 1]] if key >= 0 else EMPTY
+
+    def lookup_many(self, keys):
+        lengths = self.sizes(keys)
+        total = int(lengths.sum())
+        if not total: return EMPTY
+        # Positions starts[k]..starts[k+1] for every key, concatenated
+        shift = np.repeat(self.starts[keys] - (np.cumsum(lengths) - lengths), lengths)
+        return np.sort(self.rows[shift + np.arange(total)])
+
+    def probe_many(self, rows, keys, key_count):
+        wanted = np.zeros(key_count, dtype=bool)
+        wanted[keys] = True
+        return rows[wanted[self.keys[rows]]]
+
+def intersect(rows, other):
+    return np.intersect1d(rows, other, assume_unique=True)
+
+# --- QUERY ENGINE ---
+class QueryEngine:
+    """
+    Secondary indexes over the catalog for exactly the columns the schemas
+    declare (albums: album_year, album_music_director; songs: album_uuid,
+    song_rating). Numeric columns get a SortedIndex, strings a HashIndex and
+    the songs' album_uuid a ForeignKeyIndex. Conditions are `column=value` (equality) or
+    `column=(lo, hi)` (inclusive range, None = open).
+    """
+
+    def __init__(self, catalog=None):
+        self.catalog = catalog or Catalog()
+        self.indexes = {table: {column: self.build_index(table, column) for column in load_indexes(table)}
+                        for table in SCHEMA_FILES}
+
+    def build_index(self, table, column):
+        c = self.catalog
+        if table == 'songs' and column == 'album_uuid':
+            # Foreign key: keyed by album row, which is what album predicates produce
+            return ForeignKeyIndex(c.song_album_row, c.album_count())
+        source = getattr(c, column, None)
+        if isinstance(source, array):
+            missing = MISSING_RATING if column.endswith('_rating') else MISSING_INT
+            return SortedIndex(np.frombuffer(source, dtype=source.typecode), missing)
+        if isinstance(source, StringTable):
+            split = MULTI_VALUE_SEPARATOR if column in MULTI_VALUE_COLUMNS else None
+            return HashIndex([source.values[code] for code in source.codes], split)
+        raise ValueError(f"{table}.{column}: no catalog column to index")
+
+    def encode(self, table, column, condition):
+        """Query value(s) -> index keys (ratings are stored as hundredths, album_uuid as album row)."""
+        if table == 'songs' and column == 'album_uuid':
+            return self.catalog.album_uuid.find(condition)
+        if column.endswith('_rating'):
+            lo, hi = condition if isinstance(condition, tuple) else (condition, condition)
+            # Tiny tolerance: 4.3 * 100 is 429.99999999999994
+            lo = None if lo is None else math.ceil(round(lo * RATING_SCALE, 6))
+            hi = None if hi is None else math.floor(round(hi * RATING_SCALE, 6))
+            return lo, hi
+        if isinstance(self.indexes[table][column], SortedIndex) and not isinstance(condition, tuple):
+            return condition, condition
+        return condition
+
+    def index_for(self, table, column):
+        index = self.indexes[table].get(column)
+        if index is None:
+            raise KeyError(f"{table}.{column} is not indexed (declared: {', '.join(self.indexes[table])})")
+        return index
+
+    def predicate(self, table, column, condition):
+        """(estimated rows, lookup(), probe(rows) or None) for one condition."""
+        index = self.index_for(table, column)
+        key = self.encode(table, column, condition)
+        probe = (lambda rows: index.probe(rows, key)) if isinstance(index, SortedIndex) else None
+        return index.count(key), (lambda: index.lookup(key)), probe
+
+    def album_join(self, album_rows):
+        """Songs of a set of albums, as a predicate on the album_uuid index."""
+        index = self.index_for('songs', 'album_uuid')
+        return (int(index.sizes(album_rows).sum()), (lambda: index.lookup_many(album_rows)),
+                lambda rows: index.probe_many(rows, album_rows, self.catalog.album_count()))
+
+    def select(self, predicates):
+        """
+        Row ids matching every predicate. They run from the most to the least
+        selective; one returning many times more rows than are left is probed
+        on those rows instead of being materialized and intersected.
+        """
+        if not predicates:
+            raise ValueError("at least one condition is needed")
+        rows = None
+        for count, lookup, probe in sorted(predicates, key=lambda p: p[0]):
+            if rows is not None and probe is not None and count > PROBE_RATIO * len(rows):
+                rows = probe(rows)
+            else:
+                rows = lookup() if rows is None else intersect(rows, lookup())
+            if not len(rows): break
+        return rows
+
+    def album_rows(self, **conditions):
+        return self.select([self.predicate('albums', column, condition) for column, condition in conditions.items()])
+
+    def song_rows(self, **conditions):
+        """Song conditions plus any album conditions, joined through the album_uuid index."""
+        album_conditions = {k: v for k, v in conditions.items() if k in self.indexes['albums']}
+        predicates = [self.predicate('songs', column, condition)
+                      for column, condition in conditions.items() if column not in album_conditions]
+        if album_conditions:
+            predicates.append(self.album_join(self.album_rows(**album_conditions)))
+        return self.select(predicates)
+
+    def albums(self, **conditions):
+        return [AlbumView(self.catalog, int(row)) for row in self.album_rows(**conditions)]
+
+    def songs(self, **conditions):
+        return [SongView(self.catalog, int(row)) for row in self.song_rows(**conditions)]
+
+if __name__ == "__main__":
+    engine = QueryEngine()
+    songs = engine.songs(song_rating=(4.3, None), album_music_director='R.D. Burman', album_year=(1970, 1980))
+    print(f"{len(songs)} songs rated >= 4.3 from R.D. Burman albums, 1970-1980")
+    for song in songs[:10]:
+        print(f"  {song.song_rating:<5} {song.song_title} ({song.album.album_title}, {song.album.album_year})")
@@ -0,0 +1,96 @@
+import asyncio
+from urllib.parse import urlsplit, urljoin
+
+import aiohttp
+
+from myswar_parser import parse_album_page
+from rate_limiter import get_limiter
+
+# --- CONFIGURATION ---
+# Point BASE_URL at a local stand-in server (see myswar_standin_server.py)
+# to run the fetcher against saved myswar HTML instead of the live site.
+BASE_URL = "https://myswar.co"
+PER_HOST_LIMIT = 6         # Max album pages in flight per host
+REQUEST_TIMEOUT = 30       # Seconds per album page
+
+HTTP_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml",
+}
+
+def site_url(href):
+    """Re-roots a myswar href (absolute or relative) onto BASE_URL."""
+    parts = urlsplit(href)
+    path = parts.path + (f"?{parts.query}" if parts.query else "")
+    return urljoin(BASE_URL.rstrip("/") + "/", path.lstrip("/"))
+
+async def _get(session, url, validators=None):
+    """
+    One GET, conditional when validators (etag, last_modified) are given.
+    Returns (status, html, etag, last_modified); status is None on a network error.
+    """
+    headers = {}
+    etag, last_modified = validators or (None, None)
+    if etag: headers["If-None-Match"] = etag
+    if last_modified: headers["If-Modified-Since"] = last_modified
+
+    full_url = site_url(url)
+    limiter = get_limiter(urlsplit(full_url).hostname)
+    await limiter.acquire_async()
+    try:
+        async with session.get(full_url, headers=headers) as resp:
+            if resp.status == 429:
+                limiter.on_throttle()
+                return 429, None, None, None
+            limiter.on_success()
+            if resp.status == 304: return 304, None, etag, last_modified
+            if resp.status != 200: return resp.status, None, None, None
+            html = await resp.text()
+            return 200, html, resp.headers.get("ETag"), resp.headers.get("Last-Modified")
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        limiter.report(e)
+        return None, None, None, None
+
+async def _fetch_one(session, url, cache=None):
+    status, html, _, _ = await _get(session, url)
+    if status != 200: return None
+    try:
+        parsed = parse_album_page(html)
+    except Exception as e:
+        # One odd page goes to Selenium instead of aborting the whole batch
+        print(f"  [ASYNC] Could not parse {url}: {e}")
+        return None
+    if parsed and cache: cache.put(url, html)
+    return parsed
+
+async def _run(per_host_limit, make_tasks):
+    connector = aiohttp.TCPConnector(limit_per_host=per_host_limit)
+    timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout, headers=HTTP_HEADERS) as session:
+        # A failing task yields its exception instead of cancelling the others
+        return await asyncio.gather(*make_tasks(session), return_exceptions=True)
+
+def fetch_album_pages(urls, per_host_limit=PER_HOST_LIMIT, cache=None):
+    """
+    Fetches album pages concurrently as plain HTML and parses them.
+    Returns {url: (album_rating, valid_songs)}; a value of None means the
+    page failed or needs JS, and the caller should fall back to Selenium.
+    Pages that parsed are stored in `cache` (a PageCache) when given.
+    """
+    urls = list(dict.fromkeys(urls))
+    if not urls: return {}
+    results = asyncio.run(_run(per_host_limit, lambda session: [_fetch_one(session, url, cache) for url in urls]))
+    return {url: None if isinstance(result, BaseException) else result for url, result in zip(urls, results)}
+
+def fetch_pages(urls, validators=None, per_host_limit=PER_HOST_LIMIT):
+    """
+    Raw concurrent fetch with conditional GETs.
+    validators maps url -> (etag, last_modified) from the previous crawl.
+    Returns {url: (status, html, etag, last_modified)}; status 304 means unchanged.
+    """
+    urls = list(dict.fromkeys(urls))
+    if not urls: return {}
+    validators = validators or {}
+    results = asyncio.run(_run(per_host_limit, lambda session: [_get(session, url, validators.get(url)) for url in urls]))
+    return {url: (None, None, None, None) if isinstance(result, BaseException) else result
+            for url, result in zip(urls, results)}
@@ -0,0 +1,206 @@
+import csv
+import os
+import json
+import time
+import hashlib
+
+import myswar_scrapper as scraper
+from myswar_scrapper import Colors, ALBUM_HEADERS, SONG_HEADERS
+from myswar_parser import parse_album_page, parse_listing_page
+from myswar_async_fetch import fetch_pages, site_url
+from crawl_state import CrawlState
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+
+# --- CONFIGURATION ---
+# Weekly refresh of the years that still change. Every listing and album
+# page is fetched with If-None-Match / If-Modified-Since and hashed; only
+# albums whose rows actually changed are written to the *_delta CSVs.
+START_YEAR = 2015
+END_YEAR = 2025
+
+STATE_DB = f"myswar_incremental_{START_YEAR}_{END_YEAR}.sqlite"
+ALBUMS_DELTA_CSV = f"myswar_albums_{START_YEAR}_{END_YEAR}_delta.csv"
+SONGS_DELTA_CSV = f"myswar_songs_{START_YEAR}_{END_YEAR}_delta.csv"
+
+def content_hash(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+def album_payload(html):
+    """[rating, songs] of an album page, or None if it has no song tables (JSON-friendly list)."""
+    parsed = parse_album_page(html)
+    return list(parsed) if parsed is not None else None
+
+def rows_hash(album_row, song_rows):
+    """Stable hash of everything we would write for one album."""
+    album_values = [str(album_row[h]) for h in ALBUM_HEADERS]
+    song_values = [[str(row[h]) for h in SONG_HEADERS] for row in song_rows]
+    return content_hash(json.dumps([album_values, song_values]))
+
+class IncrementalCrawl:
+    def __init__(self, state):
+        self.state = state
+        self.driver = None
+        self.stats = {
+            "pages_unchanged": 0, "pages_changed": 0, "pages_new": 0,
+            "albums_new": 0, "albums_changed": 0, "albums_unchanged": 0,
+        }
+
+    # --- Selenium fallback, only started if a page really needs JS ---
+    def get_driver(self):
+        if self.driver is None:
+            self.driver = scraper.setup_driver()
+        return self.driver
+
+    def close(self):
+        if self.driver:
+            try: self.driver.quit()
+            except: pass
+
+    # --- page fingerprinting ---
+    def _resolve(self, url, fetched, parse, browser_parse):
+        """
+        Turns one fetch result into the page payload, parsing only when the
+        page is new or its content hash moved. Returns (payload, changed).
+        """
+        known = self.state.get_page(url)
+        status, html, etag, last_modified = fetched
+
+        if status == 304 and known:
+            self.stats["pages_unchanged"] += 1
+            self.state.touch_page(url)
+            return known["payload"], False
+
+        payload = None
+        if status == 200:
+            page_hash = content_hash(html)
+            if known and known["content_hash"] == page_hash:
+                self.stats["pages_unchanged"] += 1
+                self.state.touch_page(url)
+                return known["payload"], False
+            payload = parse(html)
+
+        if payload is None:
+            # Fetch failed, or the HTML had no album tables (needs JS). An
+            # empty listing ([]) is a real answer and is kept as it is.
+            payload = browser_parse(url)
+            page_hash = content_hash(json.dumps(payload))
+            etag = last_modified = None
+            if known and known["content_hash"] == page_hash:
+                self.stats["pages_unchanged"] += 1
+                self.state.touch_page(url)
+                return known["payload"], False
+
+        self.stats["pages_changed" if known else "pages_new"] += 1
+        self.state.set_page(url, page_hash, etag, last_modified, payload)
+        return payload, True
+
+    def _validators(self, urls):
+        validators = {}
+        for url in urls:
+            known = self.state.get_page(url)
+            if known: validators[url] = (known["etag"], known["last_modified"])
+        return validators
+
+    def _listing_in_browser(self, url):
+        driver = self.get_driver()
+        scraper.myswar_limiter.acquire()
+        try:
+            driver.get(site_url(url))
+            try: WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.CLASS_NAME, "song_detail_display_table")))
+            except Exception: pass
+            return parse_listing_page(driver.page_source)
+        except Exception as e:
+            print(f"{Colors.RED}      [ERROR] Listing {url}: {e}{Colors.RESET}")
+            return []
+
+    def _album_in_browser(self, url):
+        driver = self.get_driver()
+        scraper.myswar_limiter.acquire()
+        try:
+            driver.get(site_url(url))
+            return list(scraper.scrape_inner_songs(driver))
+        except Exception as e:
+            print(f"{Colors.RED}      [ERROR] Album {url}: {e}{Colors.RESET}")
+            return None
+
+    # --- crawl ---
+    def crawl_page(self, year, page_count, emit):
+        """Returns (album_count, first_album) of the listing page."""
+        url = scraper.listing_url(year, page_count)
+        fetched = fetch_pages([url], self._validators([url]))[url]
+        albums, _ = self._resolve(url, fetched, parse_listing_page, self._listing_in_browser)
+        albums = albums or []
+
+        album_urls = [a["url"] for a in albums if a["title"] is not None and a["url"]]
+        album_fetches = fetch_pages(album_urls, self._validators(album_urls))
+
+        for album in albums:
+            if album["title"] is None or not album["url"]: continue
+            parsed, _ = self._resolve(album["url"], album_fetches[album["url"]],
+                                      album_payload, self._album_in_browser)
+            if not parsed: continue
+            album_rating, valid_songs = parsed
+            if not valid_songs: continue
+
+            album_row, song_rows = scraper.build_album_rows(album, year, album_rating, valid_songs)
+            new_hash = rows_hash(album_row, song_rows)
+            old_hash = self.state.album_row_hash(album_row["album_uuid"])
+            if old_hash == new_hash:
+                self.stats["albums_unchanged"] += 1
+                continue
+
+            self.stats["albums_changed" if old_hash else "albums_new"] += 1
+            tag = "CHANGED" if old_hash else "NEW"
+            print(f"{Colors.GREEN}      [{tag}] {album['title']} | Rating: {album_rating} | Songs: {len(valid_songs)}{Colors.RESET}")
+            emit(album_row, song_rows)
+            self.state.set_album_row_hash(album_row["album_uuid"], new_hash)
+
+        first_album = albums[0]["title"] if albums else None
+        return len(albums), first_album
+
+def crawl_incremental():
+    os.system('color')
+    state = CrawlState(STATE_DB)
+    crawl = IncrementalCrawl(state)
+
+    albums_exist = os.path.exists(ALBUMS_DELTA_CSV)
+    songs_exist = os.path.exists(SONGS_DELTA_CSV)
+    started = time.time()
+
+    with open(ALBUMS_DELTA_CSV, "a", newline="", encoding="utf-8") as f_albums, \
+         open(SONGS_DELTA_CSV, "a", newline="", encoding="utf-8") as f_songs:
+        writer_albums = csv.DictWriter(f_albums, fieldnames=ALBUM_HEADERS)
+        writer_songs = csv.DictWriter(f_songs, fieldnames=SONG_HEADERS)
+        if not albums_exist: writer_albums.writeheader()
+        if not songs_exist: writer_songs.writeheader()
+
+        def emit(album_row, song_rows):
+            writer_albums.writerow(album_row)
+            writer_songs.writerows(song_rows)
+            f_albums.flush()
+            f_songs.flush()
+
+        try:
+            for year in range(START_YEAR, END_YEAR + 1):
+                print(f"{Colors.HEADER}--- Refreshing Year: {year} ---{Colors.RESET}")
+                page_count, last_page_first_album = 1, ""
+                while True:
+                    print(f"  --> Page {Colors.RED}{page_count}{Colors.RESET}")
+                    album_count, first_album = crawl.crawl_page(year, page_count, emit)
+                    if album_count < 24: break
+                    if first_album is not None and first_album == last_page_first_album: break
+                    last_page_first_album = first_album or last_page_first_album
+                    page_count += 1
+        finally:
+            crawl.close()
+            state.close()
+
+    s = crawl.stats
+    print(f"{Colors.CYAN}  Pages: {s['pages_unchanged']} unchanged, {s['pages_changed']} changed, {s['pages_new']} new{Colors.RESET}")
+    print(f"{Colors.CYAN}  Albums: {s['albums_new']} new, {s['albums_changed']} changed, {s['albums_unchanged']} unchanged{Colors.RESET}")
+    print(f"{Colors.GREEN}--- REFRESH COMPLETE in {int(time.time() - started)}s -> {ALBUMS_DELTA_CSV} / {SONGS_DELTA_CSV} ---{Colors.RESET}")
+
+if __name__ == "__main__":
+    crawl_incremental()
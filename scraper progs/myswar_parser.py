@@ -0,0 +1,251 @@
+from bs4 import BeautifulSoup
+from lxml import etree, html as lxml_html
+
+# --- CONFIGURATION ---
+# "lxml" extracts every label, the rating and the song rows of a table in a
+# single pass; "bs4" is the original BeautifulSoup code, kept as the reference.
+PARSER_BACKEND = "lxml"
+
+LISTING_LABELS = ["Album Category", "Music Director", "Lyricist", "Label"]
+
+# --- PAGE PARSING ---
+# Shared by the Selenium scraper and the async HTTP fetcher, so both paths
+# produce exactly the same rows for the same page.
+
+def get_text_from_label(soup_element, label_text):
+    label_span = soup_element.find('span', class_='attribute_lable', string=lambda t: t and label_text in t)
+    if label_span:
+        value_span = label_span.find_next_sibling('span', class_='attribute_value')
+        if value_span: return value_span.text.strip()
+    return ""
+
+def extract_rating(soup_container):
+    target_span = None
+    try:
+        label = soup_container.find("span", class_="attribute_lable", string=lambda t: t and "Overall Rating" in t)
+        if label:
+            target_span = label.find_next_sibling("span", class_="attribute_value")
+    except: pass
+
+    if not target_span:
+        try:
+            input_tag = soup_container.find("input", {"name": "score"})
+            if input_tag: target_span = input_tag.find_parent("span")
+        except: pass
+
+    if not target_span: return "0"
+
+    try:
+        input_tag = target_span.find("input", {"name": "score"})
+        if input_tag and input_tag.has_attr("value"):
+            val = input_tag["value"].strip()
+            if val:
+                try: return str(round(float(val), 2))
+                except: return val
+    except: pass
+
+    try:
+        title_text = target_span.get("title", "").strip().lower()
+        if "not enough ratings" in title_text: return "0"
+        if "bad" in title_text: return "1"
+        if "poor" in title_text: return "2"
+        if "average" in title_text: return "3"
+        if "good" in title_text: return "4"
+        if "great" in title_text: return "5"
+    except: pass
+
+    return "0"
+
+# ==============================================================================
+# BS4 BACKEND (reference)
+# ==============================================================================
+
+def _parse_album_page_bs4(html):
+    soup = BeautifulSoup(html, 'html.parser')
+
+    song_tables = soup.find_all('table', class_='song_detail_display_table')
+    if not song_tables: return None
+
+    main_block = soup.find('div', class_='album_left')
+    if main_block: album_rating = extract_rating(main_block)
+    else: album_rating = extract_rating(soup)
+
+    valid_songs = []
+    for index, table in enumerate(song_tables, start=1):
+        yt_link_tag = table.find('a', href=lambda h: h and "youtube" in h)
+        if not yt_link_tag: continue
+
+        valid_songs.append({
+            "track": index,
+            "title": table.find('a', class_='songs_like_this2').text.strip() if table.find('a', class_='songs_like_this2') else "Unknown",
+            "singers": get_text_from_label(table, "Singer"),
+            "rating": extract_rating(table),
+            "url": yt_link_tag['href']
+        })
+
+    return album_rating, valid_songs
+
+def _parse_listing_page_bs4(html):
+    soup = BeautifulSoup(html, 'html.parser')
+    albums = []
+    for table in soup.find_all('table', class_='song_detail_display_table'):
+        title_tag = table.find('a', class_='songs_like_this2')
+        albums.append({
+            "title": title_tag.text.strip() if title_tag else None,
+            "url": title_tag.get('href') if title_tag else None,
+            "labels": {label: get_text_from_label(table, label) for label in LISTING_LABELS},
+        })
+    return albums
+
+# ==============================================================================
+# LXML BACKEND (single pass per table)
+# ==============================================================================
+
+def _has_class(cls):
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {cls} ')"
+
+_XP_TABLES = etree.XPath(f"//table[{_has_class('song_detail_display_table')}]")
+_XP_ALBUM_LEFT = etree.XPath(f"//div[{_has_class('album_left')}]")
+_XP_SCORE = etree.XPath(".//input[@name='score']")
+
+def _classes(el):
+    return (el.get('class') or '').split()
+
+def _bs4_string(el):
+    """Mirrors BeautifulSoup's Tag.string: only defined for a single-child chain."""
+    children = list(el)
+    if not children: return el.text
+    if len(children) == 1 and not el.text and not children[0].tail:
+        child = children[0]
+        if not isinstance(child.tag, str): return child.text  # comment
+        return _bs4_string(child)
+    return None
+
+def _scan_table(table):
+    """
+    One walk over a table: every label span paired with its value span,
+    the first YouTube link and the first title link, in document order.
+    """
+    pairs, yt_link, title_link = [], None, None
+    for el in table.iter('span', 'a'):
+        if el.tag == 'span':
+            if 'attribute_lable' not in _classes(el): continue
+            value = next((sib for sib in el.itersiblings('span') if 'attribute_value' in _classes(sib)), None)
+            pairs.append((_bs4_string(el), value))
+        else:
+            if yt_link is None and 'youtube' in (el.get('href') or ''): yt_link = el
+            if title_link is None and 'songs_like_this2' in _classes(el): title_link = el
+    return pairs, yt_link, title_link
+
+def _label_value(pairs, label_text):
+    for label, value in pairs:
+        if label and label_text in label:
+            return value.text_content().strip() if value is not None else ""
+    return ""
+
+def _rating_lxml(container, pairs):
+    target_span = None
+    for label, value in pairs:
+        if label and "Overall Rating" in label:
+            target_span = value
+            break
+
+    if target_span is None:
+        inputs = _XP_SCORE(container)
+        if inputs: target_span = next(inputs[0].iterancestors('span'), None)
+
+    if target_span is None: return "0"
+
+    inputs = _XP_SCORE(target_span)
+    if inputs and inputs[0].get('value') is not None:
+        val = inputs[0].get('value').strip()
+        if val:
+            try: return str(round(float(val), 2))
+            except: return val
+
+    title_text = (target_span.get("title") or "").strip().lower()
+    if "not enough ratings" in title_text: return "0"
+    if "bad" in title_text: return "1"
+    if "poor" in title_text: return "2"
+    if "average" in title_text: return "3"
+    if "good" in title_text: return "4"
+    if "great" in title_text: return "5"
+    return "0"
+
+def _document(html):
+    """
+    The parsed page, or None where html.parser would find nothing either: an
+    empty body (ParserError) or a str carrying an XML encoding declaration
+    (ValueError).
+    """
+    try:
+        return lxml_html.document_fromstring(html)
+    except (etree.ParserError, ValueError):
+        return None
+
+def _parse_album_page_lxml(html):
+    doc = _document(html)
+    if doc is None: return None
+
+    song_tables = _XP_TABLES(doc)
+    if not song_tables: return None
+
+    main_block = _XP_ALBUM_LEFT(doc)
+    container = main_block[0] if main_block else doc
+    # The album rating may sit anywhere in the container, so it gets its own scan.
+    container_pairs, _, _ = _scan_table(container)
+    album_rating = _rating_lxml(container, container_pairs)
+
+    valid_songs = []
+    for index, table in enumerate(song_tables, start=1):
+        pairs, yt_link, title_link = _scan_table(table)
+        if yt_link is None: continue
+
+        valid_songs.append({
+            "track": index,
+            "title": title_link.text_content().strip() if title_link is not None else "Unknown",
+            "singers": _label_value(pairs, "Singer"),
+            "rating": _rating_lxml(table, pairs),
+            "url": yt_link.get('href')
+        })
+
+    return album_rating, valid_songs
+
+def _parse_listing_page_lxml(html):
+    doc = _document(html)
+    if doc is None: return []
+    albums = []
+    for table in _XP_TABLES(doc):
+        pairs, _, title_link = _scan_table(table)
+        albums.append({
+            "title": title_link.text_content().strip() if title_link is not None else None,
+            "url": title_link.get('href') if title_link is not None else None,
+            "labels": {label: _label_value(pairs, label) for label in LISTING_LABELS},
+        })
+    return albums
+
+# ==============================================================================
+# PUBLIC API
+# ==============================================================================
+
+_BACKENDS = {
+    "bs4": (_parse_album_page_bs4, _parse_listing_page_bs4),
+    "lxml": (_parse_album_page_lxml, _parse_listing_page_lxml),
+}
+
+def parse_album_page(html, backend=None):
+    """
+    Parses an album page into (album_rating, valid_songs).
+    Returns None when the page has no song tables at all, which means
+    it was not fully rendered (needs JS) and should go through the browser.
+    """
+    return _BACKENDS[backend or PARSER_BACKEND][0](html)
+
+def parse_listing_page(html, backend=None):
+    """
+    Parses a year listing page into one entry per album table:
+    {"title", "url", "labels": {label: value for LISTING_LABELS}}.
+    Tables without a title link are kept (title None) so the page size
+    still counts them.
+    """
+    return _BACKENDS[backend or PARSER_BACKEND][1](html)
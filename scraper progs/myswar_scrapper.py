@@ -5,7 +5,7 @@ import sys
 import os
 import re
 import random
-from bs4 import BeautifulSoup
+import threading
 
 # --- SELENIUM IMPORTS ---
 from selenium import webdriver
@@ -16,6 +16,13 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from webdriver_manager.chrome import ChromeDriverManager
 
+from myswar_parser import parse_album_page, parse_listing_page
+from myswar_async_fetch import fetch_album_pages
+from driver_pool import DriverPool
+from crawl_state import CrawlState
+from page_cache import PageCache
+from rate_limiter import get_limiter
+
 # --- COLORS FOR CONSOLE ---
 class Colors:
     HEADER = '\033[95m'
@@ -31,13 +38,37 @@ START_YEAR = 1931
 START_PAGE = 1      
 END_YEAR = 1944
 
+# "async" pulls album pages over plain HTTP and only opens a browser tab
+# for pages that need JS; "selenium" opens every album in a tab.
+FETCH_MODE = "async"
+
+# Pre-warmed spare browsers; drivers are recycled on measured memory
+# (see driver_pool.py) instead of every 15 albums. 0 = cold restarts.
+DRIVER_SPARES = 1
+
 # Dynamic filenames
 ALBUMS_CSV = f"myswar_albums_{START_YEAR}_{END_YEAR}.csv"
 SONGS_CSV = f"myswar_songs_{START_YEAR}_{END_YEAR}.csv"
+STATE_DB = f"myswar_crawl_{START_YEAR}_{END_YEAR}.sqlite"   # Resume checkpoint
+
+# Every fetched listing/album page is kept compressed in page_cache/, so
+# `python myswar_scrapper.py --replay` can re-run the whole extraction from
+# disk (no network, no browser) into the *_replay CSVs.
+USE_PAGE_CACHE = True
+REPLAY = "--replay" in sys.argv
+REPLAY_ALBUMS_CSV = f"myswar_albums_{START_YEAR}_{END_YEAR}_replay.csv"
+REPLAY_SONGS_CSV = f"myswar_songs_{START_YEAR}_{END_YEAR}_replay.csv"
 BRAVE_PATH = r"C:\Program Files\BraveSoftware\Brave-Browser\Application\brave.exe"
 
 # --- GLOBAL CACHE FOR DRIVER ---
 CACHED_DRIVER_PATH = None
+DRIVER_PATH_LOCK = threading.Lock()  # Pool threads start drivers concurrently
+driver_pool = None
+crawl_state = None
+page_cache = None
+
+# Shared with the async fetcher: paces every request we send to myswar.co
+myswar_limiter = get_limiter("myswar.co")
 
 # --- HEADERS ---
 ALBUM_HEADERS = [
@@ -71,13 +102,14 @@ def setup_driver():
     prefs = {"profile.managed_default_content_settings.images": 2}
     chrome_options.add_experimental_option("prefs", prefs)
     
-    if CACHED_DRIVER_PATH is None:
-        print(f"{Colors.CYAN}  [INIT] Checking/Downloading ChromeDriver...{Colors.RESET}")
-        try:
-            CACHED_DRIVER_PATH = ChromeDriverManager().install()
-        except Exception as e:
-            print(f"{Colors.RED}  [ERROR] Failed to check driver updates: {e}{Colors.RESET}")
-            raise e
+    with DRIVER_PATH_LOCK:
+        if CACHED_DRIVER_PATH is None:
+            print(f"{Colors.CYAN}  [INIT] Checking/Downloading ChromeDriver...{Colors.RESET}")
+            try:
+                CACHED_DRIVER_PATH = ChromeDriverManager().install()
+            except Exception as e:
+                print(f"{Colors.RED}  [ERROR] Failed to check driver updates: {e}{Colors.RESET}")
+                raise e
 
     service = Service(CACHED_DRIVER_PATH)
     driver = webdriver.Chrome(service=service, options=chrome_options)
@@ -86,57 +118,14 @@ def setup_driver():
 
 def restart_driver(driver):
     """Force kills the browser and starts a new one to clear memory"""
+    if driver_pool: return driver_pool.recycle(driver)
     print(f"{Colors.YELLOW}  [MAINTENANCE] Restarting Browser (Off-Screen) to clear memory...{Colors.RESET}")
     try: driver.quit()
     except: pass
     time.sleep(random.uniform(2.0, 4.0)) 
     return setup_driver()
 
-def get_text_from_label(soup_element, label_text):
-    label_span = soup_element.find('span', class_='attribute_lable', string=lambda t: t and label_text in t)
-    if label_span:
-        value_span = label_span.find_next_sibling('span', class_='attribute_value')
-        if value_span: return value_span.text.strip()
-    return ""
-
-def extract_rating(soup_container):
-    target_span = None
-    try:
-        label = soup_container.find("span", class_="attribute_lable", string=lambda t: t and "Overall Rating" in t)
-        if label:
-            target_span = label.find_next_sibling("span", class_="attribute_value")
-    except: pass
-
-    if not target_span:
-        try:
-            input_tag = soup_container.find("input", {"name": "score"})
-            if input_tag: target_span = input_tag.find_parent("span")
-        except: pass
-
-    if not target_span: return "0"
-
-    try:
-        input_tag = target_span.find("input", {"name": "score"})
-        if input_tag and input_tag.has_attr("value"):
-            val = input_tag["value"].strip()
-            if val:
-                try: return str(round(float(val), 2))
-                except: return val
-    except: pass
-
-    try:
-        title_text = target_span.get("title", "").strip().lower()
-        if "not enough ratings" in title_text: return "0"
-        if "bad" in title_text: return "1"
-        if "poor" in title_text: return "2"
-        if "average" in title_text: return "3"
-        if "good" in title_text: return "4"
-        if "great" in title_text: return "5"
-    except: pass
-
-    return "0"
-
-def scrape_inner_songs(driver, attempt=1):
+def scrape_inner_songs(driver, attempt=1, cache_key=None):
     valid_songs = []
     album_rating = "0"
 
@@ -145,36 +134,236 @@ def scrape_inner_songs(driver, attempt=1):
         try: driver.execute_script("window.stop();")
         except: pass
         
-        soup = BeautifulSoup(driver.page_source, 'html.parser')
-
-        main_block = soup.find('div', class_='album_left') 
-        if main_block: album_rating = extract_rating(main_block)
-        else: album_rating = extract_rating(soup)
-
-        song_tables = soup.find_all('table', class_='song_detail_display_table')
-        
-        for index, table in enumerate(song_tables, start=1):
-            yt_link_tag = table.find('a', href=lambda h: h and "youtube" in h)
-            if not yt_link_tag: continue 
-
-            valid_songs.append({
-                "track": index, 
-                "title": table.find('a', class_='songs_like_this2').text.strip() if table.find('a', class_='songs_like_this2') else "Unknown", 
-                "singers": get_text_from_label(table, "Singer"),
-                "rating": extract_rating(table), 
-                "url": yt_link_tag['href']
-            })
+        html = driver.page_source
+        parsed = parse_album_page(html)
+        if parsed:
+            album_rating, valid_songs = parsed
+            if page_cache and cache_key: page_cache.put(cache_key, html)
             
     except Exception:
         if attempt == 1:
             try: driver.refresh()
             except: pass
             time.sleep(random.uniform(3.0, 5.0)) 
-            return scrape_inner_songs(driver, attempt=2)
+            return scrape_inner_songs(driver, attempt=2, cache_key=cache_key)
             
     return album_rating, valid_songs
 
+def listing_url(year, page_count):
+    if page_count == 1:
+        return f"https://myswar.co/album/year/{year}"
+    return f"https://myswar.co/album/year/{year}/{page_count}?album_type=&album_filter_years=&album_filter_labels=&album_filter_md=&album_filter_lyricist=&album_filter_album_artist=&ut=3"
+
+def album_uuid_for(album_title, year):
+    unique_album_string = f"{album_title}_{year}".lower().strip()
+    return str(uuid.uuid5(uuid.NAMESPACE_DNS, unique_album_string))
+
+def build_album_rows(album, year, album_rating, valid_songs):
+    """Turns one scraped album (a parse_listing_page entry) into its ALBUM_HEADERS row and SONG_HEADERS rows."""
+    album_title = album["title"]
+    labels = album["labels"]
+    current_album_uuid = album_uuid_for(album_title, year)
+
+    album_row = {
+        "album_uuid": current_album_uuid,
+        "album_title": album_title,
+        "album_year": year,
+        "album_category": labels["Album Category"],
+        "album_music_director": labels["Music Director"],
+        "album_lyricist": labels["Lyricist"],
+        "album_label": labels["Label"],
+        "album_rating": album_rating
+    }
+
+    song_rows = []
+    for song in valid_songs:
+        unique_song_string = f"{current_album_uuid}_{song['track']}_{song['title']}".lower().strip()
+        song_uuid = str(uuid.uuid5(uuid.NAMESPACE_DNS, unique_song_string))
+
+        song_rows.append({
+            "song_uuid": song_uuid,
+            "album_uuid": current_album_uuid,
+            "track_number": song['track'],
+            "song_title": song['title'],
+            "song_singers": song['singers'],
+            "song_rating": song['rating'],
+            "youtube_url": song['url']
+        })
+
+    return album_row, song_rows
+
+# --- LISTING PAGE RESULTS ---
+PAGE_MORE = "more"      # Full page, the year may continue on the next page
+PAGE_DONE = "done"      # Last / empty / repeated page, the year is finished
+PAGE_FAILED = "failed"  # Page or some of its albums failed: left unfinished, rest of the year waits for a rerun
+
+# Albums opened in a browser tab by this process (drives maintenance restarts)
+processed_count = 0
+
+def scrape_listing_page(driver, year, page_count, on_album, last_page_first_album=""):
+    """
+    Loads one listing page (year, page_count) and scrapes every album on it,
+    handing each (album_row, song_rows) to on_album as soon as it is ready.
+    Returns (driver, status, first_album); the driver may have been restarted.
+    """
+    global processed_count
+
+    target_url = listing_url(year, page_count)
+    print(f"  --> Scraping Page {Colors.RED}{page_count}{Colors.RESET} ..............................................")
+
+    if REPLAY:
+        # --- REPLAY: listing straight from the page cache ---
+        listing_html = page_cache.get(target_url)
+        if listing_html is None:
+            print(f"{Colors.YELLOW}      [REPLAY] Page not cached. Finished Year {year}.{Colors.RESET}")
+            return driver, PAGE_DONE, last_page_first_album
+    else:
+        # --- PAGE LOAD (Safe Retry) ---
+        load_success = False
+        for _ in range(3):
+            myswar_limiter.acquire()
+            try:
+                driver.get(target_url)
+                myswar_limiter.report()
+                load_success = True
+                break
+            except Exception as e:
+                myswar_limiter.report(e)
+                print(f"{Colors.YELLOW}      [WARN] Timeout. Reloading...{Colors.RESET}")
+                driver = restart_driver(driver)
+        
+        if not load_success:
+            print(f"{Colors.RED}      [ERROR] Could not load Page {page_count}. Skipping year.{Colors.RESET}")
+            return driver, PAGE_FAILED, last_page_first_album
+
+        # Pacing is the limiter's job; here we only wait for the tables to render.
+        # (A year's last, empty page simply times out.)
+        try: WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.CLASS_NAME, "song_detail_display_table")))
+        except Exception: pass
+        listing_html = driver.page_source
+        if page_cache: page_cache.put(target_url, listing_html)
+    
+    album_tables = parse_listing_page(listing_html)
+    
+    if len(album_tables) == 0:
+        print(f"{Colors.BLUE}  [INFO] No albums found. Finished Year {year}.{Colors.RESET}")
+        return driver, PAGE_DONE, last_page_first_album
+
+    current_first_album = album_tables[0]["title"]
+    if current_first_album is not None:
+        if current_first_album == last_page_first_album:
+            print(f"{Colors.BLUE}  [INFO] Duplicate Page Detected (Redirect Loop). Finished Year {year}.{Colors.RESET}")
+            return driver, PAGE_DONE, last_page_first_album
+        last_page_first_album = current_first_album
+
+    main_window = driver.current_window_handle if driver else None
+
+    # --- CHECKPOINT: albums already written on a previous run are never reopened ---
+    known = set()
+    if crawl_state:
+        known = {album["title"] for album in album_tables
+                 if album["title"] is not None and crawl_state.has_album(album_uuid_for(album["title"], year))}
+        if known: print(f"{Colors.BLUE}      [RESUME] {len(known)} albums already done on this page{Colors.RESET}")
+
+    # --- ASYNC PREFETCH: all album pages of this listing at once ---
+    prefetched = {}
+    if REPLAY:
+        for album in album_tables:
+            album_html = page_cache.get(album["url"]) if album["url"] else None
+            if album_html: prefetched[album["url"]] = parse_album_page(album_html)
+    elif FETCH_MODE == "async":
+        album_urls = [album["url"] for album in album_tables if album["url"] and album["title"] not in known]
+        prefetched = fetch_album_pages(album_urls, cache=page_cache)
+        http_ok = sum(1 for r in prefetched.values() if r)
+        print(f"{Colors.CYAN}      [ASYNC] {http_ok}/{len(album_urls)} albums fetched over HTTP{Colors.RESET}")
+
+    unfinished = 0  # albums that errored; the page is only complete without any
+    for album in album_tables:
+        if album["title"] is None or not album["url"]: continue
+        if album["title"] in known: continue
+        
+        album_title = album["title"]
+        album_url = album["url"]
+
+        fetched = prefetched.get(album_url)
+        if fetched:
+            album_rating, valid_songs = fetched
+        elif REPLAY:
+            print(f"{Colors.YELLOW}      [REPLAY] {album_title} not cached{Colors.RESET}")
+            continue
+        else:
+            processed_count += 1
+            
+            # --- MAINTENANCE: swap in a warm browser once this one is too big ---
+            # The album tables are already parsed, so the new browser can open
+            # tabs straight away without reloading the listing page.
+            if driver_pool:
+                if driver_pool.should_recycle(driver):
+                    driver = driver_pool.recycle(driver)
+                    main_window = driver.current_window_handle
+
+            # --- MAINTENANCE RELOAD (Safe Retry) ---
+            elif processed_count % 15 == 0:
+                driver = restart_driver(driver)
+                reload_ok = False
+                for _ in range(3):
+                    try:
+                        driver.get(target_url)
+                        reload_ok = True
+                        break
+                    except:
+                        driver = restart_driver(driver)
+                
+                if not reload_ok:
+                    unfinished += 1
+                    break
+                main_window = driver.current_window_handle
+                time.sleep(random.uniform(2.0, 3.0))
+
+            myswar_limiter.acquire()
+            try:
+                driver.execute_script("window.open(arguments[0], '_blank');", album_url)
+                driver.switch_to.window(driver.window_handles[-1])
+                album_rating, valid_songs = scrape_inner_songs(driver, cache_key=album_url)
+                driver.close()
+                driver.switch_to.window(main_window)
+                myswar_limiter.report()
+            except Exception as e:
+                myswar_limiter.report(e)
+                print(f"{Colors.RED}      [SKIP - ERROR] {album_title}: {e}{Colors.RESET}")
+                try:
+                    while len(driver.window_handles) > 1:
+                        driver.switch_to.window(driver.window_handles[-1])
+                        driver.close()
+                    driver.switch_to.window(main_window)
+                except: driver = restart_driver(driver)
+                unfinished += 1
+                continue
+
+        if not valid_songs:
+            print(f"{Colors.RED}      [SKIP] {album_title} (0 YouTube Links){Colors.RESET}")
+            # Nothing to write, but it is done: resume must not reopen it
+            if crawl_state: crawl_state.add_album(album_uuid_for(album_title, year))
+            continue
+
+        print(f"{Colors.GREEN}      [SAVE] {album_title} | Rating: {album_rating} | Songs: {len(valid_songs)}{Colors.RESET}")
+
+        album_row, song_rows = build_album_rows(album, year, album_rating, valid_songs)
+        on_album(album_row, song_rows)
+
+    if unfinished:
+        print(f"{Colors.YELLOW}  [WARN] Page {page_count} unfinished ({unfinished} album(s) failed). "
+              f"Retrying it on the next run; skipping rest of year.{Colors.RESET}")
+        return driver, PAGE_FAILED, last_page_first_album
+
+    if len(album_tables) < 24:
+        print(f"{Colors.BLUE}  [INFO] Last page reached for {year}.{Colors.RESET}")
+        return driver, PAGE_DONE, last_page_first_album
+
+    return driver, PAGE_MORE, last_page_first_album
+
 def scrape_main():
+    global driver_pool, crawl_state, page_cache
     os.system('color')
     
     albums_exist = os.path.exists(ALBUMS_CSV)
@@ -182,11 +371,17 @@ def scrape_main():
     
     driver = None
     try:
-        driver = setup_driver()
+        if DRIVER_SPARES:
+            driver_pool = DriverPool(setup_driver, spares=DRIVER_SPARES)
+            driver = driver_pool.acquire()
+        else:
+            driver = setup_driver()
     except Exception as e:
         print(f"{Colors.RED}[CRITICAL] Driver failed: {e}{Colors.RESET}")
         return
 
+    if USE_PAGE_CACHE: page_cache = PageCache()
+
     with open(ALBUMS_CSV, "a", newline="", encoding="utf-8") as f_albums, \
          open(SONGS_CSV, "a", newline="", encoding="utf-8") as f_songs:
         
@@ -196,152 +391,97 @@ def scrape_main():
         if not albums_exist: writer_albums.writeheader()
         if not songs_exist: writer_songs.writeheader()
 
-        processed_count = 0 
+        crawl_state = CrawlState(STATE_DB)
+        seeded = crawl_state.seed_albums_from_csv(ALBUMS_CSV) if albums_exist else 0
+        if seeded: print(f"{Colors.CYAN}  [RESUME] Imported {seeded} saved albums from {ALBUMS_CSV}{Colors.RESET}")
+
+        page_albums = 0
+
+        def write_album(album_row, song_rows):
+            nonlocal page_albums
+            writer_albums.writerow(album_row)
+            writer_songs.writerows(song_rows)
+            f_albums.flush()
+            f_songs.flush()
+            crawl_state.add_album(album_row["album_uuid"])
+            page_albums += 1
 
         for year in range(START_YEAR, END_YEAR + 1):
-            print(f"{Colors.HEADER}--- Processing Year: {year} ---{Colors.RESET}")
-            
             # --- RESUME LOGIC ---
-            # If we are on the START_YEAR, use the custom START_PAGE.
-            # Otherwise (for 1990, 1991...), start at 1.
-            if year == START_YEAR:
-                page_count = START_PAGE
-            else:
-                page_count = 1
-                
-            last_page_first_album = "" 
+            # Finished (year, page) units come from the checkpoint; START_PAGE
+            # only matters for a year the checkpoint knows nothing about.
+            resume = crawl_state.resume_point(year, PAGE_MORE, START_PAGE if year == START_YEAR else 1)
+            if resume is None:
+                print(f"{Colors.BLUE}  [RESUME] Year {year} already complete.{Colors.RESET}")
+                continue
+            page_count, last_page_first_album = resume
+            print(f"{Colors.HEADER}--- Processing Year: {year} (from page {page_count}) ---{Colors.RESET}")
             
             while True:
-                if page_count == 1:
-                    target_url = f"https://myswar.co/album/year/{year}"
-                else:
-                    target_url = f"https://myswar.co/album/year/{year}/{page_count}?album_type=&album_filter_years=&album_filter_labels=&album_filter_md=&album_filter_lyricist=&album_filter_album_artist=&ut=3"
-                
-                print(f"  --> Scraping Page {Colors.RED}{page_count}{Colors.RESET} ..............................................")
+                page_albums = 0
+                driver, status, last_page_first_album = scrape_listing_page(
+                    driver, year, page_count, write_album, last_page_first_album)
+                if status == PAGE_FAILED: break
+                crawl_state.mark_unit(year, page_count, status, last_page_first_album, page_albums)
+                if status != PAGE_MORE: break
+                page_count += 1
 
-                # --- PAGE LOAD (Safe Retry) ---
-                load_success = False
-                for _ in range(3):
-                    try:
-                        driver.get(target_url)
-                        load_success = True
-                        break
-                    except Exception:
-                        print(f"{Colors.YELLOW}      [WARN] Timeout. Reloading...{Colors.RESET}")
-                        driver = restart_driver(driver)
-                
-                if not load_success:
-                    print(f"{Colors.RED}      [ERROR] Could not load Page {page_count}. Skipping year.{Colors.RESET}")
-                    break
+        crawl_state.close()
+    
+    if driver: driver.quit()
+    if driver_pool:
+        driver_pool.close()
+        stats = driver_pool.report()
+        print(f"{Colors.CYAN}  [POOL] {stats['restarts']} restarts for {stats['albums']} albums, "
+              f"{stats['restarts_avoided']} avoided vs every-15 rule, ~{stats['seconds_saved']}s of restart time saved{Colors.RESET}")
+    if page_cache:
+        print_cache_stats()
+        page_cache.close()
+    stats = myswar_limiter.stats()
+    print(f"{Colors.CYAN}  [RATE] {stats['host']}: settled at {stats['rate']} req/s after {stats['requests']} requests, "
+          f"{stats['throttles']} throttles{Colors.RESET}")
+    print(f"{Colors.GREEN}--- SCRAPING COMPLETE ---{Colors.RESET}")
 
-                time.sleep(random.uniform(4.5, 6.5)) 
-                
-                soup = BeautifulSoup(driver.page_source, 'html.parser')
-                album_tables = soup.find_all('table', class_='song_detail_display_table')
-                
-                if len(album_tables) == 0:
-                    print(f"{Colors.BLUE}  [INFO] No albums found. Finished Year {year}.{Colors.RESET}")
-                    break
+def print_cache_stats():
+    stats = page_cache.stats()
+    print(f"{Colors.CYAN}  [CACHE] {stats['hits']} hits / {stats['misses']} misses ({stats['hit_rate']:.0%}), "
+          f"{stats['urls']} pages in {stats['mb_on_disk']} MB, {stats['evicted']} evicted{Colors.RESET}")
 
-                try:
-                    first_tag = album_tables[0].find('a', class_='songs_like_this2')
-                    if first_tag:
-                        current_first_album = first_tag.text.strip()
-                        if current_first_album == last_page_first_album:
-                            print(f"{Colors.BLUE}  [INFO] Duplicate Page Detected (Redirect Loop). Finished Year {year}.{Colors.RESET}")
-                            break
-                        last_page_first_album = current_first_album
-                except: pass
+def replay_main():
+    """Re-runs the whole extraction from page_cache/: no network, no browser, no sleeps."""
+    global page_cache, REPLAY
+    os.system('color')
+    REPLAY = True
+    page_cache = PageCache()
+    started = time.time()
+    album_count = 0
 
-                main_window = driver.current_window_handle
-                
-                for table in album_tables:
-                    processed_count += 1
-                    
-                    # --- MAINTENANCE RELOAD (Safe Retry) ---
-                    if processed_count % 15 == 0:
-                        driver = restart_driver(driver)
-                        reload_ok = False
-                        for _ in range(3):
-                            try:
-                                driver.get(target_url)
-                                reload_ok = True
-                                break
-                            except:
-                                driver = restart_driver(driver)
-                        
-                        if not reload_ok: break
-                        main_window = driver.current_window_handle
-                        time.sleep(random.uniform(2.0, 3.0))
-
-                    title_tag = table.find('a', class_='songs_like_this2')
-                    if not title_tag: continue
-                    
-                    album_title = title_tag.text.strip()
-                    album_url = title_tag['href']
-                    
-                    try:
-                        driver.execute_script("window.open(arguments[0], '_blank');", album_url)
-                        driver.switch_to.window(driver.window_handles[-1])
-                        album_rating, valid_songs = scrape_inner_songs(driver)
-                        driver.close()
-                        driver.switch_to.window(main_window)
-                    except Exception as e:
-                        print(f"{Colors.RED}      [SKIP - ERROR] {album_title}: {e}{Colors.RESET}")
-                        try:
-                            while len(driver.window_handles) > 1:
-                                driver.switch_to.window(driver.window_handles[-1])
-                                driver.close()
-                            driver.switch_to.window(main_window)
-                        except: driver = restart_driver(driver)
-                        continue
-
-                    if not valid_songs:
-                        print(f"{Colors.RED}      [SKIP] {album_title} (0 YouTube Links){Colors.RESET}")
-                        continue
-
-                    print(f"{Colors.GREEN}      [SAVE] {album_title} | Rating: {album_rating} | Songs: {len(valid_songs)}{Colors.RESET}")
-
-                    unique_album_string = f"{album_title}_{year}".lower().strip()
-                    current_album_uuid = str(uuid.uuid5(uuid.NAMESPACE_DNS, unique_album_string))
-
-                    writer_albums.writerow({
-                        "album_uuid": current_album_uuid,
-                        "album_title": album_title,
-                        "album_year": year,
-                        "album_category": get_text_from_label(table, "Album Category"),
-                        "album_music_director": get_text_from_label(table, "Music Director"),
-                        "album_lyricist": get_text_from_label(table, "Lyricist"),
-                        "album_label": get_text_from_label(table, "Label"),
-                        "album_rating": album_rating
-                    })
-
-                    for song in valid_songs:
-                        unique_song_string = f"{current_album_uuid}_{song['track']}_{song['title']}".lower().strip()
-                        song_uuid = str(uuid.uuid5(uuid.NAMESPACE_DNS, unique_song_string))
-
-                        writer_songs.writerow({
-                            "song_uuid": song_uuid,
-                            "album_uuid": current_album_uuid,
-                            "track_number": song['track'],
-                            "song_title": song['title'],
-                            "song_singers": song['singers'],
-                            "song_rating": song['rating'],
-                            "youtube_url": song['url']
-                        })
-                    
-                    f_albums.flush()
-                    f_songs.flush()
-                    time.sleep(random.uniform(0.5, 1.5)) 
-
-                if len(album_tables) < 24:
-                    print(f"{Colors.BLUE}  [INFO] Last page reached for {year}.{Colors.RESET}")
-                    break
-                
+    with open(REPLAY_ALBUMS_CSV, "w", newline="", encoding="utf-8") as f_albums, \
+         open(REPLAY_SONGS_CSV, "w", newline="", encoding="utf-8") as f_songs:
+        writer_albums = csv.DictWriter(f_albums, fieldnames=ALBUM_HEADERS)
+        writer_songs = csv.DictWriter(f_songs, fieldnames=SONG_HEADERS)
+        writer_albums.writeheader()
+        writer_songs.writeheader()
+
+        def write_album(album_row, song_rows):
+            nonlocal album_count
+            writer_albums.writerow(album_row)
+            writer_songs.writerows(song_rows)
+            album_count += 1
+
+        for year in range(START_YEAR, END_YEAR + 1):
+            print(f"{Colors.HEADER}--- Replaying Year: {year} ---{Colors.RESET}")
+            page_count, last_page_first_album = 1, ""
+            while True:
+                _, status, last_page_first_album = scrape_listing_page(
+                    None, year, page_count, write_album, last_page_first_album)
+                if status != PAGE_MORE: break
                 page_count += 1
-    
-    if driver: driver.quit()
-    print(f"{Colors.GREEN}--- SCRAPING COMPLETE ---{Colors.RESET}")
+
+    print_cache_stats()
+    page_cache.close()
+    print(f"{Colors.GREEN}--- REPLAY COMPLETE: {album_count} albums in {time.time() - started:.1f}s -> {REPLAY_ALBUMS_CSV} ---{Colors.RESET}")
 
 if __name__ == "__main__":
-    scrape_main()
\ No newline at end of file
+    if REPLAY: replay_main()
+    else: scrape_main()
\ No newline at end of file
@@ -0,0 +1,177 @@
+import csv
+import os
+import queue
+import multiprocessing
+from multiprocessing.util import Finalize
+
+import myswar_scrapper as scraper
+from myswar_scrapper import Colors, ALBUM_HEADERS, SONG_HEADERS, PAGE_MORE
+from driver_pool import DriverPool
+from crawl_state import CrawlState
+from page_cache import PageCache
+import rate_limiter
+
+# --- CONFIGURATION ---
+START_YEAR = scraper.START_YEAR
+END_YEAR = scraper.END_YEAR
+# The crawl waits on the network and on one myswar.co rate budget that all
+# workers share, so extra workers only add browsers, not speed.
+SHARD_WORKERS = 3    # One browser per worker process
+SHARD_SPARES = 0     # Warm spare browsers per worker (0 = cold restarts)
+
+# Merged output; separate from the serial scraper's files, which it appends to
+ALBUMS_CSV = f"myswar_albums_{START_YEAR}_{END_YEAR}_sharded.csv"
+SONGS_CSV = f"myswar_songs_{START_YEAR}_{END_YEAR}_sharded.csv"
+SHARD_DIR = f"shards_{START_YEAR}_{END_YEAR}"   # One part file per (year, page) unit
+STATE_DB = os.path.join(SHARD_DIR, "crawl_state.sqlite")
+
+# --- WORKER SIDE ---
+# Every worker process owns one active driver (plus its warm spares).
+_driver = None
+
+def _quit_driver():
+    if _driver:
+        try: _driver.quit()
+        except: pass
+    if scraper.driver_pool:
+        scraper.driver_pool.close()
+        stats = scraper.driver_pool.report()
+        print(f"  [POOL pid {os.getpid()}] {stats['restarts']} restarts, ~{stats['seconds_saved']}s saved")
+    if scraper.page_cache:
+        scraper.page_cache.close()
+
+def init_worker(limiter):
+    global _driver
+    # One myswar.co budget for the whole crawl, not one per process
+    scraper.myswar_limiter = rate_limiter.install("myswar.co", limiter)
+    if scraper.USE_PAGE_CACHE:
+        scraper.page_cache = PageCache()
+    if SHARD_SPARES:
+        scraper.driver_pool = DriverPool(scraper.setup_driver, spares=SHARD_SPARES)
+        _driver = scraper.driver_pool.acquire()
+    else:
+        _driver = scraper.setup_driver()
+    Finalize(None, _quit_driver, exitpriority=10)
+
+def part_paths(year, page):
+    base = os.path.join(SHARD_DIR, f"{year}_{page:04d}")
+    return f"{base}_albums.csv", f"{base}_songs.csv"
+
+def _write_part(path, headers, rows):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=headers)
+        writer.writeheader()
+        writer.writerows(rows)
+    os.replace(tmp_path, path)
+
+def scrape_unit(year, page, last_page_first_album):
+    """Scrapes one (year, page) listing unit into its own pair of part files."""
+    global _driver
+    album_rows, song_rows = [], []
+
+    def collect(album_row, rows):
+        album_rows.append(album_row)
+        song_rows.extend(rows)
+
+    _driver, status, first_album = scraper.scrape_listing_page(
+        _driver, year, page, collect, last_page_first_album)
+
+    albums_path, songs_path = part_paths(year, page)
+    _write_part(albums_path, ALBUM_HEADERS, album_rows)
+    _write_part(songs_path, SONG_HEADERS, song_rows)
+    return year, page, status, first_album, len(album_rows)
+
+# --- MERGE ---
+def merge_parts():
+    """Concatenates all part files into ALBUMS_CSV / SONGS_CSV in (year, page) order."""
+    units = sorted(
+        (int(name[:4]), int(name[5:9]))
+        for name in os.listdir(SHARD_DIR) if name.endswith("_albums.csv")
+    )
+
+    album_count = song_count = 0
+    with open(ALBUMS_CSV, "w", newline="", encoding="utf-8") as f_albums, \
+         open(SONGS_CSV, "w", newline="", encoding="utf-8") as f_songs:
+        writer_albums = csv.DictWriter(f_albums, fieldnames=ALBUM_HEADERS)
+        writer_songs = csv.DictWriter(f_songs, fieldnames=SONG_HEADERS)
+        writer_albums.writeheader()
+        writer_songs.writeheader()
+
+        for year, page in units:
+            albums_path, songs_path = part_paths(year, page)
+            with open(albums_path, newline="", encoding="utf-8") as f:
+                for row in csv.DictReader(f):
+                    writer_albums.writerow(row)
+                    album_count += 1
+            with open(songs_path, newline="", encoding="utf-8") as f:
+                for row in csv.DictReader(f):
+                    writer_songs.writerow(row)
+                    song_count += 1
+
+    return len(units), album_count, song_count
+
+# --- SCHEDULER ---
+def scrape_sharded():
+    """
+    Runs every year of [START_YEAR, END_YEAR] on a pool of SHARD_WORKERS
+    browsers. Page 1 of every year is queued up front; page N+1 of a year is
+    queued as soon as page N comes back full, so all workers stay busy.
+    Finished units are checkpointed, so a rerun only queues what is left.
+    """
+    os.system('color')
+    os.makedirs(SHARD_DIR, exist_ok=True)
+
+    years = list(range(START_YEAR, END_YEAR + 1))
+    workers = max(1, min(SHARD_WORKERS, len(years)))
+    print(f"{Colors.HEADER}--- Sharded crawl: {len(years)} years on {workers} workers ---{Colors.RESET}")
+
+    state = CrawlState(STATE_DB)
+    results = queue.Queue()
+    pending = 0
+    limiter = rate_limiter.shared_limiter("myswar.co")
+
+    with multiprocessing.Pool(workers, initializer=init_worker, initargs=(limiter,)) as pool:
+        def submit(year, page, last_page_first_album=""):
+            pool.apply_async(scrape_unit, (year, page, last_page_first_album),
+                             callback=results.put,
+                             error_callback=lambda e, y=year, p=page: results.put((y, p, e)))
+
+        for year in years:
+            resume = state.resume_point(year, PAGE_MORE)
+            if resume is None: continue
+            submit(year, *resume)
+            pending += 1
+        print(f"{Colors.CYAN}  [RESUME] {len(years) - pending} years already complete{Colors.RESET}")
+
+        while pending:
+            result = results.get()
+            pending -= 1
+
+            if len(result) == 3:
+                year, page, error = result
+                print(f"{Colors.RED}  [ERROR] {year} page {page}: {error}. Skipping rest of year.{Colors.RESET}")
+                continue
+
+            year, page, status, first_album, n_albums = result
+            print(f"{Colors.GREEN}  [UNIT] {year} page {page}: {n_albums} albums ({status}){Colors.RESET}")
+            if status != scraper.PAGE_FAILED:
+                state.mark_unit(year, page, status, first_album, n_albums)
+            if status == PAGE_MORE:
+                submit(year, page + 1, first_album)
+                pending += 1
+
+        pool.close()
+        pool.join()
+
+    state.close()
+    stats = limiter.stats()
+    print(f"{Colors.CYAN}  [RATE] {stats['host']}: {stats['requests']} requests shared by {workers} workers, "
+          f"final {stats['rate']} req/s, {stats['throttles']} throttles{Colors.RESET}")
+
+    units, album_count, song_count = merge_parts()
+    print(f"{Colors.GREEN}--- MERGED {units} units: {album_count} albums, {song_count} songs ---{Colors.RESET}")
+    print(f"{Colors.GREEN}--- Saved to {ALBUMS_CSV} / {SONGS_CSV} ---{Colors.RESET}")
+
+if __name__ == "__main__":
+    scrape_sharded()
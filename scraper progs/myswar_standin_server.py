@@ -0,0 +1,34 @@
+import os
+import sys
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+
+# --- CONFIGURATION ---
+# Serves saved myswar pages so the scraper can run without the live site.
+# A page saved from https://myswar.co/album/year/1931 goes to
+#   saved_pages/album/year/1931/index.html
+# Query strings are ignored, so paged listing URLs map onto their path.
+PAGES_DIR = 'saved_pages'
+PORT = 8765
+
+class SavedPageHandler(SimpleHTTPRequestHandler):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, directory=PAGES_DIR, **kwargs)
+
+    def log_message(self, format, *args):
+        pass
+
+def serve(port=PORT):
+    if not os.path.isdir(PAGES_DIR):
+        print(f"❌ Folder not found: {PAGES_DIR}")
+        return
+    server = ThreadingHTTPServer(("127.0.0.1", port), SavedPageHandler)
+    print(f"Serving {PAGES_DIR} on http://127.0.0.1:{port} (set BASE_URL to this)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    serve(int(sys.argv[1]) if len(sys.argv) > 1 else PORT)
@@ -0,0 +1,262 @@
+import os
+import re
+import sys
+import glob
+import time
+import zlib
+import unicodedata
+
+import numpy as np
+import pandas as pd
+from rapidfuzz import fuzz
+from rapidfuzz.process import cpdist
+from rapidfuzz.utils import default_process
+
+# --- CONFIGURATION ---
+ALBUMS_GLOB = '../data/raw/albums data/*.csv'
+SONGS_GLOB = '../data/raw/songs data/*.csv'
+OUTPUT_FILE = '../data/near_duplicates.csv'
+
+SHINGLE_SIZE = 3          # Character n-grams of the normalised title
+NUM_HASHES = 60           # MinHash signature length...
+BANDS = 12                # ...split into BANDS bands of NUM_HASHES // BANDS rows:
+                          # pairs with Jaccard >= ~(1/BANDS)**(BANDS/NUM_HASHES) = 0.6 become candidates
+MAX_BUCKET = 200          # Bigger LSH buckets ('Title Music', 'Alaap') are skipped, not paired out
+SEED = 1
+
+# Detailed score of a candidate pair, 0-1
+WEIGHTS = {'title': 0.5, 'singers': 0.3, 'album': 0.2}
+MIN_TITLE = 0.85          # Below this title similarity a pair is never a duplicate (stops chaining)
+MIN_ALBUM = 0.7           # Songs on different albums also need album titles at least this close
+MIN_SINGERS = 0.5         # Same title by other singers is another recording...
+UNKNOWN_SINGERS = 0.5     # ...unless either song lists none, which counts as this
+YEAR_PENALTY = 0.05       # Per year between the two albums...
+MAX_YEAR_GAP = 2          # ...and no match at all beyond this
+VERSION_PENALTY = 0.15    # '- 1' vs '- 2', '(Sad)' vs '': same song name, another version
+MIN_CONFIDENCE = 0.8
+
+# Romanised Hindi is spelt many ways (Pyaar/Pyar, Yeh/Ye, Mohabbat/Muhabbat, Zindagi/Jindagi):
+# applied in order to the lower-cased ASCII title before shingling
+TRANSLITERATION = [
+    (r"(.)\1+", r"\1"),         # aa -> a, bb -> b
+    (r"ee", "i"), (r"oo", "u"),
+    (r"ph", "f"), (r"w", "v"), (r"q", "k"), (r"z", "j"),
+    (r"(?<=[aeiou])h\b", ""),   # yeh -> ye, vah -> va
+    (r"(?<=[bcdgjkpt])h", ""),  # chh/bh/dh/kh... -> c/b/d/k
+    (r"o", "u"),
+]
+# Trailing '- 2', 'Part II', '(Sad)', '(Club Lounge Mix)': kept apart as the version
+VERSION_SUFFIX = re.compile(r"\s*(?:(?:-|part)\s*(\d+|i{1,3}|iv|v)|\(([^()]*)\))\s*$", re.IGNORECASE)
+
+# --- NORMALISATION ---
+def ascii_lower(text):
+    return unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode('ascii').lower()
+
+def split_version(title):
+    """'Chhod Na Apni Aas Ae Dil - 1' -> ('Chhod Na Apni Aas Ae Dil', '1')."""
+    match = VERSION_SUFFIX.search(title)
+    if not match: return title, ''
+    return title[:match.start()], ' '.join((match.group(1) or match.group(2)).lower().split())
+
+_rules = [(re.compile(pattern), repl) for pattern, repl in TRANSLITERATION]
+
+def normalise_names(names):
+    """
+    Lower-cased ASCII letters/digits with the transliteration rules applied.
+    Each distinct name is done once and the rules run once over all of them
+    joined by newlines (no rule crosses a line), not once per name.
+    """
+    distinct = list(dict.fromkeys(names))
+    text = '\n'.join(re.sub(r"[^a-z0-9]+", " ", ascii_lower(name)).strip() for name in distinct)
+    for pattern, repl in _rules:
+        text = pattern.sub(repl, text)
+    lookup = dict(zip(distinct, text.split('\n')))
+    return [lookup[name] for name in names]
+
+def normalise_title(title):
+    return normalise_names([split_version(title)[0]])[0]
+
+def shingles(title, singers):
+    """Title n-grams (spaces kept, so word boundaries count) plus one shingle per singer."""
+    padded = f" {title} "
+    grams = {padded[i:i + SHINGLE_SIZE] for i in range(max(len(padded) - SHINGLE_SIZE + 1, 1))}
+    return grams | {f"singer:{s}" for s in singers}
+
+# --- MINHASH / LSH ---
+def minhash_signatures(shingle_sets, num_hashes=NUM_HASHES, seed=SEED):
+    """
+    (n, num_hashes) uint32 signatures. Every distinct shingle is hashed once
+    (crc32, stable across runs); each of the num_hashes hash functions is a
+    multiply-shift over those, and the per-song minimum is one reduceat over
+    all songs' shingles laid end to end.
+    """
+    ids = {}
+    flat = [ids.setdefault(s, len(ids)) for shingle_set in shingle_sets for s in shingle_set]
+    lengths = np.fromiter((len(s) for s in shingle_sets), np.int64, len(shingle_sets))
+    base = np.fromiter((zlib.crc32(s.encode('utf-8')) for s in ids), np.uint64, len(ids))
+    base = (base << np.uint64(32)) | base
+    codes = base[np.array(flat, dtype=np.int64)]
+
+    rng = np.random.default_rng(seed)
+    multipliers = rng.integers(1, 2 ** 63, num_hashes, dtype=np.uint64) | np.uint64(1)
+    offsets = rng.integers(0, 2 ** 63, num_hashes, dtype=np.uint64)
+    starts = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+    signatures = np.empty((len(shingle_sets), num_hashes), dtype=np.uint32)
+    for i in range(num_hashes):
+        hashed = ((codes * multipliers[i] + offsets[i]) >> np.uint64(32)).astype(np.uint32)
+        signatures[:, i] = np.minimum.reduceat(hashed, starts)
+    return signatures
+
+def lsh_candidates(signatures, bands=BANDS, max_bucket=MAX_BUCKET):
+    """
+    Row pairs (i < j) sharing all rows of at least one band. Per band, rows
+    are sorted by their band key and every bucket of 2..max_bucket rows
+    contributes all of its pairs.
+    """
+    rows_per_band = signatures.shape[1] // bands
+    pairs, skipped = [], 0
+    for b in range(bands):
+        # The band's rows folded into one uint64 key; a collision only adds a candidate
+        keys = np.zeros(len(signatures), dtype=np.uint64)
+        for value in signatures[:, b * rows_per_band:(b + 1) * rows_per_band].T:
+            keys = (keys ^ value.astype(np.uint64)) * np.uint64(0x100000001B3)
+        order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[order]
+        edges = np.flatnonzero(sorted_keys[1:] != sorted_keys[:-1]) + 1
+        starts = np.concatenate([[0], edges])
+        sizes = np.diff(np.concatenate([starts, [len(keys)]]))
+        skipped += int((sizes > max_bucket).sum())
+        for size in np.unique(sizes[(sizes >= 2) & (sizes <= max_bucket)]):
+            # All buckets of one size at once: (buckets, size) member matrix
+            members = order[starts[sizes == size][:, None] + np.arange(size)]
+            i, j = np.triu_indices(size, 1)
+            pairs.append(np.stack([members[:, i].ravel(), members[:, j].ravel()], axis=1))
+    if not pairs:
+        return np.empty((0, 2), dtype=np.int64), skipped
+    pairs = np.sort(np.concatenate(pairs), axis=1)
+    return np.unique(pairs, axis=0), skipped
+
+# --- SCORING ---
+def score_pairs(songs, pairs):
+    """
+    Detailed 0-1 confidence for each candidate pair: weighted similarity of
+    the normalised title, the singers (shared names over the shorter list,
+    so a duet still matches its solo listing) and the album title,
+    minus penalties for a year gap and a different version. Pairs whose
+    titles, singers or (on different albums) album titles differ too much,
+    or that are more than MAX_YEAR_GAP years apart, score 0.
+    """
+    a, b = pairs[:, 0], pairs[:, 1]
+    def ratio(column, scorer):
+        values = songs[column].to_numpy(dtype=object)
+        return cpdist(values[a], values[b], scorer=scorer, processor=default_process,
+                      dtype=np.float64, workers=-1) / 100
+
+    title = ratio('title_key', fuzz.ratio)
+    album = ratio('album_title', fuzz.ratio)
+    album_uuids = songs['album_uuid'].to_numpy(dtype=object)
+    album[album_uuids[a] == album_uuids[b]] = 1
+    names = songs['singers'].to_numpy(dtype=object)
+    singers = np.fromiter((len(names[i] & names[j]) / min(len(names[i]), len(names[j]))
+                           if names[i] and names[j] else UNKNOWN_SINGERS
+                           for i, j in zip(a.tolist(), b.tolist())), np.float64, len(a))
+    score = WEIGHTS['title'] * title + WEIGHTS['singers'] * singers + WEIGHTS['album'] * album
+    years = songs['album_year'].to_numpy(dtype=np.float64)
+    gap = np.abs(years[a] - years[b])
+    gap = np.where(np.isnan(gap), 0, gap)
+    score -= YEAR_PENALTY * gap
+    versions = songs['version'].to_numpy(dtype=object)
+    score -= VERSION_PENALTY * (versions[a] != versions[b])
+    score[(gap > MAX_YEAR_GAP) | (title < MIN_TITLE) | (singers < MIN_SINGERS) | (album < MIN_ALBUM)] = 0
+    return np.clip(score, 0, 1)
+
+def clusters_of(count, pairs):
+    """Connected components of the accepted pairs (union-find with path halving)."""
+    parent = np.arange(count)
+    def root(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+    for i, j in pairs.tolist():
+        ri, rj = root(i), root(j)
+        if ri != rj: parent[max(ri, rj)] = min(ri, rj)
+    return np.array([root(x) for x in range(count)])
+
+# --- PIPELINE ---
+def load_songs(songs_glob=SONGS_GLOB, albums_glob=ALBUMS_GLOB):
+    read = lambda pattern, columns: pd.concat(
+        [pd.read_csv(p, usecols=columns, dtype=str, keep_default_na=False) for p in sorted(glob.glob(pattern))],
+        ignore_index=True)
+    songs = read(songs_glob, ['song_uuid', 'album_uuid', 'song_title', 'song_singers'])
+    albums = read(albums_glob, ['album_uuid', 'album_title', 'album_year']).drop_duplicates('album_uuid')
+    songs = songs.merge(albums, on='album_uuid', how='left').fillna('')
+    songs['album_year'] = pd.to_numeric(songs['album_year'], errors='coerce')
+    return songs
+
+def find_near_duplicates(songs):
+    """
+    Adds title_key/singers/version to songs and returns the accepted
+    pairs as a DataFrame (row_a, row_b, confidence), plus stage stats.
+    """
+    split = [split_version(t) for t in songs['song_title']]
+    titles = normalise_names([name for name, _ in split])
+    singer_lists = [[s for s in singers.split(',') if s.strip()] for singers in songs['song_singers']]
+    names = iter(normalise_names([s for singers in singer_lists for s in singers]))
+    singers = [frozenset(next(names) for _ in singers) for singers in singer_lists]
+    songs['title_key'] = titles
+    songs['singers'] = singers
+    songs['version'] = [version for _, version in split]
+
+    # Songs with no usable title can't be matched on it
+    usable = np.flatnonzero([bool(t) for t in titles])
+    signatures = minhash_signatures([shingles(titles[i], singers[i]) for i in usable])
+    candidates, skipped = lsh_candidates(signatures)
+    candidates = usable[candidates]
+    confidence = score_pairs(songs, candidates)
+    accepted = confidence >= MIN_CONFIDENCE
+    pairs = pd.DataFrame({'row_a': candidates[accepted, 0], 'row_b': candidates[accepted, 1],
+                          'confidence': confidence[accepted].round(3)})
+    return pairs, {'candidates': len(candidates), 'skipped_buckets': skipped}
+
+def cluster_table(songs, pairs):
+    """One row per clustered song: cluster id, cluster confidence (weakest link) and the song."""
+    if pairs.empty:
+        return pd.DataFrame(columns=['cluster', 'confidence', 'song_uuid', 'song_title', 'song_singers',
+                                     'album_title', 'album_year', 'album_uuid'])
+    links = pairs[['row_a', 'row_b']].to_numpy()
+    roots = clusters_of(len(songs), links)
+    members = np.unique(links)
+    table = songs.loc[members, ['song_uuid', 'song_title', 'song_singers', 'album_title', 'album_year', 'album_uuid']]
+    table.insert(0, 'root', roots[members])
+    weakest = pairs.assign(root=roots[pairs['row_a']]).groupby('root')['confidence'].min()
+    table.insert(1, 'confidence', table['root'].map(weakest))
+    # Largest, most confident clusters first, numbered from 1
+    size = table.groupby('root')['root'].transform('size')
+    table = table.assign(size=size).sort_values(['size', 'confidence', 'root', 'album_year'],
+                                                ascending=[False, False, True, True])
+    table.insert(0, 'cluster', pd.factorize(table['root'])[0] + 1)
+    return table.drop(columns=['root', 'size'])
+
+def run(output_file=OUTPUT_FILE):
+    started = time.time()
+    songs = load_songs()
+    loaded = time.time()
+    pairs, stats = find_near_duplicates(songs)
+    table = cluster_table(songs, pairs)
+    os.makedirs(os.path.dirname(output_file) or '.', exist_ok=True)
+    table.to_csv(output_file, index=False)
+
+    print(f"{len(songs)} songs loaded in {loaded - started:.1f}s")
+    print(f"LSH: {stats['candidates']} candidate pairs ({stats['skipped_buckets']} oversized buckets skipped), "
+          f"{len(pairs)} scored >= {MIN_CONFIDENCE}")
+    print(f"{table['cluster'].nunique() if len(table) else 0} clusters, {len(table)} songs -> {output_file} "
+          f"in {time.time() - started:.1f}s total")
+    return table
+
+if __name__ == "__main__":
+    table = run(sys.argv[1] if len(sys.argv) > 1 else OUTPUT_FILE)
+    for cluster, group in list(table.groupby('cluster', sort=True))[:5]:
+        print(f"\n#{cluster} (confidence {group['confidence'].iloc[0]})")
+        for row in group.itertuples():
+            print(f"  {row.song_title} | {row.song_singers} | {row.album_title} ({row.album_year:.0f})")
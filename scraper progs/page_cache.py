@@ -0,0 +1,139 @@
+import os
+import time
+import sqlite3
+import hashlib
+
+import zstandard as zstd
+
+# --- CONFIGURATION ---
+CACHE_DIR = 'page_cache'
+MAX_CACHE_MB = 2048        # Least-recently-used URLs are evicted past this
+ZSTD_LEVEL = 10            # Pages are very repetitive HTML, so this compresses ~15x
+
+class PageCache:
+    """
+    On-disk cache of fetched pages.
+    Blobs are content-addressed (sha256 of the HTML, zstd-compressed) so the
+    same HTML fetched under several URLs is stored once; a small SQLite
+    index maps each URL to its current blob.
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR, max_mb=MAX_CACHE_MB):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_mb * 1024 * 1024
+        os.makedirs(cache_dir, exist_ok=True)
+
+        # Sharded workers share one cache, hence the generous lock timeout
+        self.conn = sqlite3.connect(os.path.join(cache_dir, "index.sqlite"), timeout=60)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS urls (
+                url TEXT PRIMARY KEY,
+                digest TEXT NOT NULL,
+                last_used REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS urls_last_used ON urls (last_used);
+            CREATE INDEX IF NOT EXISTS urls_digest ON urls (digest);
+            CREATE TABLE IF NOT EXISTS blobs (
+                digest TEXT PRIMARY KEY,
+                size INTEGER NOT NULL
+            );
+        """)
+        self.conn.commit()
+
+        self._compressor = zstd.ZstdCompressor(level=ZSTD_LEVEL)
+        self._decompressor = zstd.ZstdDecompressor()
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+
+    def _blob_path(self, digest):
+        return os.path.join(self.cache_dir, digest[:2], f"{digest}.html.zst")
+
+    def get(self, url):
+        row = self.conn.execute("SELECT digest FROM urls WHERE url = ?", (url,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        try:
+            with open(self._blob_path(row[0]), "rb") as f:
+                html = self._decompressor.decompress(f.read()).decode("utf-8")
+        except (OSError, zstd.ZstdError):
+            self.conn.execute("DELETE FROM urls WHERE url = ?", (url,))
+            self.conn.commit()
+            self.misses += 1
+            return None
+        self.conn.execute("UPDATE urls SET last_used = ? WHERE url = ?", (time.time(), url))
+        self.conn.commit()
+        self.hits += 1
+        return html
+
+    def put(self, url, html):
+        data = html.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._blob_path(digest)
+
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            compressed = self._compressor.compress(data)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(compressed)
+            os.replace(tmp_path, path)
+            self.conn.execute("INSERT OR REPLACE INTO blobs VALUES (?, ?)", (digest, len(compressed)))
+
+        previous = self.conn.execute("SELECT digest FROM urls WHERE url = ?", (url,)).fetchone()
+        self.conn.execute("INSERT OR REPLACE INTO urls VALUES (?, ?, ?)", (url, digest, time.time()))
+        # The page changed: its old blob goes unless another URL still has it
+        if previous and previous[0] != digest: self._drop_blob(previous[0])
+        self.conn.commit()
+        self._evict()
+
+    def total_bytes(self):
+        return self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+
+    def _drop_blob(self, digest):
+        """Deletes a blob no URL points to any more. Returns the bytes freed."""
+        still_used = self.conn.execute(
+            "SELECT 1 FROM urls WHERE digest = ? LIMIT 1", (digest,)).fetchone()
+        if still_used: return 0
+
+        size = self.conn.execute("SELECT size FROM blobs WHERE digest = ?", (digest,)).fetchone()
+        self.conn.execute("DELETE FROM blobs WHERE digest = ?", (digest,))
+        try: os.remove(self._blob_path(digest))
+        except OSError: pass
+        return size[0] if size else 0
+
+    def _evict(self):
+        total = self.total_bytes()
+        if total <= self.max_bytes: return
+
+        # Orphans first (e.g. left by an older version that never dropped replaced pages)
+        for (digest,) in self.conn.execute(
+                "SELECT digest FROM blobs WHERE digest NOT IN (SELECT digest FROM urls)").fetchall():
+            total -= self._drop_blob(digest)
+
+        for url, digest in self.conn.execute(
+                "SELECT url, digest FROM urls ORDER BY last_used").fetchall():
+            if total <= self.max_bytes: break
+            self.conn.execute("DELETE FROM urls WHERE url = ?", (url,))
+            self.evicted += 1
+            total -= self._drop_blob(digest)
+        self.conn.commit()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        urls, blobs = self.conn.execute(
+            "SELECT (SELECT COUNT(*) FROM urls), (SELECT COUNT(*) FROM blobs)").fetchone()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "urls": urls,
+            "blobs": blobs,
+            "mb_on_disk": round(self.total_bytes() / (1024 * 1024), 1),
+            "evicted": self.evicted,
+        }
+
+    def close(self):
+        self.conn.close()
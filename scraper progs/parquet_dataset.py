@@ -0,0 +1,211 @@
+import os
+import re
+import sys
+import json
+import glob
+import uuid
+import hashlib
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+# --- CONFIGURATION ---
+# Compiles the raw decade CSVs into a typed Parquet dataset, one partition
+# per decade: PARQUET_ROOT/<table>/decade=<start>_<end>/part-0.parquet
+RAW_ROOT = '../data/raw'
+SCHEMAS_DIR = '../schemas'
+PARQUET_ROOT = '../data/parquet'
+STATE_FILE = os.path.join(PARQUET_ROOT, '.build_state.json')  # source fingerprints of the last build
+
+TABLES = {
+    # table -> (raw folder, schema file)
+    'albums': ('albums data', 'albums_schema.json'),
+    'songs': ('songs data', 'songs_schema.json'),
+}
+# Few distinct values repeated on thousands of rows -> stored once per file
+DICTIONARY_COLUMNS = {'album_category', 'album_music_director', 'album_lyricist', 'album_label', 'song_singers'}
+COMPRESSION = 'zstd'
+BUILD_VERSION = 2  # bump to rebuild every partition when the file layout changes
+
+PARTITIONING = ds.partitioning(pa.schema([('decade', pa.string())]), flavor='hive')
+
+# --- SCHEMA ---
+def load_schema(table):
+    with open(os.path.join(SCHEMAS_DIR, TABLES[table][1]), encoding='utf-8') as f:
+        return json.load(f)
+
+def arrow_type(column):
+    """schemas/*.json column -> Arrow type. *_uuid columns become 16-byte UUIDs."""
+    if column['name'].endswith('_uuid'):
+        return pa.uuid()
+    if column['type'] == 'integer':
+        return pa.int32()
+    if column['type'] == 'float':
+        return pa.float64()
+    if column['name'] in DICTIONARY_COLUMNS:
+        return pa.dictionary(pa.int32(), pa.string())
+    return pa.string()  # string, url
+
+def arrow_schema(table):
+    """
+    Only primary keys are non-nullable: some scraped rows have a blank
+    'required' field (e.g. no music director), which build() reports instead
+    of dropping the row.
+    """
+    spec = load_schema(table)
+    return pa.schema(
+        [pa.field(c['name'], arrow_type(c), nullable=not c.get('primary_key', False)) for c in spec['columns']],
+        metadata={'table': spec['table']})
+
+def required_columns(table):
+    return [c['name'] for c in load_schema(table)['columns'] if c.get('required')]
+
+# --- BUILD ---
+def decade_of(filename):
+    """'songs_1955_1964_completed.csv' -> '1955_1964'."""
+    match = re.search(r"(\d{4})_(\d{4})", filename)
+    return f"{match.group(1)}_{match.group(2)}" if match else None
+
+def partition_path(table, decade, root=PARQUET_ROOT):
+    return os.path.join(root, table, f"decade={decade}", "part-0.parquet")
+
+def to_arrow_column(series, field):
+    """One CSV column (read as text) -> typed Arrow array. Returns (array, bad_values)."""
+    text = series.where(series.str.strip() != '', None)
+    if field.type == pa.uuid():
+        storage = pa.array([uuid.UUID(v).bytes if v is not None else None for v in text], type=pa.binary(16))
+        return pa.ExtensionArray.from_storage(pa.uuid(), storage), 0
+    if pa.types.is_integer(field.type) or pa.types.is_floating(field.type):
+        numbers = pd.to_numeric(text, errors='coerce')
+        bad = int((numbers.isna() & text.notna()).sum())
+        if pa.types.is_integer(field.type):
+            numbers = numbers.round().astype('Int64')
+        return pa.array(numbers, type=field.type, from_pandas=True), bad
+    if pa.types.is_dictionary(field.type):
+        return pa.array(text, type=pa.string()).dictionary_encode(), 0
+    return pa.array(text, type=pa.string()), 0
+
+def csv_to_table(csv_path, schema, required=()):
+    """
+    Reads one raw CSV as text and casts every column to its schema type, so
+    '0' and '0.0' both become 0.0. Columns a file doesn't have (e.g.
+    music_yt_url_* before they were scraped) come out as typed nulls; the
+    columns the file did have are kept in the schema metadata (source_columns()).
+    """
+    df = pd.read_csv(csv_path, dtype=str, keep_default_na=False)
+    arrays, problems = [], {}
+    for field in schema:
+        if field.name in df.columns:
+            array, bad = to_arrow_column(df[field.name], field)
+            if bad: problems[f"unparseable {field.name}"] = bad
+        else:
+            array = pa.nulls(len(df), type=field.type)
+        arrays.append(array)
+        if field.name in required and array.null_count:
+            problems[f"missing {field.name}"] = array.null_count
+    present = [c for c in df.columns if c in schema.names]
+    metadata = {**(schema.metadata or {}), b'source_columns': json.dumps(present).encode('utf-8')}
+    return pa.Table.from_arrays(arrays, schema=schema.with_metadata(metadata)), problems
+
+def write_partition(table, decade, data, root=PARQUET_ROOT):
+    """Atomically (re)writes one decade partition."""
+    path = partition_path(table, decade, root)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + '.tmp'
+    pq.write_table(data, tmp_path, compression=COMPRESSION)
+    os.replace(tmp_path, path)
+    return path
+
+def fingerprint(csv_path, table):
+    stat = os.stat(csv_path)
+    with open(os.path.join(SCHEMAS_DIR, TABLES[table][1]), 'rb') as f:
+        schema_hash = hashlib.sha256(f.read()).hexdigest()[:16]
+    return [stat.st_size, stat.st_mtime_ns, schema_hash, sorted(DICTIONARY_COLUMNS), BUILD_VERSION]
+
+def build(force=False):
+    try:
+        with open(STATE_FILE, encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        state = {}
+
+    for table, (folder, _) in TABLES.items():
+        schema = arrow_schema(table)
+        required = required_columns(table)
+        files = sorted(f for f in glob.glob(os.path.join(RAW_ROOT, folder, '*.csv')) if decade_of(os.path.basename(f)))
+        print(f"--- {table}: {len(files)} decade files ---")
+        rows = 0
+        for csv_path in files:
+            filename = os.path.basename(csv_path)
+            decade = decade_of(filename)
+            key = f"{table}/{filename}"
+            if not force and state.get(key) == fingerprint(csv_path, table) and os.path.exists(partition_path(table, decade)):
+                print(f"[UNCHANGED] {filename}")
+                continue
+            try:
+                data, problems = csv_to_table(csv_path, schema, required)
+            except Exception as e:
+                print(f"[ERROR] {filename}: {e}")
+                continue
+            path = write_partition(table, decade, data)
+            state[key] = fingerprint(csv_path, table)
+            rows += data.num_rows
+            note = f" (nulls: {problems})" if problems else ""
+            print(f"[BUILT] {filename} -> {path}: {data.num_rows} rows, "
+                  f"{os.path.getsize(csv_path) / 1024:.0f} KB csv -> {os.path.getsize(path) / 1024:.0f} KB{note}")
+        print(f"{rows} {table} rows written.\n")
+
+    os.makedirs(PARQUET_ROOT, exist_ok=True)
+    with open(STATE_FILE, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=1)
+
+# --- READ ---
+def open_dataset(table, root=PARQUET_ROOT):
+    return ds.dataset(os.path.join(root, table), format='parquet', partitioning=PARTITIONING)
+
+def decades(table, root=PARQUET_ROOT):
+    """Partitions present on disk, oldest first."""
+    return sorted(path.split('decade=', 1)[1].split(os.sep)[0]
+                  for path in glob.glob(os.path.join(root, table, 'decade=*', '*.parquet')))
+
+def source_columns(table, decade, root=PARQUET_ROOT):
+    """Columns the decade's raw CSV had, in its order (all schema columns for older builds)."""
+    schema = pq.read_schema(partition_path(table, decade, root))
+    columns = (schema.metadata or {}).get(b'source_columns')
+    return json.loads(columns) if columns else [n for n in schema.names if n != 'decade']
+
+def row_count(table, decade, root=PARQUET_ROOT):
+    """Rows in one decade partition, from the Parquet footer (no data read)."""
+    return pq.read_metadata(partition_path(table, decade, root)).num_rows
+
+def read_partition(table, decade, root=PARQUET_ROOT):
+    """One whole decade partition as written, its own schema metadata included."""
+    return pq.read_table(partition_path(table, decade, root))
+
+def read_table(table, columns=None, filter=None, decades=None, root=PARQUET_ROOT):
+    """
+    Arrow table of just the requested columns and rows. Decade filters prune
+    whole partition files and the rest of `filter` is pushed into the Parquet
+    scan, so e.g. a rating filter never materializes the other rows.
+    """
+    if decades is not None:
+        decade_filter = pc.field('decade').isin(list(decades))
+        filter = decade_filter if filter is None else filter & decade_filter
+    return open_dataset(table, root).to_table(columns=columns, filter=filter)
+
+def to_pandas(data):
+    """Arrow -> pandas with UUIDs back as the canonical strings the CSVs use."""
+    df = data.to_pandas()
+    for name in data.column_names:
+        if data.schema.field(name).type == pa.uuid():
+            df[name] = df[name].map(lambda u: str(u) if u is not None else None)
+    return df
+
+def read_frame(table, columns=None, filter=None, decades=None, root=PARQUET_ROOT):
+    return to_pandas(read_table(table, columns, filter, decades, root))
+
+if __name__ == "__main__":
+    build(force='--force' in sys.argv)
@@ -0,0 +1,62 @@
+import os
+import sys
+import time
+
+from myswar_parser import parse_album_page, parse_listing_page
+
+# --- CONFIGURATION ---
+# Folder of saved myswar pages (listing and album pages, any mix).
+PAGES_DIR = 'saved_pages'
+ROUNDS = 5                 # Passes over the corpus per backend
+BACKENDS = ["bs4", "lxml"]
+
+def load_corpus(folder):
+    pages = []
+    for root, _, files in os.walk(folder):
+        for name in sorted(files):
+            if name.endswith(('.html', '.htm')):
+                with open(os.path.join(root, name), encoding='utf-8', errors='replace') as f:
+                    pages.append((os.path.join(root, name), f.read()))
+    return pages
+
+def parse_both(html, backend):
+    return parse_album_page(html, backend), parse_listing_page(html, backend)
+
+def check_identical(pages):
+    """Every backend must produce exactly the reference (bs4) output."""
+    mismatches = 0
+    for path, html in pages:
+        reference = parse_both(html, "bs4")
+        for backend in BACKENDS[1:]:
+            if parse_both(html, backend) != reference:
+                mismatches += 1
+                print(f"[MISMATCH] {backend}: {path}")
+    return mismatches
+
+def benchmark(pages, backend):
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        for _, html in pages:
+            parse_both(html, backend)
+    elapsed = time.perf_counter() - started
+    return (len(pages) * ROUNDS) / elapsed if elapsed else 0.0
+
+def run_benchmark(folder=PAGES_DIR):
+    pages = load_corpus(folder)
+    if not pages:
+        print(f"No saved pages found in '{folder}'.")
+        return
+
+    print(f"Corpus: {len(pages)} pages from {folder}\n")
+    mismatches = check_identical(pages)
+    print(f"Output check: {'IDENTICAL' if mismatches == 0 else f'{mismatches} MISMATCHES'}\n")
+
+    rates = {backend: benchmark(pages, backend) for backend in BACKENDS}
+    print(f"{'BACKEND':<8} | {'PAGES/SEC':>10} | {'SPEEDUP':>7}")
+    print("-" * 32)
+    for backend, rate in rates.items():
+        speedup = rate / rates["bs4"] if rates["bs4"] else 0.0
+        print(f"{backend:<8} | {rate:>10.1f} | {speedup:>6.1f}x")
+
+if __name__ == "__main__":
+    run_benchmark(sys.argv[1] if len(sys.argv) > 1 else PAGES_DIR)
@@ -0,0 +1,76 @@
+import re
+import time
+import statistics
+
+import pandas as pd
+
+from catalog import load_dataframes
+from indexed_query import QueryEngine, MULTI_VALUE_COLUMNS, MULTI_VALUE_SEPARATOR
+
+# --- CONFIGURATION ---
+ROUNDS = 200              # Runs per query per engine (median is reported)
+QUERIES = [
+    ("R.D. Burman, 1970-1980, rated >= 4.3",
+     dict(song_rating=(4.3, None), album_music_director='R.D. Burman', album_year=(1970, 1980))),
+    ("rated >= 4.3", dict(song_rating=(4.3, None))),
+    ("albums from 1975", dict(album_year=1975)),
+    ("Laxmikant - Pyarelal, rated 4.0-4.5", dict(album_music_director='Laxmikant - Pyarelal', song_rating=(4.0, 4.5))),
+    ("2015+, rated >= 4.5", dict(album_year=(2015, None), song_rating=(4.5, None))),
+]
+
+def pandas_scan(albums, songs, conditions):
+    """The same query as boolean masks over every row, the way the CSV tools filter."""
+    album_mask = pd.Series(True, index=albums.index)
+    song_mask = pd.Series(True, index=songs.index)
+    joined = False
+    for column, condition in conditions.items():
+        frame, mask = (songs, song_mask) if column in songs.columns else (albums, album_mask)
+        joined |= frame is albums
+        values = frame[column]
+        if isinstance(condition, tuple):
+            lo, hi = condition
+            if lo is not None: mask &= values >= lo
+            if hi is not None: mask &= values <= hi
+        elif column in MULTI_VALUE_COLUMNS:
+            pattern = f"(?:^|{re.escape(MULTI_VALUE_SEPARATOR)}){re.escape(condition)}(?:{re.escape(MULTI_VALUE_SEPARATOR)}|$)"
+            mask &= values.str.contains(pattern, regex=True, na=False)
+        else:
+            mask &= values == condition
+    if joined:
+        song_mask &= songs['album_uuid'].isin(albums.loc[album_mask, 'album_uuid'])
+    return songs.loc[song_mask, 'song_uuid']
+
+def median_seconds(fn, rounds=ROUNDS):
+    times = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - started)
+    return statistics.median(times)
+
+def run_benchmark():
+    started = time.perf_counter()
+    albums, songs = load_dataframes(python_strings=False)
+    csv_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    engine = QueryEngine()
+    build_s = time.perf_counter() - started
+    declared = "; ".join(f"{table}: {', '.join(indexes)}" for table, indexes in engine.indexes.items())
+    print(f"{len(albums)} albums, {len(songs)} songs. Indexes ({declared})")
+    print(f"CSV parse (paid by every pandas script run): {csv_s:.2f}s | catalog load + index build: {build_s:.2f}s\n")
+
+    print(f"{'QUERY':<40} | {'ROWS':>5} | {'INDEX us':>9} | {'SCAN us':>9} | {'SPEEDUP':>7} | CHECK")
+    print("-" * 90)
+    for label, conditions in QUERIES:
+        rows = engine.song_rows(**conditions)
+        expected = set(pandas_scan(albums, songs, conditions))
+        check = "ok" if {engine.catalog.song_uuid[int(r)] for r in rows} == expected else "MISMATCH"
+
+        index_s = median_seconds(lambda: engine.song_rows(**conditions))
+        scan_s = median_seconds(lambda: pandas_scan(albums, songs, conditions), rounds=max(ROUNDS // 10, 5))
+        print(f"{label:<40} | {len(rows):>5} | {index_s * 1e6:>9.0f} | {scan_s * 1e6:>9.0f} | "
+              f"{scan_s / index_s:>6.0f}x | {check}")
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,138 @@
+import time
+import asyncio
+import threading
+import multiprocessing
+
+# --- CONFIGURATION ---
+# Starting rate, floor and ceiling in requests/second for each host we hit.
+# Each limiter climbs additively while requests succeed and halves on every
+# 429 / timeout, so it settles just under what the remote side tolerates.
+HOST_DEFAULTS = {
+    "myswar.co":         {"rate": 0.5, "min_rate": 0.1,  "max_rate": 4.0},
+    "music.youtube.com": {"rate": 0.5, "min_rate": 0.05, "max_rate": 3.0},
+    "youtube.com":       {"rate": 0.5, "min_rate": 0.05, "max_rate": 5.0},
+}
+DEFAULT_LIMITS = {"rate": 0.5, "min_rate": 0.05, "max_rate": 2.0}
+
+INCREASE_STEP = 0.02     # req/s added per successful request
+DECREASE_FACTOR = 0.5    # rate multiplier on a throttle signal
+THROTTLE_COOLDOWN = 10.0 # seconds with no requests after a throttle signal
+
+THROTTLE_MARKERS = ("429", "too many requests", "rate limit", "timed out", "timeout")
+
+def is_throttle_error(error):
+    """True if an exception / message looks like the remote side pushing back."""
+    text = str(error).lower()
+    return isinstance(error, (TimeoutError, asyncio.TimeoutError)) or any(m in text for m in THROTTLE_MARKERS)
+
+class AdaptiveRateLimiter:
+    """
+    Token bucket whose refill rate is tuned by AIMD: +INCREASE_STEP per
+    success, x DECREASE_FACTOR per throttle signal. Thread-safe; acquire()
+    blocks, acquire_async() awaits.
+    """
+
+    def __init__(self, name, rate, min_rate, max_rate, burst=1.0):
+        self.name = name
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = burst
+
+        self._tokens = burst
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+        self.requests = 0
+        self.throttles = 0
+        self.waited_seconds = 0.0
+
+    def _reserve(self):
+        """Takes one token (possibly going into debt) and returns how long to wait."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            self._tokens -= 1
+            self.requests += 1
+            wait = 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+            self.waited_seconds += wait
+            return wait
+
+    def acquire(self):
+        wait = self._reserve()
+        if wait: time.sleep(wait)
+
+    async def acquire_async(self):
+        wait = self._reserve()
+        if wait: await asyncio.sleep(wait)
+
+    def on_success(self):
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + INCREASE_STEP)
+
+    def on_throttle(self):
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate * DECREASE_FACTOR)
+            # Pay for a cooldown up front: nobody gets a token until it has passed
+            self._tokens = min(self._tokens, 0.0) - THROTTLE_COOLDOWN * self.rate
+            self.throttles += 1
+
+    def report(self, error=None):
+        """Feeds one request outcome back: None = success, else the exception/message."""
+        if error is None: self.on_success()
+        elif is_throttle_error(error): self.on_throttle()
+
+    def stats(self):
+        return {
+            "host": self.name,
+            "rate": round(self.rate, 3),
+            "requests": int(self.requests),
+            "throttles": int(self.throttles),
+            "waited_s": round(self.waited_seconds, 1),
+        }
+
+class SharedRateLimiter(AdaptiveRateLimiter):
+    """
+    Same limiter with its bucket, rate and counters in shared memory, so
+    several processes draw from one budget. Create it in the parent and pass
+    it to the workers when they start (e.g. Pool initargs), then install() it.
+    """
+    FIELDS = ("rate", "_tokens", "_last", "requests", "throttles", "waited_seconds")
+
+    def __init__(self, name, rate, min_rate, max_rate, burst=1.0):
+        self._state = multiprocessing.RawArray('d', len(self.FIELDS))
+        super().__init__(name, rate, min_rate, max_rate, burst)
+        self._lock = multiprocessing.Lock()
+
+def _shared_field(index):
+    return property(lambda self: self._state[index],
+                    lambda self, value: self._state.__setitem__(index, value))
+
+for _index, _field in enumerate(SharedRateLimiter.FIELDS):
+    setattr(SharedRateLimiter, _field, _shared_field(_index))
+
+def shared_limiter(host):
+    """A SharedRateLimiter with the host's default limits."""
+    return SharedRateLimiter(host, **HOST_DEFAULTS.get(host, DEFAULT_LIMITS))
+
+_limiters = {}
+_registry_lock = threading.Lock()
+
+def get_limiter(key, host=None):
+    """
+    One shared limiter per key for the whole process. The key is normally the
+    host; pass host= separately to give several budgets (e.g. one per account)
+    the same starting limits.
+    """
+    with _registry_lock:
+        if key not in _limiters:
+            limits = HOST_DEFAULTS.get(host or key, DEFAULT_LIMITS)
+            _limiters[key] = AdaptiveRateLimiter(key, **limits)
+        return _limiters[key]
+
+def install(key, limiter):
+    """Makes get_limiter(key) return `limiter` in this process (e.g. a SharedRateLimiter)."""
+    with _registry_lock:
+        _limiters[key] = limiter
+    return limiter
@@ -0,0 +1,66 @@
+import sys
+import time
+import random
+
+import pandas as pd
+
+from candidate_scoring import accept_batch, reference_accept
+
+# --- CONFIGURATION ---
+# Any songs CSV; its titles are used both as queries and as candidate titles.
+SONGS_CSV = '../data/raw/songs data/songs_1955_1964_completed.csv'
+MAX_SONGS = 20000
+CANDIDATES_PER_SONG = 4    # search_and_verify keeps the top 4 results
+BAD_KEYWORDS = ['cover', 'karaoke', 'instrumental', 'remix', 'lofi', 'slowed', 'reverb', 'bass boosted']
+SEED = 7
+
+def build_corpus(songs_csv):
+    """Realistic-looking search results: the song itself, variants, and unrelated songs."""
+    titles = pd.read_csv(songs_csv, usecols=['song_title'])['song_title'].dropna().astype(str).tolist()[:MAX_SONGS]
+    rng = random.Random(SEED)
+    candidate_lists = []
+    for title in titles:
+        variants = [
+            title,
+            f"{title} (Cover)",
+            f"{title} - Lofi Slowed + Reverb",
+            title.upper(),
+            " ".join(title.split()[:2]),
+            rng.choice(titles),
+            rng.choice(titles),
+            "",
+        ]
+        candidates = []
+        for _ in range(CANDIDATES_PER_SONG):
+            candidates.append({
+                'resultType': rng.choice(['song', 'song', 'video', 'album', 'artist']),
+                'title': rng.choice(variants),
+                'videoId': f"{rng.getrandbits(40):011x}",
+            })
+        candidate_lists.append(candidates)
+    return titles, candidate_lists
+
+def run_benchmark(songs_csv=SONGS_CSV):
+    titles, candidate_lists = build_corpus(songs_csv)
+    pairs = sum(len(c) for c in candidate_lists)
+    print(f"Corpus: {len(titles)} songs, {pairs} candidates from {songs_csv}\n")
+
+    started = time.perf_counter()
+    reference = [reference_accept(t, c, BAD_KEYWORDS) for t, c in zip(titles, candidate_lists)]
+    loop_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    batch = accept_batch(titles, candidate_lists, BAD_KEYWORDS)
+    batch_s = time.perf_counter() - started
+
+    mismatches = sum(r != b for r, b in zip(reference, batch))
+    print(f"Decision check: {'IDENTICAL' if mismatches == 0 else f'{mismatches} MISMATCHES'}\n")
+
+    print(f"{'ENGINE':<8} | {'CANDIDATES/SEC':>14} | {'SPEEDUP':>7}")
+    print("-" * 36)
+    for name, seconds in [("loop", loop_s), ("batch", batch_s)]:
+        rate = pairs / seconds if seconds else 0.0
+        print(f"{name:<8} | {rate:>14.0f} | {loop_s / seconds if seconds else 0.0:>6.1f}x")
+
+if __name__ == "__main__":
+    run_benchmark(sys.argv[1] if len(sys.argv) > 1 else SONGS_CSV)
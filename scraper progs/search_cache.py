@@ -0,0 +1,110 @@
+import re
+import json
+import time
+import sqlite3
+import threading
+
+# --- CONFIGURATION ---
+CACHE_DB = 'yt_search_cache.sqlite'
+TTL_DAYS = 30              # Cached searches older than this are searched again
+MAX_CACHE_MB = 256         # Least-recently-used queries are evicted past this
+EVICT_EVERY = 500          # Size check once per this many inserts
+
+# Only the fields search_and_verify scores on are kept, so a cached search
+# is a few hundred bytes instead of the full response with thumbnails.
+CANDIDATE_FIELDS = ('resultType', 'videoId', 'title')
+
+def normalize_query(query):
+    """Case / whitespace-insensitive cache key."""
+    return re.sub(r'\s+', ' ', str(query)).strip().lower()
+
+class SearchCache:
+    """
+    Persistent memo of YouTube Music searches: normalized query -> candidate
+    list. Scoring is not cached, only the raw candidates, so threshold or
+    keyword tweaks apply to cached songs without new API calls.
+    Thread-safe; one connection shared by the lookup workers.
+    """
+
+    def __init__(self, db_path=CACHE_DB, ttl_days=TTL_DAYS, max_mb=MAX_CACHE_MB):
+        self.ttl = ttl_days * 86400
+        self.max_bytes = max_mb * 1024 * 1024
+        self.conn = sqlite3.connect(db_path, timeout=60, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS searches (
+                query TEXT PRIMARY KEY,
+                candidates TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS searches_last_used ON searches (last_used);
+        """)
+        self.conn.commit()
+        self._lock = threading.Lock()
+        self._inserts = 0
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+
+    def get(self, query):
+        """Cached candidates for the query, or None if unknown / expired."""
+        key = normalize_query(query)
+        now = time.time()
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT candidates, fetched_at FROM searches WHERE query = ?", (key,)).fetchone()
+            if row is None or now - row[1] > self.ttl:
+                self.misses += 1
+                return None
+            self.conn.execute("UPDATE searches SET last_used = ? WHERE query = ?", (now, key))
+            self.conn.commit()
+            self.hits += 1
+            return json.loads(row[0])
+
+    def put(self, query, results):
+        candidates = [{f: item.get(f) for f in CANDIDATE_FIELDS} for item in results]
+        now = time.time()
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO searches VALUES (?, ?, ?, ?)",
+                (normalize_query(query), json.dumps(candidates), now, now))
+            self.conn.commit()
+            self._inserts += 1
+            if self._inserts % EVICT_EVERY == 0: self._evict()
+        return candidates
+
+    def _evict(self):
+        # Expired rows first, then least-recently-used until under the size cap
+        cur = self.conn.execute("DELETE FROM searches WHERE fetched_at < ?", (time.time() - self.ttl,))
+        self.evicted += cur.rowcount
+        total = self.conn.execute(
+            "SELECT COALESCE(SUM(LENGTH(query) + LENGTH(candidates)), 0) FROM searches").fetchone()[0]
+        if total > self.max_bytes:
+            for key, size in self.conn.execute(
+                    "SELECT query, LENGTH(query) + LENGTH(candidates) FROM searches ORDER BY last_used").fetchall():
+                if total <= self.max_bytes: break
+                self.conn.execute("DELETE FROM searches WHERE query = ?", (key,))
+                self.evicted += 1
+                total -= size
+        self.conn.commit()
+
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self):
+        with self._lock:
+            entries = self.conn.execute("SELECT COUNT(*) FROM searches").fetchone()[0]
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hit_rate(), 3),
+            "entries": entries,
+            "evicted": self.evicted,
+        }
+
+    def close(self):
+        with self._lock:
+            self._evict()
+            self.conn.close()
@@ -1,22 +1,46 @@
 import os
 import re
+import sys
 import time
-import random
+import queue
 import logging
+import threading
+import hashlib
+import subprocess
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 import pandas as pd
 import yt_dlp   
 
+from rate_limiter import get_limiter
+from download_journal import DownloadJournal
+from audio_store import AudioStore
+from video_ids import URL_COLUMNS, extract_video_ids
+
 # --- 1. CONFIGURATION ---
 START = 1955
 END = 1964
 INPUT_CSV = f'tobe_songs_{START}_{END}_final.csv'
-OUTPUT_CSV = f"status_{INPUT_CSV}" # Tracks progress (Resumable)
+OUTPUT_CSV = f"status_{INPUT_CSV}" # Written on demand: python songs_downloader.py --export
+STATUS_DB = f"status_{INPUT_CSV.replace('.csv', '.sqlite')}"  # Tracks progress (Resumable)
 DOWNLOAD_DIR = f'downloads/songs/songs_{START}_{END}'
 LOG_FILE = f"log_{INPUT_CSV.replace('.csv', '.log')}"
 FFMPEG_DIR = r"C:\ffmpeg\bin"    # Your identified path
+FFMPEG_BIN = os.path.join(FFMPEG_DIR, "ffmpeg.exe" if os.name == "nt" else "ffmpeg")
+MP3_BITRATE = '128k'               # Small size, high compatibility
+
+NET_WORKERS = 4                          # Concurrent stream downloads
+TRANSCODE_WORKERS = os.cpu_count() or 2  # ffmpeg processes (one per core)
+STAGED_QUEUE_SIZE = 2 * TRANSCODE_WORKERS  # Downloaded-but-not-transcoded songs allowed to pile up
+STAGING_DIR = os.path.join(DOWNLOAD_DIR, '_staging')
+STORE_DIR = 'downloads/audio_store'      # One mp3 per video ID; song files link into it
 
 os.makedirs(DOWNLOAD_DIR, exist_ok=True)
 
+# Paces downloads adaptively instead of a fixed jitter (see rate_limiter.py)
+limiter = get_limiter("youtube.com")
+
 # Logging configuration
 logging.basicConfig(
     filename=LOG_FILE,
@@ -33,98 +57,280 @@ def sanitize_filename(name):
     return name[:100]
 
 def get_best_url(row):
-    """Finds first valid URL in your CSV columns."""
+    """Finds first valid URL in your CSV columns: (url, column) or (None, None)."""
     cols = ['music_yt_url_1', 'music_yt_url_2',  'youtube_url', 'music_yt_url_3']
     for col in cols:
         if col in row and pd.notna(row[col]):
             url = str(row[col]).strip()
             if url.startswith('http'):
-                return url
-    return None
+                return url, col
+    return None, None
+
+def scan_downloaded(download_dir):
+    """song_uuids of every finished mp3 in one directory scan ([uuid]_[title].mp3)."""
+    uuids = set()
+    with os.scandir(download_dir) as entries:
+        for entry in entries:
+            if entry.is_file() and entry.name.endswith('.mp3') and not entry.name.endswith('.part.mp3'):
+                uuids.add(entry.name.split('_', 1)[0])
+    return uuids
+
+# --- 3. PIPELINE STAGES ---
+# Work is per video, not per song: songs sharing a video ID are downloaded
+# and transcoded once into the AudioStore, then hardlinked as [uuid]_[title].mp3.
+# Stage 1 (threads): fetch the bestaudio stream into STAGING_DIR, no transcode.
+# Stage 2 (processes): ffmpeg -> 128 kbps mp3 in the store, one process per core.
+# The bounded `staged` queue between them is the backpressure: when the
+# transcoders fall behind, network workers block instead of filling the disk.
+
+class Job:
+    def __init__(self, song_uuid, url, video_id, title, filepath):
+        self.song_uuid = song_uuid
+        self.url = url
+        self.video_id = video_id
+        self.title = title
+        self.filepath = filepath   # final path without extension
+
+class VideoJob:
+    def __init__(self, key, url, songs):
+        self.key = key             # video ID (store key)
+        self.url = url
+        self.songs = songs         # every Job that resolves to this video
+        self.staged_path = None
+
+def store_key(job):
+    """Video ID, or a stable stand-in for URLs we couldn't parse one from."""
+    return job.video_id or "url-" + hashlib.sha1(job.url.encode('utf-8')).hexdigest()[:16]
+
+# yt-dlp instances are reused per network thread (they aren't thread-safe)
+_local = threading.local()
 
-def extract_video_id(url):
-    """For your hobby site: <img src='https://img.youtube.com/vi/ID/maxresdefault.jpg'>"""
-    if not url: return ""
-    match = re.search(r"(?:v=|\/)([0-9A-Za-z_-]{11}).*", url)
-    return match.group(1) if match else ""
+def get_extractor():
+    if not hasattr(_local, "ydl"):
+        _local.ydl = yt_dlp.YoutubeDL({
+            'format': 'bestaudio/best',
+            'outtmpl': os.path.join(STAGING_DIR, '%(id)s.%(ext)s'),
+            'overwrites': False,
+            'quiet': True,
+            'no_warnings': True,
+        })
+    return _local.ydl
+
+def fetch_audio(job):
+    """Stage 1: downloads the raw audio stream, returns its staged path."""
+    ydl = get_extractor()
+    limiter.acquire()
+    try:
+        info = ydl.extract_info(job.url, download=True)
+        limiter.report()
+    except Exception as e:
+        limiter.report(e)
+        raise
+    downloads = info.get('requested_downloads') or []
+    path = downloads[0].get('filepath') if downloads else ydl.prepare_filename(info)
+    # Renamed to the store key, so the transcoder owns and deletes it
+    staged_path = os.path.join(STAGING_DIR, f"{job.key}{os.path.splitext(path)[1]}")
+    os.replace(path, staged_path)
+    return staged_path
 
-# --- 3. THE CORE PROCESSOR ---
+def transcode(src, dst):
+    """Stage 2 (runs in a worker process): src -> 128 kbps mp3 at dst. Returns (ok, error, seconds)."""
+    started = time.perf_counter()
+    tmp = f"{dst}.part.mp3"
+    result = subprocess.run(
+        [FFMPEG_BIN, '-y', '-loglevel', 'error', '-i', src, '-vn',
+         '-codec:a', 'libmp3lame', '-b:a', MP3_BITRATE, tmp],
+        capture_output=True, text=True)
+    if result.returncode != 0:
+        try: os.remove(tmp)
+        except OSError: pass
+        return False, result.stderr.strip()[-300:], 0.0
+    os.replace(tmp, dst)
+    os.remove(src)
+    return True, "", time.perf_counter() - started
+
+def classify_error(err):
+    return 'failed_dead_link' if "404" in err or "unavailable" in err else 'failed_network'
+
+# --- 4. THE CORE PROCESSOR ---
 
 def run_production():
     # Verify FFmpeg before starting
-    if not os.path.exists(os.path.join(FFMPEG_DIR, "ffmpeg.exe")):
-        print(f"CRITICAL ERROR: ffmpeg.exe not found at {FFMPEG_DIR}")
+    if not os.path.exists(FFMPEG_BIN):
+        print(f"CRITICAL ERROR: {os.path.basename(FFMPEG_BIN)} not found at {FFMPEG_DIR}")
         return
 
+    os.makedirs(STAGING_DIR, exist_ok=True)
+
     # Load / Resume
-    if os.path.exists(OUTPUT_CSV):
-        df = pd.read_csv(OUTPUT_CSV)
-        print(f"Resuming {INPUT_CSV} progress...")
-    else:
-        df = pd.read_csv(INPUT_CSV)
-        df['download_status'] = 'pending'
-        df['yt_video_id'] = ''
+    journal = DownloadJournal(STATUS_DB)
+    imported = journal.import_status_csv(OUTPUT_CSV)
+    if imported: print(f"Imported {imported} statuses from {OUTPUT_CSV}")
 
+    # Files already on disk are done, whatever the journal says (one directory scan)
+    on_disk = scan_downloaded(DOWNLOAD_DIR)
+    done = journal.uuids_with_status('downloaded')
+    if on_disk - done:
+        journal.mark_downloaded(on_disk - done)
+        print(f"Reconciled {len(on_disk - done)} songs already in {DOWNLOAD_DIR}")
+    done |= on_disk
+    if done: print(f"Resuming {INPUT_CSV} progress ({len(done)} already downloaded)...")
+
+    df = pd.read_csv(INPUT_CSV)
     total = len(df)
+    df = df[~df['song_uuid'].astype(str).isin(done)]
+    jobs = []
 
-    for index, row in df.iterrows():
-        if row['download_status'] == 'downloaded':
-            continue
+    # Video IDs of every URL column in one vectorized pass
+    # (also for your hobby site: <img src='https://img.youtube.com/vi/ID/maxresdefault.jpg'>)
+    video_ids = extract_video_ids(df)
 
-        url = get_best_url(row)
+    for row, ids in zip(df.to_dict('records'), video_ids.to_dict('records')):
+        s_uuid = str(row.get('song_uuid', 'no_uuid'))
+        url, col = get_best_url(row)
         if not url:
-            df.at[index, 'download_status'] = 'no_url'
+            journal.set_status(s_uuid, 'no_url')
             continue
 
-        video_id = extract_video_id(url)
-        df.at[index, 'yt_video_id'] = video_id
+        video_id = ids[URL_COLUMNS[col]]
 
         # File naming: [uuid]_[title].mp3
         s_title = row.get('song_title', 'unknown')
-        s_uuid = row.get('song_uuid', 'no_uuid')
         filename = f"{s_uuid}_{sanitize_filename(s_title)}"
-        filepath = os.path.join(DOWNLOAD_DIR, filename)
+        jobs.append(Job(s_uuid, url, video_id, s_title, os.path.join(DOWNLOAD_DIR, filename)))
 
-        print(f"[{index+1}/{total}] Downloading: {s_title}")
+    # Group songs by video; videos already in the store only need links
+    store = AudioStore(STORE_DIR)
+    by_video = defaultdict(list)
+    for job in jobs: by_video[store_key(job)].append(job)
 
-        ydl_opts = {
-            'format': 'bestaudio/best',
-            'outtmpl': f'{filepath}.%(ext)s',
-            'overwrites': False,
-            'ffmpeg_location': FFMPEG_DIR,
-            'postprocessors': [{
-                'key': 'FFmpegExtractAudio',
-                'preferredcodec': 'mp3',
-                'preferredquality': '128', # Small size, high compatibility
-            }],
-            'quiet': True,
-            'no_warnings': True,
-        }
+    video_jobs = []
+    linked = 0
+    for key, songs in by_video.items():
+        if store.has(key):
+            for job in songs:
+                store.link(key, f"{job.filepath}.mp3")
+                journal.set_status(job.song_uuid, 'downloaded', job.video_id)
+            linked += len(songs)
+        else:
+            video_jobs.append(VideoJob(key, songs[0].url, songs))
+    if linked: print(f"Linked {linked} songs to videos already in {STORE_DIR}")
+
+    print(f"{len(jobs) - linked} of {total} songs to download as {len(video_jobs)} unique videos | "
+          f"{NET_WORKERS} network workers, {TRANSCODE_WORKERS} transcoders")
+
+    # (video job, status, transcode seconds) from both stages; status None = not
+    # attempted (the transcoders died), so the songs stay pending for the next run
+    results = queue.Queue()
+    staged = queue.Queue(maxsize=STAGED_QUEUE_SIZE)  # stage 1 -> stage 2
+    pending = queue.Queue()
+    for job in video_jobs: pending.put(job)
+    pool_broken = threading.Event()
+
+    def network_worker():
+        while not pool_broken.is_set():
+            try: job = pending.get_nowait()
+            except queue.Empty: return
+            try:
+                job.staged_path = fetch_audio(job)
+            except Exception as e:
+                err = str(e)
+                logging.error(f"Video {job.key} ({len(job.songs)} songs) Failed: {err}")
+                results.put((job, classify_error(err), 0.0))
+                continue
+            staged.put(job)  # blocks while the transcoders are behind
 
-        success = False
+    def stop_pipeline(job):
+        """The process pool broke: stop downloading and hand back everything not yet transcoded."""
+        if not pool_broken.is_set():
+            pool_broken.set()
+            logging.error("Transcode pool broke; stopping downloads")
+            print("\n[CRITICAL] Transcoder processes died. Stopping; unfinished songs stay pending.")
+            while True:
+                try: results.put((pending.get_nowait(), None, 0.0))
+                except queue.Empty: break
+        results.put((job, None, 0.0))
+
+    def transcode_feeder(pool):
+        # At most TRANSCODE_WORKERS jobs inside the pool; the rest wait in `staged`
+        slots = threading.Semaphore(TRANSCODE_WORKERS)
+        while True:
+            job = staged.get()
+            if job is None: return
+            if pool_broken.is_set():
+                results.put((job, None, 0.0))  # Keep draining so no network worker blocks on put()
+                continue
+            slots.acquire()
+            os.makedirs(os.path.dirname(store.path(job.key)), exist_ok=True)
+            try:
+                future = pool.submit(transcode, job.staged_path, store.path(job.key))
+            except BrokenProcessPool:
+                slots.release()
+                stop_pipeline(job)
+                continue
+
+            def done(future, job=job):
+                slots.release()
+                try:
+                    ok, err, seconds = future.result()
+                except BrokenProcessPool:
+                    stop_pipeline(job)
+                    return
+                except Exception as e:
+                    ok, err, seconds = False, str(e), 0.0
+                if not ok: logging.error(f"Video {job.key} Transcode failed: {err}")
+                results.put((job, 'downloaded' if ok else 'failed_transcode', seconds))
+            future.add_done_callback(done)
+
+    with ProcessPoolExecutor(max_workers=TRANSCODE_WORKERS) as pool:
+        feeder = threading.Thread(target=transcode_feeder, args=(pool,), daemon=True)
+        feeder.start()
+        net_threads = [threading.Thread(target=network_worker, daemon=True) for _ in range(NET_WORKERS)]
+        for t in net_threads: t.start()
+
+        finished = 0
         try:
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                if ydl.download([url]) == 0:
-                    success = True
-        except Exception as e:
-            err = str(e)
-            logging.error(f"UUID {s_uuid} Failed: {err}")
-            if "404" in err or "unavailable" in err:
-                df.at[index, 'download_status'] = 'failed_dead_link'
-            else:
-                df.at[index, 'download_status'] = 'failed_network'
-
-        if success:
-            df.at[index, 'download_status'] = 'downloaded'
-
-        # Batch save every 10 songs for data safety
-        if index % 10 == 0:
-            df.to_csv(OUTPUT_CSV, index=False)
-            time.sleep(random.uniform(1, 2)) # Jitter to avoid bot detection
-
-    # Final Save
-    df.to_csv(OUTPUT_CSV, index=False)
+            while finished < len(video_jobs):
+                video, status, seconds = results.get()
+                finished += 1
+                if status is None: continue
+                if status == 'downloaded': store.add(video.key, seconds)
+                for i, job in enumerate(video.songs):
+                    # The first song paid for the transcode; the rest are dedup savings
+                    if status == 'downloaded': store.link(video.key, f"{job.filepath}.mp3", saved=i > 0)
+                    # Committed immediately: a crash never loses a finished song
+                    journal.set_status(job.song_uuid, status, job.video_id)
+                    print(f"[{finished}/{len(video_jobs)}] {status}: {job.title}")
+        except KeyboardInterrupt:
+            print("\nStopping... (finished songs are saved, the rest stay pending)")
+            journal.close()
+            store.close()
+            pool.shutdown(wait=False, cancel_futures=True)
+            os._exit(130)
+
+        for t in net_threads: t.join()
+        staged.put(None)
+        feeder.join()
+
+    counts = journal.counts()
+    journal.close()
+    stats = store.stats()
+    store.close()
     print("\n--- Processing Finished ---")
+    print(", ".join(f"{status}: {n}" for status, n in sorted(counts.items())))
+    print(f"Dedup: {len(jobs)} songs -> {len(by_video)} videos | saved {stats['mb_saved']} MB and "
+          f"{stats['transcode_s_saved']}s of transcoding | links: {stats['hardlink']} hard, "
+          f"{stats['symlink']} sym, {stats['copy']} copied")
+    print(f"Status CSV: python songs_downloader.py --export  ->  {OUTPUT_CSV}")
+
+def export_status():
+    journal = DownloadJournal(STATUS_DB)
+    rows = journal.export_csv(INPUT_CSV, OUTPUT_CSV)
+    journal.close()
+    print(f"Wrote {rows} rows to {OUTPUT_CSV}")
 
 if __name__ == "__main__":
-    run_production()
\ No newline at end of file
+    if "--export" in sys.argv:
+        export_status()
+    else:
+        run_production()
@@ -0,0 +1,47 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from myswar_parser import parse_album_page, parse_listing_page  # noqa: E402
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+BACKENDS = ["bs4", "lxml"]
+
+def fixture(name):
+    with open(os.path.join(FIXTURES, name), encoding='utf-8') as f:
+        return f.read()
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_album_page(backend):
+    album_rating, songs = parse_album_page(fixture('album_page.html'), backend=backend)
+    assert album_rating == "4.33"
+    assert songs == [
+        {"track": 1, "title": "Chhod Na Apni Aas Ae Dil - 1", "singers": "Talat Mahmood",
+         "rating": "3.88", "url": "https://www.youtube.com/watch?v=abcdefghijk"},
+        {"track": 3, "title": "Unknown", "singers": "Asha Bhosle, Mohammed Rafi",
+         "rating": "3", "url": "https://www.youtube.com/embed/ABCDEFGHIJA"},
+        {"track": 4, "title": "Unrated Song", "singers": "",
+         "rating": "0", "url": "https://music.youtube.com/watch?v=QQQQQQQQQQQ"},
+    ]
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_listing_page(backend):
+    albums = parse_listing_page(fixture('listing_page.html'), backend=backend)
+    assert [a["title"] for a in albums] == ["Aaj Ki Baat", "Azaad", None]
+    assert albums[0]["url"] == "/album/aaj_ki_baat_1955"
+    assert albums[0]["labels"] == {"Album Category": "Hindi, Film", "Music Director": "Snehal Bhatkar",
+                                   "Lyricist": "Kidar Sharma", "Label": "Saregama"}
+    assert albums[1]["labels"]["Lyricist"] == ""
+    assert albums[2]["labels"] == {"Album Category": "", "Music Director": "", "Lyricist": "", "Label": ""}
+
+def test_backends_agree():
+    for name, parse in [('album_page.html', parse_album_page), ('listing_page.html', parse_listing_page)]:
+        assert parse(fixture(name), backend="lxml") == parse(fixture(name), backend="bs4")
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("html", ["", "   ", '<?xml version="1.0" encoding="utf-8"?><html><body></body></html>'])
+def test_unparseable_pages(backend, html):
+    assert parse_album_page(html, backend=backend) is None
+    assert parse_listing_page(html, backend=backend) == []
@@ -0,0 +1,170 @@
+import glob
+import time
+import sqlite3
+
+import numpy as np
+import pandas as pd
+
+# --- CONFIGURATION ---
+SONGS_GLOB = '../data/raw/songs data/*.csv'
+INDEX_DB = '../data/video_index.sqlite'   # video ID -> song_uuid reverse index
+
+# url column -> id column (the names idseparater.py has always written)
+URL_COLUMNS = {
+    'youtube_url': 'youtubeurlid',
+    'music_yt_url_1': 'musicurlid1',
+    'music_yt_url_2': 'musicurlid2',
+    'music_yt_url_3': 'musicurlid3',
+}
+
+# watch?v= (also after other params, e.g. watch?feature=...&v=, and the
+# '/watch'-less youtube.com?v=), youtu.be/, shorts/, embed/, v/ on www., m.,
+# music. and youtube-nocookie.com. Anchored on the host, so a non-YouTube
+# link (myswar.co/song_details/...) gives no ID.
+VIDEO_ID_PATTERN = (r"(?:youtube\.com|youtube-nocookie\.com|youtu\.be)/?"
+                    r"(?:(?:watch)?\?(?:[^#\s]*?&)?v=|shorts/|embed/|v/|live/)?([0-9A-Za-z_-]{11})(?![0-9A-Za-z_-])")
+
+# --- ID <-> INT64 ---
+# A video ID is a 64-bit number in base64url: 10 chars x 6 bits + a last char
+# carrying the remaining 4 bits (so it is always one of AEIMQUYcgkosw048).
+ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_"
+_DIGITS = np.full(256, -1, dtype=np.int64)
+_DIGITS[np.frombuffer(ALPHABET.encode('ascii'), dtype=np.uint8)] = np.arange(64)
+
+def encode_ids(video_ids):
+    """
+    Video ID strings -> int64 (the 64 bits reinterpreted as signed). Returns
+    (codes, valid): '' / malformed IDs get valid=False and code 0.
+    """
+    ids = pd.Series(video_ids, dtype=object).fillna('').to_numpy(dtype=object)
+    valid = np.fromiter((len(i) == 11 and i.isascii() for i in ids), bool, len(ids))
+    codes = np.zeros(len(ids), dtype=np.uint64)
+    if valid.any():
+        digits = _DIGITS[np.frombuffer(''.join(ids[valid]).encode('ascii'), dtype=np.uint8).reshape(-1, 11)]
+        # The last char may only use its top 4 bits; anything else is not a real ID
+        ok = (digits >= 0).all(axis=1) & (digits[:, 10] & 3 == 0)
+        value = np.zeros(len(digits), dtype=np.uint64)
+        for i in range(10):
+            value = (value << np.uint64(6)) | digits[:, i].astype(np.uint64)
+        value = (value << np.uint64(4)) | (digits[:, 10] >> 2).astype(np.uint64)
+        codes[valid] = np.where(ok, value, 0)
+        valid[valid] = ok
+    return codes.view(np.int64), valid
+
+def encode_id(video_id):
+    codes, valid = encode_ids([video_id])
+    if not valid[0]: raise ValueError(f"not a YouTube video ID: {video_id!r}")
+    return int(codes[0])
+
+def decode_id(code):
+    value = int(code) & 0xFFFFFFFFFFFFFFFF
+    chars = [ALPHABET[(value & 0xF) << 2]]
+    value >>= 4
+    for _ in range(10):
+        chars.append(ALPHABET[value & 0x3F])
+        value >>= 6
+    return ''.join(reversed(chars))
+
+# --- EXTRACTION ---
+def extract_video_ids(df, url_columns=URL_COLUMNS):
+    """
+    Video IDs of every URL column in one str.extract pass (the non-empty
+    URLs of all columns stacked end to end). Returns a DataFrame of the id
+    columns aligned with df: '' where the URL is missing, not YouTube, or
+    the column is absent.
+    """
+    present = [c for c in url_columns if c in df.columns]
+    out = pd.DataFrame({id_col: np.full(len(df), '', dtype=object) for id_col in url_columns.values()}, index=df.index)
+    if not present or not len(df): return out
+    urls = pd.Series(np.concatenate([df[c].to_numpy(dtype=object) for c in present]), dtype='string')
+    has_url = urls.notna().to_numpy()
+    ids = np.full(len(urls), '', dtype=object)
+    ids[has_url] = urls[has_url].str.extract(VIDEO_ID_PATTERN, expand=False).fillna('').to_numpy(dtype=object)
+    for i, column in enumerate(present):
+        out[url_columns[column]] = ids[i * len(df):(i + 1) * len(df)]
+    return out
+
+def video_id(url):
+    """Single-URL version of extract_video_ids ('' if there is none)."""
+    if url is None or (isinstance(url, float) and pd.isna(url)): return ""
+    return extract_video_ids(pd.DataFrame({'url': [url]}), {'url': 'id'})['id'].iloc[0]
+
+# --- REVERSE INDEX ---
+class VideoIndex:
+    """
+    video ID (as int64) -> song_uuid for every URL column, so songs sharing a
+    video are one integer lookup apart. Rebuilt in one transaction by build_index().
+    """
+
+    def __init__(self, db_path=INDEX_DB):
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS video_songs (
+                video_id INTEGER NOT NULL,
+                song_uuid TEXT NOT NULL,
+                url_column TEXT NOT NULL,
+                PRIMARY KEY (video_id, song_uuid, url_column)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS video_songs_song ON video_songs (song_uuid);
+        """)
+        self.conn.commit()
+
+    def replace_all(self, rows):
+        with self.conn:
+            self.conn.execute("DELETE FROM video_songs")
+            self.conn.executemany("INSERT OR IGNORE INTO video_songs VALUES (?, ?, ?)", rows)
+
+    def songs_for(self, video):
+        """song_uuids using a video (ID string or its int64 code)."""
+        code = encode_id(video) if isinstance(video, str) else int(video)
+        return sorted({uuid for (uuid,) in self.conn.execute(
+            "SELECT song_uuid FROM video_songs WHERE video_id = ?", (code,))})
+
+    def videos_for(self, song_uuid):
+        return sorted({decode_id(code) for (code,) in self.conn.execute(
+            "SELECT video_id FROM video_songs WHERE song_uuid = ?", (song_uuid,))})
+
+    def shared_videos(self, min_songs=2):
+        """(video ID, song count) of videos used by several songs, most shared first."""
+        return [(decode_id(code), n) for code, n in self.conn.execute("""
+            SELECT video_id, COUNT(DISTINCT song_uuid) AS n FROM video_songs
+            GROUP BY video_id HAVING n >= ? ORDER BY n DESC, video_id""", (min_songs,))]
+
+    def stats(self):
+        rows, videos, songs = self.conn.execute(
+            "SELECT COUNT(*), COUNT(DISTINCT video_id), COUNT(DISTINCT song_uuid) FROM video_songs").fetchone()
+        return {"links": rows, "videos": videos, "songs": songs}
+
+    def close(self):
+        self.conn.close()
+
+def build_index(songs_glob=SONGS_GLOB, db_path=INDEX_DB):
+    started = time.time()
+    rows, urls, rejected = [], 0, 0
+    for path in sorted(glob.glob(songs_glob)):
+        header = pd.read_csv(path, nrows=0).columns
+        df = pd.read_csv(path, usecols=['song_uuid'] + [c for c in URL_COLUMNS if c in header], dtype=str)
+        ids = extract_video_ids(df)
+        for url_col, id_col in URL_COLUMNS.items():
+            if url_col not in df.columns: continue
+            has_url = df[url_col].notna().to_numpy()
+            codes, valid = encode_ids(ids[id_col])
+            urls += int(has_url.sum())
+            rejected += int((has_url & ~valid).sum())
+            rows += zip(codes[valid].tolist(), df['song_uuid'][valid].tolist(), [url_col] * int(valid.sum()))
+
+    index = VideoIndex(db_path)
+    index.replace_all(rows)
+    stats = index.stats()
+    print(f"{urls} URLs -> {stats['links']} links, {stats['videos']} distinct videos, "
+          f"{stats['songs']} songs ({rejected} URLs without a video ID) in {time.time() - started:.1f}s")
+    return index
+
+if __name__ == "__main__":
+    index = build_index()
+    shared = index.shared_videos()
+    print(f"{len(shared)} videos are used by more than one song")
+    for vid, n in shared[:10]:
+        print(f"  {vid}: {n} songs")
+    index.close()
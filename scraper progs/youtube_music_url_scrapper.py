@@ -4,9 +4,19 @@ from tqdm import tqdm
 from thefuzz import fuzz
 import time
 import os
-import random
+import csv
+import json
 import re 
 import sys 
+import glob
+import threading
+from collections import deque, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from rate_limiter import get_limiter, is_throttle_error
+from search_cache import SearchCache
+from rapidfuzz.fuzz import token_sort_ratio
+from candidate_scoring import accept_candidates, score_matrix
 
 # ==============================================================================
 # ⚙️ CONFIGURATION
@@ -15,99 +25,175 @@ START = 1950
 END = 1960
 INPUT_CSV = f'tobe_songs_{START}_{END}.csv'         
 AUTH_FILE = 'browser01.json'       
+AUTH_GLOB = 'browser*.json'        # Every matching file becomes one session
+WORKERS = 0                        # 0 = two workers per session
+CACHE_TTL_DAYS = 30                # Cached searches older than this are repeated
 BATCH_SIZE = 20                  
+ALBUM_BATCH = True                 # Match tracks against their album's tracklist first
+ALBUMS_CSV = f'albums_{START}_{END}.csv'  # album_uuid -> title / music director / year
+ALBUM_TITLE_SCORE = 80             # Min fuzz score for a search hit to count as "the" album
+ALBUM_TRACK_SCORE = 85             # Min fuzz score for a track to match a song locally
+ALBUM_TRACK_MARGIN = 5             # ...and by this much over the next track, else per-song search
+ALBUM_ALTERNATIVES = True          # Fill url_2/url_3 of album-matched songs from the per-song search
+VERSION_WORDS = {'sad', 'happy', 'female', 'male', 'duet', 'solo', 'remix', 'reprise', 'unplugged',
+                 'instrumental', 'version', 'revival'}  # Tell apart tracks that share a title
 BAD_KEYWORDS = ['cover', 'karaoke', 'instrumental', 'remix', 'lofi', 'slowed', 'reverb', 'bass boosted']
 
 # ==============================================================================
 
 OUTPUT_CSV = INPUT_CSV.replace('.csv', '_final.csv')
+JOURNAL_FILE = OUTPUT_CSV + '.journal'  # input offset / output size of the last flushed batch
+URL_COLUMNS = ['music_yt_url_1', 'music_yt_url_2', 'music_yt_url_3']
+AUTH_FILES = sorted(glob.glob(AUTH_GLOB))
+
+# ------------------------------------------------------------------------------
+# 🔑 SESSION POOL
+# Every auth file becomes its own session with its own rate limiter. Searches
+# are handed out round-robin, so N accounts give roughly N x the throughput
+# while no single account goes faster than its limiter allows.
+# ------------------------------------------------------------------------------
+
+class YTSession:
+    def __init__(self, auth_file):
+        self.auth_file = auth_file
+        self.yt = YTMusic(auth_file) if auth_file else YTMusic()
+        self.limiter = get_limiter(f"music.youtube.com[{auth_file or 'anonymous'}]", host="music.youtube.com")
+
+    def _call(self, fn, *args, **kwargs):
+        """One rate-limited API call. Throttle errors are fed back and re-raised."""
+        self.limiter.acquire()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            self.limiter.report(e)
+            raise
+        self.limiter.report()
+        return result
+
+    def search(self, query, filter=None):
+        return self._call(self.yt.search, query, filter=filter)
 
-# 1. AUTHENTICATION & PRE-CHECK (From your script - Good idea!)
-if os.path.exists(AUTH_FILE):
-    print(f"\n✅ Authenticated successfully using: {AUTH_FILE}")
-    yt = YTMusic(AUTH_FILE)
-else:
-    print(f"\n⚠️  {AUTH_FILE} not found. Running ANONYMOUSLY.")
-    yt = YTMusic()
-
-# ⚡ Pre-flight check: Ensure cookies work BEFORE starting the loop
-try:
-    yt.get_library_playlists() # Quick ping to check auth
-except Exception:
-    print(f"\n❌ FATAL ERROR: Cookies in {AUTH_FILE} are invalid or expired.")
-    print("👉 Please extract new cookies and update the JSON file.")
+    def get_album(self, browse_id):
+        return self._call(self.yt.get_album, browse_id)
+
+class SessionPool:
+    def __init__(self, auth_files):
+        self.sessions = []
+        for auth_file in auth_files:
+            session = YTSession(auth_file)
+            if auth_file:
+                # ⚡ Pre-flight check: Ensure cookies work BEFORE starting the loop
+                try:
+                    session.yt.get_library_playlists() # Quick ping to check auth
+                except Exception:
+                    print(f"\n❌ Cookies in {auth_file} are invalid or expired. Skipping it.")
+                    continue
+                print(f"✅ Authenticated successfully using: {auth_file}")
+            self.sessions.append(session)
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def next(self):
+        with self._lock:
+            if not self.sessions: raise RuntimeError("No working sessions left")
+            session = self.sessions[self._next % len(self.sessions)]
+            self._next += 1
+            return session
+
+    def retire(self, session):
+        """Drops a session whose cookies stopped working. Returns how many are left."""
+        with self._lock:
+            if session in self.sessions: self.sessions.remove(session)
+            return len(self.sessions)
+
+    def rate(self):
+        return sum(session.limiter.rate for session in self.sessions)
+
+# 1. AUTHENTICATION & PRE-CHECK
+auth_files = AUTH_FILES or ([AUTH_FILE] if os.path.exists(AUTH_FILE) else [])
+if not auth_files:
+    print(f"\n⚠️  No {AUTH_GLOB} files found. Running ANONYMOUSLY.")
+    auth_files = [None]
+
+pool = SessionPool(auth_files)
+if not pool.sessions:
+    print("\n❌ FATAL ERROR: No auth file has working cookies.")
+    print("👉 Please extract new cookies and update the JSON files.")
     sys.exit(1)
 
+WORKERS = WORKERS or 2 * len(pool.sessions)
+search_cache = SearchCache(ttl_days=CACHE_TTL_DAYS)
+print(f"🔁 {len(pool.sessions)} session(s), {WORKERS} workers")
+
 # ------------------------------------------------------------------------------
 
-def search_and_verify(query, title_to_match, seen_ids):
-    valid_links = []
-    
+# API calls actually made, per stage ('album' tracklists vs per-'song' searches)
+api_calls = defaultdict(int)
+api_calls_lock = threading.Lock()
+
+def api_call(kind, fn):
+    """Runs fn(session) on the next session, retrying through throttles and outages."""
     # 🛡️ NETWORK GUARD (From my script - Critical for long runs)
     while True: 
+        session = pool.next()
+        with api_calls_lock:
+            api_calls[kind] += 1
         try:
-            results = yt.search(query)[:4] 
-            
-            # --- Success! Process results ---
-            for index, item in enumerate(results):
-                res_type = item.get('resultType')
-                
-                if res_type in ['song', 'video']:
-                    video_id = item.get('videoId')
-                    video_title = item.get('title', '')
-                    
-                    # Smart Scoring
-                    score = fuzz.token_set_ratio(title_to_match, video_title)
-                    if res_type == 'song': score += 5  
-                    
-                    lower_title = video_title.lower()
-                    for kw in BAD_KEYWORDS:
-                        if kw in lower_title:
-                            score -= 15 
-                            break 
-                    
-                    required_score = 45 if index == 0 else 60
-                    
-                    if score < required_score:
-                        continue 
-                    
-                    if video_id and video_id not in seen_ids:
-                        seen_ids.add(video_id)
-                        valid_links.append(f"https://music.youtube.com/watch?v={video_id}")
-            break # Break retry loop on success
+            return fn(session)
 
         except Exception as e:
             error_msg = str(e)
             
-            # 🚨 Cookies Expired -> STOP
+            # 🚨 Cookies Expired -> retire that session, STOP only when none are left
             if "401" in error_msg or "Unauthorized" in error_msg:
-                print(f"\n❌ FATAL ERROR: Cookies Expired! Please update {AUTH_FILE}.")
-                sys.exit(1)
+                remaining = pool.retire(session)
+                if not remaining:
+                    print(f"\n❌ FATAL ERROR: Cookies Expired! Please update {session.auth_file}.")
+                    os._exit(1)
+                print(f"\n❌ Cookies in {session.auth_file} expired. Continuing with {remaining} session(s).")
+                continue
+            
+            # 🐢 Throttled -> retry, most likely on another session
+            # (this session's limiter already enforces its cooldown)
+            if is_throttle_error(e):
+                continue
             
             # ⚠️ Internet Down -> WAIT
             # We wait here instead of crashing, so you don't lose progress.
             pbar_msg = f"⚠️ Connection Lost: {error_msg[:20]}..."
             print(f"\n{pbar_msg}")
             time.sleep(20) # Wait 20s and retry same query
-            
+
+def search_and_verify(query, title_to_match, seen_ids):
+    valid_links = []
+    
+    # 💾 Repeated songs / re-runs come straight from the cache (zero API calls)
+    results = search_cache.get(query)
+    if results is None:
+        results = search_cache.put(query, api_call('song', lambda session: session.search(query)[:4]))
+
+    # --- Score candidates (always re-applied, so threshold tweaks need no new searches) ---
+    # Smart Scoring: fuzz score, +5 for 'song' results, -15 for BAD_KEYWORDS,
+    # 45 to pass as the top result / 60 below it (see candidate_scoring.py)
+    for item, accepted in zip(results, accept_candidates(title_to_match, results, BAD_KEYWORDS)):
+        if not accepted: continue
+        video_id = item.get('videoId')
+        if video_id and video_id not in seen_ids:
+            seen_ids.add(video_id)
+            valid_links.append(f"https://music.youtube.com/watch?v={video_id}")
+
     return valid_links
 
 def get_music_links(title, singer):
-    # We use Sequential Logic (My script) because it saves API calls.
-    # Parallel (Your script) hits rate limits faster.
+    # Sequential per song (alias only if main search finds nothing) because
+    # it saves API calls; parallelism comes from running songs concurrently
+    # across the session pool.
     try:
         links = []
         seen_ids = set()
 
-        match = re.search(r'\((.*?)\)', title)
-        has_alias = False
-        main_title = title
-        alias_title = ""
-
-        if match:
-            has_alias = True
-            alias_title = match.group(1).strip()
-            main_title = re.sub(r'\(.*?\)', '', title).strip()
+        main_title, alias_title = split_alias(title)
+        has_alias = bool(alias_title)
 
         # 🔍 SEARCH 1: Main Title
         query_1 = f"{main_title} {singer}"
@@ -127,83 +213,291 @@ def get_music_links(title, singer):
     except Exception:
         return ["", "", ""] 
 
-def process_csv():
+# ------------------------------------------------------------------------------
+# 📀 ALBUM BATCHING
+# One album search + one tracklist fetch covers every song of the album; the
+# songs are then matched locally. Songs that don't match fall back to
+# get_music_links (1-2 searches each); matched ones still run it for their
+# url_2/url_3 alternatives unless ALBUM_ALTERNATIVES is off.
+# ------------------------------------------------------------------------------
+
+def split_alias(title):
+    """'Main Title (Alias)' -> ('Main Title', 'Alias'); alias is '' if absent."""
+    match = re.search(r'\((.*?)\)', title)
+    if not match: return title, ""
+    return re.sub(r'\(.*?\)', '', title).strip(), match.group(1).strip()
+
+def track_version(title):
+    """What tells versions of one song apart: the part number ('- 3', 'Part II') and words like 'Sad'."""
+    text = title.lower()
+    part = re.search(r"(?:-|part)\s*(\d+|i{1,3}|iv|v)\s*\)?\s*$", text)
+    return (part.group(1) if part else ""), frozenset(re.findall(r"[a-z]+", text)) & VERSION_WORDS
+
+def fetch_album_tracks(album_title, director, year):
+    """Tracklist of the best-matching YouTube Music album, as search-style candidates."""
+    query = f"{album_title} {director}".strip()
+    key = f"album: {query} {year}"
+    cached = search_cache.get(key)
+    if cached is not None: return cached
+
+    albums = api_call('album', lambda session: session.search(query, filter="albums")[:3])
+    best_score, best = 0, None
+    for item in albums:
+        if not item.get('browseId'): continue
+        # Same-name films get remade; trust the year when YouTube Music has one
+        if year and str(item.get('year') or '').isdigit() and abs(int(item['year']) - year) > 1: continue
+        score = fuzz.token_set_ratio(album_title, item.get('title') or '')
+        if score > best_score: best_score, best = score, item
+
+    tracks = []
+    if best and best_score >= ALBUM_TITLE_SCORE:
+        album = api_call('album', lambda session: session.get_album(best['browseId']))
+        tracks = [dict(track, resultType='song') for track in album.get('tracks') or []]
+    return search_cache.put(key, tracks)
+
+class AlbumMatcher:
+    """
+    Per-album tracklist memo shared by the lookup workers. The first worker to
+    reach an album fetches its tracklist while the others wait on that album's
+    lock; the memo entry is dropped once the album's last row read so far has
+    been matched (rows are registered with add() as they are streamed in).
+    """
+
+    def __init__(self, albums_csv):
+        self.albums = {}
+        if os.path.exists(albums_csv):
+            cols = ['album_uuid', 'album_title', 'album_music_director', 'album_year']
+            df_albums = pd.read_csv(albums_csv, usecols=cols, dtype=str, keep_default_na=False)
+            for row in df_albums.itertuples(index=False):
+                year = int(row.album_year) if row.album_year.isdigit() else None
+                self.albums[row.album_uuid] = (row.album_title, row.album_music_director, year)
+        else:
+            print(f"⚠️  {albums_csv} not found. Album batching disabled (per-song search only).")
+
+        self.remaining = defaultdict(int)
+        self.memo = {}
+        self.locks = defaultdict(threading.Lock)
+        self.lock = threading.Lock()
+        self.matched = 0
+        self.fallback = 0
+
+    def add(self, album_uuid):
+        with self.lock:
+            self.remaining[album_uuid] += 1
+
+    def tracks(self, album_uuid):
+        with self.lock:
+            album_lock = self.locks[album_uuid]
+        with album_lock:
+            if album_uuid not in self.memo:
+                self.memo[album_uuid] = fetch_album_tracks(*self.albums[album_uuid])
+            return self.memo[album_uuid]
+
+    def _done(self, album_uuid, matched):
+        with self.lock:
+            if matched: self.matched += 1
+            else: self.fallback += 1
+            self.remaining[album_uuid] -= 1
+            if self.remaining[album_uuid] <= 0:
+                self.remaining.pop(album_uuid, None)
+                self.memo.pop(album_uuid, None)
+                self.locks.pop(album_uuid, None)
+
+    def match(self, album_uuid, title):
+        """
+        Link to the album track that best matches the song, or None if the song
+        isn't on the tracklist. Other tracks of the same album are different
+        songs, so the tracklist gives no alternatives (url_2/url_3 come from
+        the per-song search, see ALBUM_ALTERNATIVES) and the match is strict: the
+        whole title must match (token_sort, not token_set, so 'Pyar' doesn't
+        take 'Pyar Hua Iqrar Hua'), the version must be the same ('- 3' never
+        takes '- 1') and the winner must be clear of the runner-up.
+        """
+        if album_uuid not in self.albums:
+            self._done(album_uuid, False)
+            return None
+        tracks = [item for item in self.tracks(album_uuid) if item.get('videoId')]
+        best_score, runner_up, best_id = 0, 0, None
+        if tracks:
+            main_title, alias_title = split_alias(title)
+            names = [main_title, alias_title] if alias_title else [main_title]
+            track_titles = [item.get('title') or '' for item in tracks]
+            # Best of main title / alias against every track, in one call
+            scores = score_matrix(names, track_titles, scorer=token_sort_ratio).max(axis=0)
+            version = track_version(title)
+            scores[[track_version(t) != version for t in track_titles]] = 0
+            order = scores.argsort()[::-1]
+            best_score, best_id = int(scores[order[0]]), tracks[order[0]]['videoId']
+            if len(order) > 1: runner_up = int(scores[order[1]])
+
+        matched = best_score >= ALBUM_TRACK_SCORE and best_score - runner_up >= ALBUM_TRACK_MARGIN
+        self._done(album_uuid, matched)
+        if not matched: return None
+        return [f"https://music.youtube.com/watch?v={best_id}", "", ""]
+
+def with_alternatives(links, title, singer):
+    """Album match in slot 1, then the per-song search's links that aren't the same video."""
+    alternatives = [link for link in get_music_links(title, singer) if link and link != links[0]]
+    return (links[:1] + alternatives + ["", ""])[:3]
+
+def ordered_map(executor, fn, items, window):
+    """Like executor.map, but keeps at most `window` calls in flight (results stay in input order)."""
+    items = iter(items)
+    pending = deque()
+    for item in items:
+        pending.append(executor.submit(fn, item))
+        if len(pending) >= window: break
+    while pending:
+        yield pending.popleft().result()
+        for item in items:
+            pending.append(executor.submit(fn, item))
+            break
+
+# ------------------------------------------------------------------------------
+# 📓 STREAMING + JOURNAL
+# The input is streamed record by record and rows are appended with a plain
+# csv writer. After every flushed batch a tiny sidecar journal records the
+# input offset and output size, so resume is a seek + truncate (constant
+# time, exact even if the last run died mid-write) and memory stays flat.
+# ------------------------------------------------------------------------------
+
+def read_records(f):
+    """Yields (fields, offset_after) per CSV record; quoted newlines are kept inside a record."""
+    while True:
+        text = f.readline()
+        if not text: return
+        while text.count('"') % 2:  # unbalanced quotes -> record continues
+            more = f.readline()
+            if not more: break
+            text += more
+        fields = next(csv.reader([text]), [])
+        if fields: yield fields, f.tell()
+
+def load_journal():
     try:
-        df = pd.read_csv(INPUT_CSV)
-    except FileNotFoundError:
+        with open(JOURNAL_FILE, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def save_journal(input_offset, output_size, rows_done):
+    tmp_path = JOURNAL_FILE + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({"input_offset": input_offset, "output_size": output_size, "rows_done": rows_done}, f)
+    os.replace(tmp_path, JOURNAL_FILE)
+
+def process_csv():
+    if not os.path.exists(INPUT_CSV):
         print(f"❌ Error: Could not find file '{INPUT_CSV}'")
         return
 
-    start_index = 0
-    if os.path.exists(OUTPUT_CSV):
-        df_done = pd.read_csv(OUTPUT_CSV, on_bad_lines='skip')
-        start_index = len(df_done)
-        print(f"🔄 Resuming {INPUT_CSV} from row {start_index}...")
+    f_in = open(INPUT_CSV, newline='', encoding='utf-8')
+    header, _ = next(read_records(f_in), (None, None))
+    if not header:
+        print(f"❌ Error: '{INPUT_CSV}' is empty")
+        return
+    out_header = header + [c for c in URL_COLUMNS if c not in header]
+    input_size = os.path.getsize(INPUT_CSV)
+
+    journal = load_journal()
+    rows_done = 0
+    if journal and os.path.exists(OUTPUT_CSV):
+        # O(1) resume: jump to the journaled input offset, drop any rows written after it
+        f_in.seek(journal["input_offset"])
+        rows_done = journal["rows_done"]
+        if os.path.getsize(OUTPUT_CSV) > journal["output_size"]:
+            with open(OUTPUT_CSV, 'r+b') as f_out:
+                f_out.truncate(journal["output_size"])
+        print(f"🔄 Resuming {INPUT_CSV} from row {rows_done}...")
+    elif os.path.exists(OUTPUT_CSV):
+        # Output from before the journal existed: count its rows once, skip as many inputs
+        with open(OUTPUT_CSV, newline='', encoding='utf-8') as f_done:
+            rows_done = max(sum(1 for _ in read_records(f_done)) - 1, 0)
+        for _ in zip(range(rows_done), read_records(f_in)): pass
+        save_journal(f_in.tell(), os.path.getsize(OUTPUT_CSV), rows_done)
+        print(f"🔄 Resuming {INPUT_CSV} from row {rows_done} (journal created)...")
     else:
-        empty_df = pd.DataFrame(columns=list(df.columns) + ['music_yt_url_1', 'music_yt_url_2', 'music_yt_url_3'])
-        empty_df.to_csv(OUTPUT_CSV, index=False)
-        print(f"🚀 Starting new job for: {INPUT_CSV} ({len(df)} songs)")
+        with open(OUTPUT_CSV, 'w', newline='', encoding='utf-8') as f_out:
+            csv.writer(f_out).writerow(out_header)
+        save_journal(f_in.tell(), os.path.getsize(OUTPUT_CSV), 0)
+        print(f"🚀 Starting new job for: {INPUT_CSV} ({input_size / 1024 / 1024:.1f} MB)")
 
-    total_rows = len(df)
-    if start_index >= total_rows:
+    start_offset = f_in.tell()
+    if start_offset >= input_size:
+        f_in.close()
         print("✅ File already completed!")
         return
 
-    buffer = []
-    session_counter = 0 
-    next_micro_break = random.randint(80, 120)    
-    next_coffee_break = random.randint(800, 1200) 
-
     print("-" * 60) 
 
-    # ncols=100 ensures no staircase effect
-    pbar = tqdm(range(start_index, total_rows), initial=start_index, total=total_rows, unit="song", ncols=100)
-    
-    for i in pbar:
-        row = df.iloc[i].copy()
-        
-        # Clean title for display
+    matcher = AlbumMatcher(ALBUMS_CSV) if ALBUM_BATCH and 'album_uuid' in header else None
+
+    def records():
+        for fields, offset in read_records(f_in):
+            row = dict(zip(header, fields))
+            if matcher: matcher.add(row.get('album_uuid', ''))
+            yield row, offset
+
+    def lookup(record):
+        row, offset = record
+        # Clean title for search
         title = str(row.get('song_title', '')).strip().replace('\n', ' ').replace('\r', '')
         singer = str(row.get('song_singers', '')).strip()
-        
-        short_title = (title[:20] + '..') if len(title) > 20 else title.ljust(22)
-        pbar.set_description(f"🔎 {short_title}")
-        
-        links = get_music_links(title, singer)
-
-        row['music_yt_url_1'] = links[0]
-        row['music_yt_url_2'] = links[1]
-        row['music_yt_url_3'] = links[2]
-        
-        buffer.append(row)
-
-        if len(buffer) >= BATCH_SIZE:
-            pd.DataFrame(buffer).to_csv(OUTPUT_CSV, mode='a', header=False, index=False)
-            buffer = [] 
-
-        session_counter += 1
-        if session_counter >= next_micro_break:
-            pause_time = random.uniform(10, 20) 
-            pbar.write(f"   💤 Micro-break: {int(pause_time)}s...") 
-            time.sleep(pause_time)
-            session_counter = 0 
-            next_micro_break = random.randint(80, 120)
-        
-        if i > 0 and i % next_coffee_break == 0:
-            long_pause = random.uniform(60, 120)
-            mins = int(long_pause/60)
-            pbar.write(f"\n   ☕ COFFEE BREAK: {mins} mins.\n")
-            time.sleep(long_pause)
-            next_coffee_break = random.randint(800, 1200)
-
-        # ⚡ SAFETY SLEEP: 1.2s - 2.5s 
-        # (0.5s is too risky for long jobs)
-        time.sleep(random.uniform(1.2, 2.5))
-
-    if buffer:
-        pd.DataFrame(buffer).to_csv(OUTPUT_CSV, mode='a', header=False, index=False)
+        links = None
+        if matcher:
+            try: links = matcher.match(row.get('album_uuid', ''), title)
+            except Exception: links = None
+            if links and ALBUM_ALTERNATIVES:
+                links = with_alternatives(links, title, singer)
+        return row, offset, title, links or get_music_links(title, singer)
+
+    # ncols=100 ensures no staircase effect
+    pbar = tqdm(total=input_size, initial=start_offset, unit="B", unit_scale=True, ncols=100)
+    songs = 0
+    
+    with ThreadPoolExecutor(max_workers=WORKERS) as executor, \
+         open(OUTPUT_CSV, 'a', newline='', encoding='utf-8') as f_out:
+        writer = csv.writer(f_out)
+        last_offset = start_offset
+        pending = 0
+
+        for row, offset, title, links in ordered_map(executor, lookup, records(), WORKERS * 4):
+            short_title = (title[:20] + '..') if len(title) > 20 else title.ljust(22)
+            pbar.set_description(f"🔎 {short_title}")
+            pbar.update(offset - last_offset)
+            last_offset = offset
+
+            row['music_yt_url_1'] = links[0]
+            row['music_yt_url_2'] = links[1]
+            row['music_yt_url_3'] = links[2]
+            writer.writerow([row.get(c, '') for c in out_header])
+            songs += 1
+            pending += 1
+
+            if pending >= BATCH_SIZE:
+                f_out.flush()
+                save_journal(offset, f_out.tell(), rows_done + songs)
+                pending = 0
+
+            pbar.set_postfix_str(f"{pool.rate():.2f} req/s | cache {search_cache.hit_rate():.0%}")
+
+        f_out.flush()
+        save_journal(last_offset, f_out.tell(), rows_done + songs)
 
+    f_in.close()
     pbar.close()
+    for session in pool.sessions:
+        stats = session.limiter.stats()
+        print(f"⏱️  {stats['host']}: settled at {stats['rate']} req/s ({stats['throttles']} throttles in {stats['requests']} searches)")
+    calls = api_calls['album'] + api_calls['song']
+    if matcher:
+        print(f"📀 Album batching: {matcher.matched}/{songs} songs matched from album tracklists, {matcher.fallback} fell back to per-song search")
+    fallback_songs = matcher.fallback if matcher else songs
+    per_song = f"{api_calls['song'] / fallback_songs:.2f}" if fallback_songs else "n/a"
+    print(f"📞 API calls/song: {calls / max(songs, 1):.2f} ({api_calls['album']} album + {api_calls['song']} song calls) | per-song path: {per_song} calls/song on fallback songs")
+    stats = search_cache.stats()
+    print(f"💾 Search cache: {stats['hits']} hits / {stats['misses']} misses ({stats['hit_rate']:.0%}), {stats['entries']} queries stored")
+    search_cache.close()
     print("-" * 60)
     print(f"🎉 JOB DONE! All data saved to: {OUTPUT_CSV}")
 